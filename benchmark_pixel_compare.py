@@ -0,0 +1,286 @@
+"""
+Pixel Compare hattı için tekrarlanabilir benchmark.
+
+Repodaki prospektüs PDF'leri ve Talepler/ altındaki artwork örnekleri üzerinde
+her aşamayı (vektör karşılaştırma, render, normalize, piksel farkı, SSIM, renk, feature matching, OCR)
+ayrı ayrı çalıştırır; süre, tepe bellek ve çıktı kararlılığını raporlar ve
+kayıtlı baseline (benchmark_baseline.json) ile karşılaştırır.
+
+Tepe bellek, aşama süresince örneklenen süreç RSS'inin başlangıca göre en
+büyük artışıdır: PyMuPDF pixmap'leri, OpenCV ve numpy tamponları da sayılır.
+Önceki aşamalardan boşalıp süreçte kalan bellek yeniden kullanılırsa artış
+görünmez; değerler aşamalar arası kıyas içindir.
+
+Baseline, ölçüm yapılan makineye özgüdür: repodaki dosya geliştirme
+makinesinde --save-baseline ile üretilmiştir. Farklı bir makinede (örn. CI)
+süre karşılaştırması için önce o makinede --save-baseline ile yeniden
+üretilmelidir; çıktı parmak izleri makineden bağımsızdır.
+
+Kullanım:
+    python benchmark_pixel_compare.py                    # çalıştır + baseline ile karşılaştır
+    python benchmark_pixel_compare.py --save-baseline    # sonucu baseline olarak kaydet
+    python benchmark_pixel_compare.py --repeat 5 --pages 2 --profile Kalite --only Talepler
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import fitz  # PyMuPDF
+
+from ui.pixel_compare import CompareAnalyzer, SSIM_SUPPORT
+from utils.page_raster import render_page_array, to_gray
+from utils.render_profile import RenderProfile, DEFAULT_PROFILE
+from utils.stage_metrics import PeakRss
+from utils.vector_diff import compare_pages
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmark_baseline.json")
+
+# Talepler/ altındaki artwork çiftleri (master, print)
+ARTWORK_PAIRS = [
+    ("Talepler/Humanis Kutu Artwork Örnek.pdf", "Talepler/Humanis Kutu Artwork Örnek (1).pdf"),
+    ("Talepler/Humanis Kutu Artwork Örnek.pdf", "Talepler/Kutu Tedarikçisinden Gelen Örnek Artwork.pdf"),
+    ("Talepler/Humanis KT Artwork Örnek.PDF", "Talepler/Humanis KT Artwork Örnek.PDF"),
+    ("Talepler/Humanis Koli Artwork Örnek.PDF", "Talepler/Humanis Koli Artwork Örnek.PDF"),
+    ("Talepler/Humanis Folyo Örnek.pdf", "Talepler/Humanis Folyo Örnek.pdf"),
+]
+
+STAGES = ("vector", "render", "normalize", "diff", "ssim", "color", "feature", "ocr")
+
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()[:12]
+
+
+def collect_pairs():
+    """Kök dizindeki prospektüsleri sıralı ikililer halinde, artwork örneklerini sabit çiftler halinde döndürür."""
+    leaflets = sorted(glob.glob(os.path.join(ROOT, "*.pdf")))
+    pairs = [(a, b) for a, b in zip(leaflets, leaflets[1:])]
+    for a, b in ARTWORK_PAIRS:
+        a, b = os.path.join(ROOT, a), os.path.join(ROOT, b)
+        if os.path.exists(a) and os.path.exists(b):
+            pairs.append((a, b))
+    return pairs
+
+
+def pair_id(path1, path2, page_idx):
+    rel = lambda p: os.path.relpath(p, ROOT).replace(os.sep, "/")
+    return f"{rel(path1)} | {rel(path2)} | s{page_idx + 1}"
+
+
+def measure(fn, repeat):
+    """fn'i repeat kez çalıştırır: (medyan süre, tepe RSS artışı MB veya None, çıktılar)."""
+    times, outputs = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs.append(fn())
+        times.append(time.perf_counter() - start)
+
+    # Bellek ölçümü ayrı bir çalıştırmada: örnekleme thread'i süreyi bozmasın
+    with PeakRss() as peak:
+        fn()
+    peak_mb = peak.delta / (1024 * 1024) if peak.delta is not None else None
+    return statistics.median(times), peak_mb, outputs
+
+
+def run_pair(analyzer, profile, path1, path2, page_idx, repeat):
+    """Bir sayfa çifti için tüm aşamaları ölçer: {aşama: {time, peak_mb, fingerprint, stable}}."""
+    with fitz.open(path1) as doc1, fitz.open(path2) as doc2:
+        return _run_pages(analyzer, profile, doc1.load_page(page_idx), doc2.load_page(page_idx), repeat)
+
+
+def _run_pages(analyzer, profile, page1, page2, repeat):
+    def zoom(page, stage):
+        return profile.zoom_for(page.rect.width, page.rect.height, stage)
+
+    results = {}
+
+    def record(stage, fn, fingerprint):
+        elapsed, peak, outputs = measure(fn, repeat)
+        prints = [fingerprint(o) for o in outputs]
+        results[stage] = {
+            "time": elapsed,
+            "peak_mb": peak,
+            "fingerprint": prints[0],
+            "stable": len(set(prints)) == 1,
+        }
+        return outputs[0]
+
+    record(
+        "vector",
+        lambda: compare_pages(page1, page2),
+        lambda o: f"{o['conclusive']}:{len(o['changes'])}:{len(o['raster_regions'])}",
+    )
+
+    # Render (FilePanel.get_page_array / _render_pdf_page ile aynı yol, diff çözünürlüğü)
+    img1, img2 = record(
+        "render",
+        lambda: (render_page_array(page1, zoom(page1, "diff")), render_page_array(page2, zoom(page2, "diff"))),
+        lambda o: f"{o[0].shape}{o[1].shape}:{_digest(o[0].tobytes())}{_digest(o[1].tobytes())}",
+    )
+    n1, n2 = record(
+        "normalize",
+        lambda: analyzer._normalize_images(img1, img2),
+        lambda o: f"{o[0].shape}{o[1].shape}",
+    )
+    g1, g2 = to_gray(n1), to_gray(n2)
+    record(
+        "diff",
+        lambda: analyzer._find_visual_differences(n1, n2, grays=(g1, g2)),
+        lambda o: f"{len(o[1])}:{_digest(repr(sorted(o[1])).encode())}",
+    )
+    if SSIM_SUPPORT:
+        record(
+            "ssim",
+            lambda: analyzer._compute_ssim(g1, g2),
+            lambda o: f"{o[0]:.4f}",
+        )
+    tri1 = render_page_array(page1, zoom(page1, "triage"))
+    tri2 = render_page_array(page2, zoom(page2, "triage"))
+    record(
+        "color",
+        lambda: analyzer._compare_colors(tri1, tri2),
+        lambda o: "yok" if o[0] is None else f"{o[0]:.4f}",
+    )
+    record(
+        "feature",
+        lambda: analyzer._feature_matching(tri1, tri2),
+        lambda o: "yok" if not o else f"{o['good_matches']}/{o['total_kp1']}/{o['total_kp2']}",
+    )
+    ocr1 = render_page_array(page1, zoom(page1, "ocr"), gray=True)
+    record(
+        "ocr",
+        lambda: analyzer._extract_text(ocr1),
+        lambda o: "yok" if o is None else _digest(o.encode("utf-8")),
+    )
+    return results
+
+
+def compare_to_baseline(current, baseline, tolerance, noise_floor):
+    """Süre gerilemelerini ve çıktı değişikliklerini listeler."""
+    regressions, changes = [], []
+    for pid, stages in current.items():
+        base_stages = baseline.get(pid)
+        if not base_stages:
+            continue
+        for stage, cur in stages.items():
+            base = base_stages.get(stage)
+            if not base:
+                continue
+            if cur["time"] > base["time"] * (1 + tolerance) and cur["time"] - base["time"] > noise_floor:
+                regressions.append((pid, stage, base["time"], cur["time"]))
+            if cur["fingerprint"] != base["fingerprint"]:
+                changes.append((pid, stage, base["fingerprint"], cur["fingerprint"]))
+    return regressions, changes
+
+
+def print_report(current, baseline):
+    header = f"{'çift / aşama':<70} {'süre ms':>9} {'base ms':>9} {'fark':>7} {'tepe RSS MB':>11}  kararlılık"
+    print(header)
+    print("-" * len(header))
+    for pid, stages in current.items():
+        print(pid)
+        for stage, cur in stages.items():
+            base = (baseline.get(pid) or {}).get(stage)
+            base_ms = f"{base['time'] * 1000:9.1f}" if base else f"{'-':>9}"
+            delta = f"{(cur['time'] / base['time'] - 1) * 100:+6.0f}%" if base and base["time"] > 0 else f"{'':>7}"
+            stable = "kararlı" if cur["stable"] else "KARARSIZ"
+            if base and base["fingerprint"] != cur["fingerprint"]:
+                stable += " / çıktı değişti"
+            peak = f"{cur['peak_mb']:11.1f}" if cur["peak_mb"] is not None else f"{'-':>11}"
+            print(f"  {stage:<68} {cur['time'] * 1000:9.1f} {base_ms} {delta} {peak}  {stable}")
+
+    totals = {}
+    for stages in current.values():
+        for stage, cur in stages.items():
+            totals[stage] = totals.get(stage, 0.0) + cur["time"]
+    print()
+    print("Aşama toplamları: " + ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in totals.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pixel Compare aşama benchmark'ı")
+    parser.add_argument("--repeat", type=int, default=3, help="Aşama başına tekrar (medyan alınır)")
+    parser.add_argument("--pages", type=int, default=1, help="Çift başına ölçülecek sayfa sayısı")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="Render profili (Hızlı/Dengeli/Kalite)")
+    parser.add_argument("--only", default=None, help="Sadece yolunda bu metin geçen çiftler")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON yolu")
+    parser.add_argument("--save-baseline", action="store_true", help="Sonucu baseline olarak kaydet")
+    parser.add_argument("--json", default=None, help="Ham sonuçları bu dosyaya yaz")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Gerileme eşiği (0.25 = %%25 yavaş)")
+    parser.add_argument("--noise-floor-ms", type=float, default=5.0, help="Bu farkın altındaki süre değişimleri yok sayılır")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Gerileme varsa çıkış kodu 1")
+    args = parser.parse_args()
+
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+
+    analyzer = CompareAnalyzer()
+    profile = RenderProfile(args.profile)
+
+    current = {}
+    for path1, path2 in collect_pairs():
+        if args.only and args.only not in path1 and args.only not in path2:
+            continue
+        with fitz.open(path1) as doc1, fitz.open(path2) as doc2:
+            n_pages = min(args.pages, len(doc1), len(doc2))
+        for page_idx in range(n_pages):
+            current[pair_id(path1, path2, page_idx)] = run_pair(analyzer, profile, path1, path2, page_idx, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    print_report(current, baseline)
+
+    payload = {
+        "meta": {
+            "profile": args.profile,
+            "repeat": args.repeat,
+            "python": sys.version.split()[0],
+            "pymupdf": fitz.VersionBind,
+            "machine": platform.platform(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": current,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+    exit_code = 0
+    if baseline:
+        regressions, changes = compare_to_baseline(current, baseline, args.tolerance, args.noise_floor_ms / 1000)
+        print()
+        if regressions:
+            print(f"GERİLEME ({len(regressions)}):")
+            for pid, stage, base_t, cur_t in regressions:
+                print(f"  {pid} [{stage}]: {base_t * 1000:.1f} ms -> {cur_t * 1000:.1f} ms")
+            if args.fail_on_regression:
+                exit_code = 1
+        else:
+            print("Süre gerilemesi yok.")
+        if changes:
+            print(f"ÇIKTI DEĞİŞİKLİĞİ ({len(changes)}):")
+            for pid, stage, base_fp, cur_fp in changes:
+                print(f"  {pid} [{stage}]: {base_fp} -> {cur_fp}")
+    else:
+        print(f"\nBaseline bulunamadı ({args.baseline}); kaydetmek için --save-baseline kullanın.")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        print(f"Baseline kaydedildi: {args.baseline}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
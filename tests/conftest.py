@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# utils/ ve ui/ paket değil; testler depo kökünden içe aktarır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def app_home(tmp_path, monkeypatch):
+    """Uygulama verisi (kuyruk, sonuç kaydı, küçük resimler) kullanıcı klasörü yerine geçici klasöre yazılır."""
+    home = tmp_path / "app_home"
+    monkeypatch.setenv("PIXEL_COMPARE_HOME", str(home))
+    return home
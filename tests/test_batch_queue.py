@@ -0,0 +1,208 @@
+import threading
+import time
+
+import fitz
+import pytest
+from PIL import Image
+
+from utils.batch_queue import BatchQueue, BatchRunner, match_master, name_key, pair_folders
+from utils.compare_job import CompareCancelled
+
+
+def _pdf(path, text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text, fontsize=11)
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.fixture
+def folders(tmp_path):
+    master, prints = tmp_path / "master", tmp_path / "print"
+    master.mkdir()
+    prints.mkdir()
+    # 1. isim anahtarı aynı (sürüm / taraf ekleri atılır)
+    _pdf(master / "Etiket_A.pdf", "etiket a")
+    _pdf(prints / "etiket_a_print_v2.pdf", "etiket a baski")
+    # 2. benzer isim
+    _pdf(master / "kutu_paracetamol.pdf", "kutu")
+    _pdf(prints / "kutu_parasetamol.pdf", "kutu")
+    # 3. içerik (isimler ilgisiz)
+    _pdf(master / "a123.pdf", "Ibuprofen film tablet 400 mg kullanma talimati")
+    _pdf(prints / "zzz999.pdf", "Ibuprofen film tablet 400 mg kullanma talimati")
+    # Eşleşmeyenler ve desteklenmeyen dosya
+    _pdf(master / "yalniz.pdf", "tamamen baska kelimeler burada")
+    Image.new("RGB", (64, 64), "white").save(prints / "gorsel.png")
+    (master / "notlar.txt").write_text("yok sayılır")
+    return str(master), str(prints)
+
+
+def test_name_key():
+    assert name_key("/x/Kullanım_Talimatı_MASTER_v3 (1).pdf") == "kullanim talimati"
+    assert name_key("Etiket-A_print_rev2.PDF") == name_key("etiket a.pdf") == "etiket a"
+    # Doz ve folyo / parça numaraları anahtarda kalır; sadece "(n)" kopya eki atılır
+    assert name_key("Parol 5 mg KT.pdf") == "parol 5 mg kt"
+    assert name_key("Parol 5 mg KT.pdf") != name_key("Parol 2 mg KT.pdf")
+    assert name_key("Folyo 1.pdf") != name_key("Folyo 2.pdf")
+    assert name_key("Folyo 2 (1).pdf") == name_key("Folyo 2.pdf") == "folyo 2"
+
+
+def test_numbered_names_pair_exactly(tmp_path):
+    master, prints = tmp_path / "m", tmp_path / "p"
+    master.mkdir()
+    prints.mkdir()
+    for name in ("Folyo 1.pdf", "Folyo 2.pdf", "Parol 5 mg KT.pdf"):
+        _pdf(master / name, "ortak metin")
+    _pdf(prints / "Folyo 2.pdf", "ortak metin")
+    _pdf(prints / "Parol 2 mg KT.pdf", "baska icerik burada")
+    pairs, rest_m, rest_p = pair_folders(master, prints)
+    assert [(m.rsplit("/", 1)[1], p.rsplit("/", 1)[1], how) for m, p, how in pairs] == [
+        ("Folyo 2.pdf", "Folyo 2.pdf", "isim")
+    ]
+    # Sayısı farklı isim "benzer isim" ile eşlenmez
+    assert [p.rsplit("/", 1)[1] for p in rest_p] == ["Parol 2 mg KT.pdf"]
+    assert match_master(str(prints / "Folyo 2.pdf"), master) == (str(master / "Folyo 2.pdf"), "isim")
+    assert match_master(str(prints / "Parol 2 mg KT.pdf"), master) == (None, None)
+
+
+def test_pair_folders_tiers(folders):
+    master, prints = folders
+    pairs, rest_m, rest_p = pair_folders(master, prints)
+    found = {(m.rsplit("/", 1)[1], p.rsplit("/", 1)[1]): how for m, p, how in pairs}
+    assert found == {
+        ("Etiket_A.pdf", "etiket_a_print_v2.pdf"): "isim",
+        ("kutu_paracetamol.pdf", "kutu_parasetamol.pdf"): "benzer isim",
+        ("a123.pdf", "zzz999.pdf"): "içerik",
+    }
+    assert [p.rsplit("/", 1)[1] for p in rest_m] == ["yalniz.pdf"]
+    assert [p.rsplit("/", 1)[1] for p in rest_p] == ["gorsel.png"]
+    assert [m for m, _, _ in pairs] == sorted(m for m, _, _ in pairs)
+
+
+def test_match_master_tiers(folders):
+    master, prints = folders
+    for name, expected, how in (
+        ("etiket_a_print_v2.pdf", "Etiket_A.pdf", "isim"),
+        ("kutu_parasetamol.pdf", "kutu_paracetamol.pdf", "benzer isim"),
+        ("zzz999.pdf", "a123.pdf", "içerik"),
+    ):
+        path, method = match_master(f"{prints}/{name}", master)
+        assert (path.rsplit("/", 1)[1], method) == (expected, how)
+    assert match_master(f"{prints}/gorsel.png", master) == (None, None)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = BatchQueue(str(tmp_path / "queue.db"))
+    yield q
+    q.close()
+
+
+def test_job_state_transitions(queue, tmp_path):
+    batch = queue.create_batch("m", "p", [("m/1.pdf", "p/1.pdf", "isim"), ("m/2.pdf", "p/2.pdf", "içerik")],
+                               ["m/3.pdf"], ["p/4.pdf"], {"profile": "Standart"})
+    assert queue.counts(batch) == {"pending": 2, "unpaired": 2}
+
+    job = queue.claim_next()
+    assert (job["master_path"], job["status"], job["settings"]) == ("m/1.pdf", "pending", {"profile": "Standart"})
+    assert queue.counts(batch)["running"] == 1
+    queue.complete(job["id"], {"pages": 1})
+
+    job2 = queue.claim_next()
+    queue.fail(job2["id"], ValueError("bozuk"))
+    assert queue.claim_next() is None
+    assert queue.counts(batch) == {"done": 1, "failed": 1, "unpaired": 2}
+
+    queue.retry_failed(batch)
+    job2 = queue.claim_next()
+    assert job2["attempts"] == 1  # claim_next öncesi değer
+    queue.release(job2["id"])
+    job2 = queue.claim_next()
+    assert job2["attempts"] == 2
+
+    jobs = {j["id"]: j for j in queue.jobs(batch)}
+    assert jobs[job["id"]]["summary"] == {"pages": 1}
+    assert jobs[job2["id"]]["error"] is None
+
+    # Yarım kalan iş yeniden açılışta kuyruğa döner
+    queue.close()
+    reopened = BatchQueue(str(tmp_path / "queue.db"))
+    try:
+        assert reopened.requeue_interrupted() == 1
+        assert reopened.counts(batch)["pending"] == 1
+    finally:
+        reopened.close()
+
+
+def test_add_job_find_batch_and_watched_files(queue):
+    batch = queue.create_batch("m", "p", [], settings={"profile": "Hızlı", "vector": True})
+    assert queue.find_batch("m", "p", profile="Hızlı") == batch
+    assert queue.find_batch("m", "p", profile="Standart") is None
+    assert queue.latest_batch_id() == batch
+
+    assert queue.add_job(batch, "m/1.pdf", "p/1.pdf", "isim") is not None
+    assert queue.add_job(batch, "m/1.pdf", "p/1.pdf", "isim") is None  # bekleyen iş zaten var
+    assert queue.add_job(batch, None, "p/2.pdf", None) is not None
+    assert queue.counts() == {"pending": 1, "unpaired": 1}
+
+    assert queue.file_changed("p/1.pdf", "abc")
+    queue.mark_file("p/1.pdf", "abc")
+    assert not queue.file_changed("p/1.pdf", "abc")
+    assert queue.file_changed("p/1.pdf", "def")
+
+
+def _wait_idle(runner):
+    deadline = time.monotonic() + 10
+    while runner.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not runner.running
+
+
+def test_runner_records_outcomes(queue):
+    batch = queue.create_batch("m", "p", [(f"m/{n}", f"p/{n}", "isim") for n in ("ok", "hata", "iptal")])
+
+    def analyze(job, cancel_event):
+        name = job["master_path"]
+        if name == "m/hata":
+            raise RuntimeError("bozuk dosya")
+        if name == "m/iptal":
+            # Durdurma aşama sınırında CompareCancelled olarak görülür
+            runner.stop()
+            cancel_event.wait(1)
+            raise CompareCancelled()
+        return {"name": name}
+
+    runner = BatchRunner(queue, analyze, workers=2)
+    runner.start()
+    _wait_idle(runner)
+    statuses = {j["master_path"]: (j["status"], j["error"]) for j in queue.jobs(batch)}
+    assert statuses == {
+        "m/ok": ("done", None),
+        "m/hata": ("failed", "bozuk dosya"),
+        "m/iptal": ("pending", None),  # iptal edilen iş kuyruğa geri bırakılır
+    }
+
+
+def test_runner_respects_governor(queue):
+    queue.create_batch("m", "p", [(f"m/{i}", f"p/{i}", "isim") for i in range(6)])
+    lock = threading.Lock()
+    state = {"busy": 0, "peak": 0}
+
+    class Governor:
+        def admit_worker(self, busy):
+            return busy == 0
+
+    def analyze(job, cancel_event):
+        with lock:
+            state["busy"] += 1
+            state["peak"] = max(state["peak"], state["busy"])
+        time.sleep(0.01)
+        with lock:
+            state["busy"] -= 1
+        return {}
+
+    runner = BatchRunner(queue, analyze, workers=3, governor=Governor())
+    runner.start()
+    _wait_idle(runner)
+    assert queue.counts() == {"done": 6}
+    assert state["peak"] == 1
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from utils.compare_job import CompareCancelled, CompareJob
+
+STAGES = ("render", "diff", "ocr", "ssim")
+
+
+def _run_page(job, result=None):
+    i = job.next_page()
+    job.begin_page(i)
+    for stage in STAGES:
+        job.begin_stage(stage)
+    job.end_page(result if result is None else dict(result, page_num=i + 1))
+    return i
+
+
+def test_pages_run_in_order_with_priority():
+    job = CompareJob(4, STAGES)
+    assert _run_page(job, {}) == 0
+    job.prioritize(3)
+    job.prioritize(0)  # Tamamlanmış sayfa önceliği değiştirmez
+    assert _run_page(job, {}) == 3
+    assert _run_page(job, {}) == 1
+    assert _run_page(job) == 2
+    assert job.next_page() is None
+    assert [r["page_num"] for r in job.results] == [1, 4, 2]
+    assert job.skipped == [2]
+    assert set(job.results[0]["timings"]) == set(STAGES)
+
+
+def test_progress_eta_and_snapshot():
+    job = CompareJob(2, STAGES)
+    assert job.progress() == 0.0
+    assert job.eta() is None
+    job.begin_page(job.next_page())
+    job.begin_stage("ocr")
+    assert job.progress() == pytest.approx(0.25)
+    assert job.eta() is not None and job.eta() >= 0
+    snap = job.snapshot()
+    assert (snap["page"], snap["stage"], snap["pages_done"], snap["finished"]) == (1, "ocr", 0, False)
+    job.end_page({})
+    assert job.progress() == pytest.approx(0.5)
+    _run_page(job, {})
+    assert job.progress() == 1.0
+    assert job.eta() == pytest.approx(0.0)
+    job.finish()
+    assert job.snapshot()["finished"]
+    assert CompareJob(0, STAGES).progress() == 1.0
+
+
+def test_cancel_stops_at_next_stage_boundary():
+    job = CompareJob(3, STAGES)
+    _run_page(job, {})
+    job.begin_page(job.next_page())
+    job.begin_stage("render")
+    job.cancel()
+    assert job.cancelled and job.snapshot()["cancelled"]
+    with pytest.raises(CompareCancelled):
+        job.begin_stage("diff")
+    with pytest.raises(CompareCancelled):
+        job.check()
+    # Tamamlanan sonuçlar korunur
+    assert len(job.results) == 1
+    job.finish(error=None)
+    assert job.finished
+
+
+def test_shared_cancel_event():
+    event = threading.Event()
+    jobs = [CompareJob(1, STAGES, cancel_event=event) for _ in range(2)]
+    jobs[0].cancel()
+    with pytest.raises(CompareCancelled):
+        jobs[1].begin_page(0)
+
+
+def test_results_since():
+    job = CompareJob(3, STAGES)
+    _run_page(job, {})
+    _run_page(job)
+    new, skipped = job.results_since(0)
+    assert len(new) == 1 and skipped == [1]
+    _run_page(job, {})
+    new, _ = job.results_since(1)
+    assert [r["page_num"] for r in new] == [3]
+
+
+def test_worker_thread_and_ui_reader():
+    job = CompareJob(50, STAGES)
+    started = threading.Event()
+
+    def worker():
+        try:
+            while True:
+                i = job.next_page()
+                if i is None:
+                    break
+                job.begin_page(i)
+                started.set()
+                for stage in STAGES:
+                    job.begin_stage(stage)
+                job.end_page({"page_num": i + 1})
+        except CompareCancelled:
+            pass
+        finally:
+            job.finish()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    started.wait(5)
+    job.cancel()
+    thread.join(5)
+    assert job.finished
+    assert len(job.results) + len(job.skipped) <= 50
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from utils.diff_regions import MERGE_PRESETS, _UnionFind, merge_boxes, merge_with_preset
+
+
+def _touch(a, b, gap_x, gap_y):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return (bx <= ax + aw + gap_x and bx + bw >= ax - gap_x
+            and by <= ay + ah + gap_y and by + bh >= ay - gap_y)
+
+
+def _reference_merge(boxes, gap_x, gap_y):
+    """Kaba kuvvet: değen iki kutu kalmayana kadar birleştir."""
+    boxes = [tuple(b) for b in boxes]
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                if _touch(boxes[i], boxes[j], gap_x, gap_y):
+                    (ax, ay, aw, ah), (bx, by, bw, bh) = boxes[i], boxes[j]
+                    x0, y0 = min(ax, bx), min(ay, by)
+                    x1, y1 = max(ax + aw, bx + bw), max(ay + ah, by + bh)
+                    boxes[i] = (x0, y0, x1 - x0, y1 - y0)
+                    del boxes[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return boxes
+
+
+def test_union_find():
+    uf = _UnionFind(5)
+    uf.union(0, 1)
+    uf.union(3, 4)
+    uf.union(1, 4)
+    assert len({uf.find(i) for i in range(5)}) == 2
+    assert uf.find(0) == uf.find(3)
+    assert uf.find(2) == 2
+
+
+def test_merge_respects_gaps():
+    boxes = [(0, 0, 10, 10), (15, 0, 10, 10)]  # 5 px yatay boşluk
+    assert sorted(merge_boxes(boxes, 4, 4)) == sorted(boxes)
+    assert merge_boxes(boxes, 5, 0) == [(0, 0, 25, 10)]
+    # Dikey boşluk ayrı: geniş yatay boşluk dikeydeki kutuyu birleştirmez
+    assert len(merge_boxes([(0, 0, 10, 10), (0, 20, 10, 10)], 30, 4)) == 2
+
+
+def test_chained_and_grown_regions_merge():
+    # Zincir: a-b-c birbirine değer
+    assert merge_boxes([(0, 0, 5, 5), (6, 0, 5, 5), (12, 0, 5, 5)], 1) == [(0, 0, 17, 5)]
+    # Birleşen bölge yeni bir kutuya değer (tek tur yetmez)
+    boxes = [(0, 0, 10, 10), (0, 11, 100, 10), (95, 0, 10, 10)]
+    assert merge_boxes(boxes, 1) == [(0, 0, 105, 21)]
+
+
+def test_empty_and_single():
+    assert merge_boxes([]) == []
+    assert merge_boxes([(1, 2, 3, 4)]) == [(1, 2, 3, 4)]
+
+
+@pytest.mark.parametrize("gaps", [(0, 0), (8, 4), (30, 4), (20, 20), (100, 100)])
+def test_matches_brute_force(gaps):
+    rng = random.Random(sum(gaps))
+    boxes = [(rng.randrange(0, 2000), rng.randrange(0, 2000), rng.randrange(1, 40), rng.randrange(1, 40))
+             for _ in range(300)]
+    assert sorted(merge_boxes(boxes, *gaps)) == sorted(_reference_merge(boxes, *gaps))
+
+
+def test_presets():
+    boxes = [(0, 0, 10, 10), (16, 0, 10, 10), (0, 30, 10, 10)]
+    assert merge_with_preset(boxes, "Kapalı") == boxes
+    assert merge_with_preset(boxes, None) == boxes
+    assert merge_with_preset(boxes, "Bilinmeyen") == boxes
+    assert len(merge_with_preset(boxes, "Kelime")) == 2
+    assert len(merge_with_preset(boxes, "Grafik")) == 1
+    assert merge_with_preset(boxes, (6, 0)) == merge_boxes(boxes, 6, 0)
+    assert set(MERGE_PRESETS) >= {"Kapalı", "Kelime", "Satır", "Grafik"}
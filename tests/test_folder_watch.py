@@ -0,0 +1,188 @@
+import os
+import sys
+import threading
+
+import fitz
+import pytest
+
+from utils.batch_queue import BatchQueue
+from utils.folder_watch import (
+    FolderWatcher, enqueue_watched_file, is_candidate, load_watch_config, rematch_unpaired, save_watch_config,
+)
+from utils.result_store import file_digest
+
+
+def _pdf(path, text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text, fontsize=11)
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    master, watch = tmp_path / "master", tmp_path / "watch"
+    master.mkdir()
+    watch.mkdir()
+    _pdf(master / "etiket.pdf", "etiket")
+    return str(master), str(watch)
+
+
+def test_is_candidate():
+    assert is_candidate("/x/etiket.PDF")
+    assert is_candidate("/x/tarama.tiff")
+    assert not is_candidate("/x/~$etiket.pdf")
+    assert not is_candidate("/x/.etiket.pdf")
+    assert not is_candidate("/x/etiket.pdf.part")
+    assert not is_candidate("/x/notlar.txt")
+
+
+def test_watch_config_roundtrip():
+    assert load_watch_config() == []
+    rules = [{"watch_dir": "/baskı", "master_dir": "/master", "settings": {"profile": "Hızlı"}}]
+    save_watch_config(rules)
+    assert load_watch_config() == rules
+
+
+def test_enqueue_is_incremental(dirs, tmp_path):
+    master, watch = dirs
+    rule = {"watch_dir": watch, "master_dir": master, "settings": {"merge": "Satır"}}
+    queue = BatchQueue(str(tmp_path / "queue.db"))
+    try:
+        path = os.path.join(watch, "etiket_v2.pdf")
+        _pdf(path, "etiket")
+        job_id = enqueue_watched_file(queue, rule, path)
+        assert job_id is not None
+        # Aynı içerik tekrar kuyruğa alınmaz
+        assert enqueue_watched_file(queue, rule, path) is None
+
+        job = queue.claim_next()
+        assert (job["id"], job["pairing"]) == (job_id, "isim")
+        assert job["master_path"] == os.path.join(master, "etiket.pdf")
+        assert job["settings"] == {"merge": "Satır", "watch": True}
+        queue.complete(job_id, {})
+
+        # İçerik değişince aynı toplu işe yeni iş eklenir
+        _pdf(path, "etiket yeni baski")
+        assert enqueue_watched_file(queue, rule, path) is not None
+        assert len(queue.batches()) == 1
+
+        assert enqueue_watched_file(queue, rule, os.path.join(watch, "silinmis.pdf")) is None
+    finally:
+        queue.close()
+
+
+def test_print_before_master_is_paired_later(dirs, tmp_path):
+    master, watch = dirs
+    rule = {"watch_dir": watch, "master_dir": master}
+    queue = BatchQueue(str(tmp_path / "queue.db"))
+    try:
+        path = os.path.join(watch, "kutu.pdf")
+        _pdf(path, "kutu arka yuz")
+        job_id = enqueue_watched_file(queue, rule, path)
+        assert job_id is not None
+        # Master'ı yok: işlenmiş sayılmaz ama aynı dosya için ikinci "unpaired" iş de açılmaz
+        assert queue.file_changed(path, file_digest(path))
+        assert enqueue_watched_file(queue, rule, path) is None
+        assert rematch_unpaired(queue, rule) == []
+
+        _pdf(os.path.join(master, "kutu.pdf"), "kutu arka yuz")
+        assert rematch_unpaired(queue, rule) == [job_id]
+        assert not queue.file_changed(path, file_digest(path))
+        jobs = queue.jobs(queue.latest_batch_id())
+        assert [(j["id"], j["status"], j["pairing"]) for j in jobs] == [(job_id, "pending", "isim")]
+        assert jobs[0]["master_path"] == os.path.join(master, "kutu.pdf")
+        assert rematch_unpaired(queue, rule) == []
+    finally:
+        queue.close()
+
+
+def test_unpaired_job_is_reused_when_master_appears_while_closed(dirs, tmp_path):
+    master, watch = dirs
+    rule = {"watch_dir": watch, "master_dir": master}
+    queue = BatchQueue(str(tmp_path / "queue.db"))
+    try:
+        path = os.path.join(watch, "kutu.pdf")
+        _pdf(path, "kutu")
+        job_id = enqueue_watched_file(queue, rule, path)
+        _pdf(os.path.join(master, "kutu.pdf"), "kutu")
+        # Açılış taraması: dosya işlenmiş sayılmadığı için yeniden eşlenir
+        assert enqueue_watched_file(queue, rule, path) == job_id
+        assert [j["status"] for j in queue.jobs(queue.latest_batch_id())] == ["pending"]
+    finally:
+        queue.close()
+
+
+def test_master_changes_trigger_rematch(dirs, monkeypatch):
+    monkeypatch.setattr(FolderWatcher, "_open_inotify", lambda self: None)
+    master, watch = dirs
+    rule = {"watch_dir": watch, "master_dir": master}
+    changed, ready, done = [], [], threading.Event()
+
+    def on_masters(r):
+        changed.append(r)
+        if os.path.exists(os.path.join(master, "yeni.pdf")):
+            done.set()
+
+    watcher = FolderWatcher([rule], lambda r, p: ready.append(p), debounce=0.1, poll_interval=0.05,
+                            on_masters=on_masters)
+    watcher.start()
+    try:
+        _pdf(os.path.join(master, "yeni.pdf"), "yeni")
+        assert done.wait(5)
+    finally:
+        watcher.stop()
+        watcher._thread.join(5)
+    # Master dosyaları print olarak bildirilmez, sadece kural yeniden eşlenir
+    assert ready == []
+    assert all(r is rule for r in changed)
+
+
+@pytest.mark.parametrize("mode", ["polling", "inotify"])
+def test_watcher_reports_finished_files(dirs, monkeypatch, mode):
+    if mode == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify sadece Linux'ta")
+    if mode == "polling":
+        monkeypatch.setattr(FolderWatcher, "_open_inotify", lambda self: None)
+    master, watch = dirs
+    _pdf(os.path.join(watch, "mevcut.pdf"), "once")
+    ready, done = [], threading.Event()
+
+    def on_ready(rule, path):
+        ready.append(os.path.basename(path))
+        if len(ready) >= 2:
+            done.set()
+
+    watcher = FolderWatcher([{"watch_dir": watch, "master_dir": master}], on_ready,
+                            debounce=0.1, poll_interval=0.05)
+    watcher.start()
+    try:
+        open(os.path.join(watch, "yaziliyor.pdf.part"), "wb").close()
+        _pdf(os.path.join(watch, "yeni.pdf"), "yeni")
+        assert done.wait(5)
+    finally:
+        watcher.stop()
+        watcher._thread.join(5)
+    assert watcher.mode == mode
+    assert sorted(ready) == ["mevcut.pdf", "yeni.pdf"]
+    assert not watcher.running
+
+
+def test_flush_waits_for_stable_file(dirs):
+    master, watch = dirs
+    path = os.path.join(watch, "buyuyen.pdf")
+    _pdf(path, "ilk")
+    ready = []
+    watcher = FolderWatcher([{"watch_dir": watch, "master_dir": master}], lambda r, p: ready.append(p), debounce=0)
+    watcher._touch([path])
+    with open(path, "ab") as f:
+        f.write(b"%% ek")  # Olaydan sonra hâlâ yazılıyor
+    watcher._flush_ready()
+    assert ready == [] and path in watcher._pending
+    watcher._flush_ready()
+    assert ready == [path]
+    os.remove(path)
+    watcher._touch([path])
+    watcher._flush_ready()
+    assert watcher._pending == {}
+
@@ -0,0 +1,85 @@
+import io
+
+import fitz
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.image_digest import compare_images, decoded_digest, page_image_entries, prune_raster_regions
+from utils.vector_diff import compare_page_content, extract_page_content
+
+RECT = fitz.Rect(100, 100, 220, 180)
+
+
+def _png(value):
+    arr = np.zeros((40, 60, 3), np.uint8)
+    arr[:, :, 0] = value
+    arr[10:20, 10:30] = 255
+    buf = io.BytesIO()
+    Image.fromarray(arr).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _page(value=50, rect=RECT, recompress=False, text_over=False):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Etiket", fontsize=12)
+    if value is not None:
+        xref = page.insert_image(rect, stream=_png(value))
+        if recompress:
+            # Aynı pikseller, farklı sıkıştırılmış akış
+            doc.update_stream(xref, doc.xref_stream(xref), compress=True)
+    if text_over:
+        page.insert_text((rect.x0 + 5, rect.y0 + 20), "Üst", fontsize=12)
+    return page
+
+
+def _compare(page1, page2):
+    cache1, cache2 = {}, {}
+    return compare_images(
+        page_image_entries(page1, cache1), page_image_entries(page2, cache2),
+        lambda x: decoded_digest(page1.parent, x, cache1), lambda x: decoded_digest(page2.parent, x, cache2),
+    )
+
+
+def _statuses(page1, page2):
+    return [img["status"] for img in _compare(page1, page2)["images"]]
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({}, "identical"),
+    ({"recompress": True}, "reencoded"),
+    ({"value": 90}, "replaced"),
+    ({"rect": RECT + (15, 0, 15, 0)}, "moved"),
+])
+def test_image_status(kwargs, expected):
+    assert _statuses(_page(), _page(**kwargs)) == [expected]
+
+
+def test_added_and_removed():
+    assert _statuses(_page(None), _page()) == ["added"]
+    assert _statuses(_page(), _page(None)) == ["removed"]
+
+
+def test_raw_digest_skips_decoding_when_streams_match():
+    calls = []
+    page1, page2 = _page(), _page()
+    compare_images(page_image_entries(page1, {}), page_image_entries(page2, {}),
+                   calls.append, calls.append)
+    assert calls == []
+
+
+def test_exposed_when_drawn_over():
+    entry = page_image_entries(_page(), {})[0]
+    assert not entry["exposed"] and entry["raw"] and not entry["has_mask"]
+    assert page_image_entries(_page(text_over=True), {})[0]["exposed"]
+
+
+def test_prune_raster_regions_keeps_changed_images():
+    for other, conclusive in ((_page(recompress=True), True), (_page(value=90), False)):
+        page1 = _page()
+        vector_result = compare_page_content(extract_page_content(page1), extract_page_content(other))
+        assert vector_result["raster_regions"]
+        prune_raster_regions(vector_result, _compare(page1, other))
+        assert vector_result["conclusive"] is conclusive
+        assert bool(vector_result["raster_regions"]) is not conclusive
@@ -0,0 +1,153 @@
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils import memory_governor
+from utils.compare_job import CompareJob
+from utils.memory_governor import (
+    MIN_RENDER_SCALE, SCALE_STEP, MemoryGovernor, default_budget, pack_result, result_image, result_nbytes,
+    unpack_result,
+)
+from utils.page_source import PageSource
+from utils.stage_metrics import current_rss
+
+MB = 1 << 20
+
+
+class FakeCache:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+    def cache_nbytes(self):
+        return self.nbytes
+
+    def evict_cache(self):
+        freed, self.nbytes = self.nbytes, 0
+        return freed
+
+
+def _governor(monkeypatch, usage, budget=100 * MB):
+    governor = MemoryGovernor(budget)
+    monkeypatch.setattr(governor, "usage", lambda: usage[0])
+    return governor
+
+
+def _result(value=128):
+    img = Image.fromarray(np.full((200, 300, 3), value, np.uint8))
+    return {"diff_image": img, "img1_norm": img.copy(), "img2_norm": None,
+            "ssim_result": {"diff_image": None}, "diff_map": {"magnitude": img.convert("L")}}
+
+
+def test_default_budget_from_env(monkeypatch):
+    monkeypatch.setenv(memory_governor.BUDGET_ENV, "256")
+    assert default_budget() == 256 * MB
+    monkeypatch.delenv(memory_governor.BUDGET_ENV)
+    assert default_budget() > 0
+
+
+def test_report_only_records_events(capsys):
+    governor = MemoryGovernor(MB)
+    governor.report("önbellek boşaltıldı")
+    assert capsys.readouterr().out == ""
+    assert governor.last_event() == "önbellek boşaltıldı"
+    assert governor.last_event(since=governor.events[-1][0] + 1) is None
+
+
+def test_admit_page_evicts_before_lowering_scale(monkeypatch):
+    usage = [150 * MB]
+    governor = _governor(monkeypatch, usage)
+    cache = FakeCache(80 * MB)
+    governor.track(renders=[cache])
+    # Önbellek boşaltmak yetiyor: çözünürlük düşmez
+    assert governor.admit_page() == 1.0
+    assert cache.nbytes == 0
+
+    # Boşaltacak bir şey kalmadı: ölçek adım adım alt sınıra iner
+    assert governor.admit_page() == pytest.approx(SCALE_STEP)
+    for _ in range(10):
+        scale = governor.admit_page()
+    assert scale == MIN_RENDER_SCALE
+
+    # Kullanım rahatlayınca geri artar
+    usage[0] = 10 * MB
+    assert governor.admit_page() > MIN_RENDER_SCALE
+    for _ in range(10):
+        scale = governor.admit_page()
+    assert scale == 1.0
+
+
+def test_results_are_packed_losslessly(monkeypatch):
+    result = _result()
+    original = np.asarray(result["diff_image"]).copy()
+    before = result_nbytes(result)
+    assert pack_result(result) > 0
+    assert result["diff_image"] is None and result_nbytes(result) < before
+    # Sıkıştırılmış görsel sonucu değiştirmeden okunabilir
+    assert np.array_equal(np.asarray(result_image(result, "diff_image")), original)
+    unpack_result(result)
+    assert "_packed" not in result
+    assert np.array_equal(np.asarray(result["diff_image"]), original)
+    assert result["diff_map"]["magnitude"].mode == "L"
+
+
+def test_job_results_except_latest_are_packed():
+    job = CompareJob(3, ["diff"])
+    for i in range(3):
+        job.begin_page(job.next_page())
+        job.end_page(_result(i))
+    assert job.evict_cache() > 0
+    assert [r["diff_image"] is None for r in job.results] == [True, True, False]
+
+
+def test_admit_worker_throttles_on_page_footprint(monkeypatch):
+    usage = [60 * MB]
+    governor = _governor(monkeypatch, usage)
+    governor.note_page_footprint(30 * MB)
+    assert governor.admit_worker(0)
+    assert governor.admit_worker(1)
+    governor.note_page_footprint(50 * MB)
+    assert not governor.admit_worker(1)
+    assert "paralellik 1 işçiyle" in governor.last_event()
+    usage[0] = 20 * MB
+    assert governor.admit_worker(1)
+    assert "sınırı kaldırıldı" in governor.last_event()
+
+
+def test_lowered_scale_does_not_outlive_the_job(monkeypatch):
+    pixel_compare = pytest.importorskip("ui.pixel_compare")
+    analyzer = pixel_compare.CompareAnalyzer()
+    analyzer.memory_governor = _governor(monkeypatch, [500 * MB])
+    seen = []
+
+    def compare_page(i, job, left, right):
+        seen.append((left.render_profile.pixel_scale, right.render_profile.pixel_scale))
+        return None
+
+    monkeypatch.setattr(analyzer, "_compare_page", compare_page)
+    left, right = PageSource(), PageSource()
+    job = CompareJob(2, pixel_compare.COMPARE_STAGES)
+    analyzer._compare_all_pages(job, left, right)
+    # İş sırasında düşürülür, bitince panellerin profili eski ölçeğe döner
+    assert all(scale < 1.0 for pair in seen for scale in pair)
+    assert left.render_profile.pixel_scale == right.render_profile.pixel_scale == 1.0
+
+
+@pytest.mark.skipif(current_rss() is None, reason="RSS ölçülemiyor")
+def test_page_footprint_includes_transient_peaks(monkeypatch):
+    pixel_compare = pytest.importorskip("ui.pixel_compare")
+    analyzer = pixel_compare.CompareAnalyzer()
+    governor = analyzer.memory_governor = _governor(monkeypatch, [10 * MB], budget=1 << 40)
+
+    def compare_page(i, job, left, right):
+        # SSIM / OCR gibi: büyük ara dizi ayrılır ve sayfa bitmeden bırakılır
+        buf = np.ones(128 * MB, np.uint8)
+        time.sleep(0.05)
+        del buf
+        return {"page_num": i + 1, "timings": {}}
+
+    monkeypatch.setattr(analyzer, "_compare_page", compare_page)
+    job = CompareJob(1, pixel_compare.COMPARE_STAGES)
+    analyzer._compare_all_pages(job, PageSource(), PageSource())
+    assert governor._page_peak >= 96 * MB
@@ -0,0 +1,129 @@
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+cv2 = pytest.importorskip("cv2")
+
+from utils import orientation, page_source
+from utils.orientation import MAX_SKEW, estimate_orientation
+from utils.page_source import PageSource
+
+
+def _scan(skew=0.0, quarter=0, seed=0):
+    """Sentetik taranmış sayfa: üst taşmalı kelime blokları, saat yönünde skew derece eğik, quarter kadar çevrik."""
+    rng = np.random.default_rng(seed)
+    img = np.full((1400, 1000), 255, np.uint8)
+    for y in range(80, 1300, 34):
+        x = 80
+        while x < 900:
+            w = int(rng.integers(20, 90))
+            cv2.rectangle(img, (x, y), (min(x + w, 920), y + 14), 0, -1)
+            for k in range(0, w, 12):
+                cv2.rectangle(img, (x + k, y - 6), (x + k + 2, y), 0, -1)
+            x += w + 12
+    mat = cv2.getRotationMatrix2D((500, 700), -skew, 1.0)
+    img = cv2.warpAffine(img, mat, (1000, 1400), borderValue=255)
+    return np.ascontiguousarray(np.rot90(img, k=-quarter // 90))
+
+
+@pytest.mark.parametrize("skew", [0.0, 0.35, 1.3, -2.75, 4.45, -6.6, 9.3])
+def test_skew_is_found_precisely(skew):
+    result = estimate_orientation(_scan(skew))
+    assert result["rotation"] == 0
+    # Düzeltme ters yöndedir; altın oran inceltmesi 0.1° altına iner
+    assert result["skew"] == pytest.approx(-skew, abs=0.1)
+
+
+@pytest.mark.parametrize("quarter", [90, 180, 270])
+def test_quarter_turns_and_upside_down(quarter):
+    result = estimate_orientation(_scan(2.0, quarter))
+    assert result["rotation"] == (360 - quarter) % 360
+    assert result["skew"] == pytest.approx(-2.0, abs=0.1)
+
+
+def test_small_skew_and_blank_page():
+    assert estimate_orientation(_scan(0.1))["skew"] == 0.0
+    assert estimate_orientation(np.full((800, 600), 255, np.uint8)) is None
+
+
+def test_refinement_is_bounded(monkeypatch):
+    calls = []
+    score = orientation._profile_score
+    monkeypatch.setattr(orientation, "_profile_score", lambda ink, a: calls.append(a) or score(ink, a))
+    estimate_orientation(_scan(3.3))
+    coarse = 2 * (int(2 * MAX_SKEW / orientation.COARSE_STEP) + 1)  # 0° ve 90° adayları
+    assert len(calls) <= coarse + 12
+
+
+@pytest.fixture
+def scan_png(tmp_path):
+    path = str(tmp_path / "scan.png")
+    Image.fromarray(_scan(3.0)).save(path)
+    return path
+
+
+def test_background_auto_orient(scan_png):
+    source = PageSource(scan_png)
+    try:
+        assert source.start_auto_orient()
+        source._orient_thread.join(10)
+        assert not source.orienting
+        assert source.rotation == 0
+        assert source.skew == pytest.approx(-3.0, abs=0.1)
+        assert source.orientation["skew"] == source.skew
+    finally:
+        source.close()
+
+
+def test_stale_orientation_is_discarded(scan_png, tmp_path, monkeypatch):
+    gate, entered = threading.Event(), threading.Event()
+
+    def slow_estimate(gray):
+        entered.set()
+        gate.wait(10)
+        return {"rotation": 90, "skew": 1.5, "lines": 10}
+
+    monkeypatch.setattr(page_source, "estimate_orientation", slow_estimate)
+    source = PageSource(scan_png)
+    try:
+        # Tahmin sürerken kullanıcı elle çevirir: elle rotasyon korunur
+        assert source.start_auto_orient()
+        assert entered.wait(10)
+        assert source.orienting
+        source.rotation = 180
+        gate.set()
+        source._orient_thread.join(10)
+        assert (source.rotation, source.skew, source.orientation) == (180, 0.0, None)
+
+        # Tahmin sürerken başka dosya açılır: eski sonuç uygulanmaz
+        gate.clear()
+        entered.clear()
+        other = str(tmp_path / "other.png")
+        Image.fromarray(_scan(0.0)).save(other)
+        assert source.start_auto_orient()
+        assert entered.wait(10)
+        source.open(other)
+        gate.set()
+        source._orient_thread.join(10)
+        assert (source.rotation, source.orientation) == (0, None)
+    finally:
+        gate.set()
+        source.close()
+
+
+def test_vector_pdf_is_not_oriented(tmp_path):
+    import fitz
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Metin", fontsize=12)
+    path = str(tmp_path / "vector.pdf")
+    doc.save(path)
+    source = PageSource(path)
+    try:
+        assert not source.start_auto_orient()
+        assert not source.orienting
+        assert source.auto_orient() is None
+    finally:
+        source.close()
@@ -0,0 +1,66 @@
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+from utils.page_raster import PixmapArray, as_array, pixmap_to_array, render_page_array, rotate_image, to_gray, to_rgb
+
+
+def _page():
+    doc = fitz.open()
+    page = doc.new_page(width=200, height=100)
+    page.draw_rect(fitz.Rect(10, 10, 60, 40), color=(0, 0, 0), fill=(0, 0, 0))
+    return doc, page
+
+
+def test_render_shapes_and_rotation():
+    doc, page = _page()
+    gray = render_page_array(page, 1.0, gray=True)
+    rgb = render_page_array(page, 2.0)
+    rotated = render_page_array(page, 1.0, gray=True, rotation=90)
+    assert gray.shape == (100, 200)
+    assert rgb.shape == (200, 400, 3)
+    assert rotated.shape == (200, 100)
+    # Siyah dikdörtgen sol üstte; 90° saat yönünde döndürünce sağ üste geçer
+    assert gray[20, 30] == 0 and gray[80, 150] == 255
+    assert rotated[30, 80] == 0 and rotated[30, 10] == 255
+    # Kenar yumuşatması farklı düşebilir; içerik aynı
+    assert np.abs(rotated.astype(int) - np.rot90(gray, -1)).max() < 32
+    doc.close()
+
+
+def test_pixmap_array_shares_buffer_and_keeps_pixmap():
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 7, 3), False)
+    pix.clear_with(255)
+    arr = pixmap_to_array(pix)
+    assert isinstance(arr, PixmapArray)
+    assert arr.shape == (3, 7, 3)
+    assert arr._pixmap is pix
+    # Dilimler de pixmap referansını taşır
+    assert arr[1:]._pixmap is pix
+    pix.set_pixel(2, 1, (10, 20, 30))
+    assert tuple(arr[1, 2]) == (10, 20, 30)
+
+
+def test_array_conversions():
+    rgb = np.zeros((4, 5, 3), np.uint8)
+    rgb[..., 0] = 255
+    assert as_array(rgb) is rgb
+    assert to_rgb(rgb) is rgb
+    gray = to_gray(rgb)
+    assert gray.shape == (4, 5)
+    assert to_gray(gray) is gray
+    assert to_rgb(gray).shape == (4, 5, 3)
+    assert as_array(Image.new("RGBA", (5, 4))).shape == (4, 5, 3)
+    assert as_array(Image.new("L", (5, 4))).shape == (4, 5)
+
+
+def test_rotate_image_is_clockwise():
+    img = Image.new("L", (3, 2), 0)
+    img.putpixel((0, 0), 255)
+    assert rotate_image(img, 0) is img
+    assert rotate_image(img, 360) is img
+    turned = rotate_image(img, 90)
+    assert turned.size == (2, 3)
+    assert turned.getpixel((1, 0)) == 255
+    assert rotate_image(img, 180).getpixel((2, 1)) == 255
+    assert rotate_image(img, 270).getpixel((0, 2)) == 255
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.raster_document import RasterDocument
+
+
+def _save(tmp_path, img, name, **kwargs):
+    path = tmp_path / name
+    img.save(path, **kwargs)
+    return str(path)
+
+
+@pytest.fixture
+def bilevel_tiff(tmp_path):
+    img = Image.new("1", (3000, 2000), 1)
+    img.paste(0, (100, 100, 900, 400))
+    return _save(tmp_path, img, "scan.tif", compression="group4")
+
+
+@pytest.fixture
+def palette_png(tmp_path):
+    img = Image.new("RGB", (1200, 800), "white")
+    img.paste((200, 30, 30), (100, 100, 500, 300))
+    return _save(tmp_path, img.convert("P", palette=Image.Palette.ADAPTIVE), "logo.png")
+
+
+@pytest.fixture
+def gray16_png(tmp_path):
+    data = np.full((800, 1200), 200, dtype=np.uint16)
+    data[100:300, 100:500] = 20
+    img = Image.fromarray(data)
+    assert img.mode == "I;16"
+    return _save(tmp_path, img, "gray16.png")
+
+
+@pytest.mark.parametrize("fixture", ["bilevel_tiff", "palette_png", "gray16_png"])
+@pytest.mark.parametrize("mode", ["RGB", "L"])
+@pytest.mark.parametrize("scale", [0.1, 0.3, 0.75, 1.0])
+def test_render_modes_without_reduce_support(request, fixture, mode, scale):
+    path = request.getfixturevalue(fixture)
+    doc = RasterDocument(path)
+    w, h = doc.page_size(0)
+    img = doc.render(0, scale, mode)
+    assert img.mode == mode
+    assert img.size == (max(1, int(w * scale)), max(1, int(h * scale)))
+    # Küçültme içeriği korur: koyu dikdörtgen hâlâ açık zeminden koyu
+    gray = img.convert("L")
+    inside = gray.getpixel((int(300 * scale), int(200 * scale)))
+    corner = gray.getpixel((img.width - 1, img.height - 1))
+    assert inside < corner
+
+
+def test_render_matches_full_conversion(palette_png):
+    doc = RasterDocument(palette_png)
+    with Image.open(palette_png) as src:
+        expected = src.convert("RGB").getpixel((300, 200))
+    assert doc.render(0, 0.25, "RGB").getpixel((75, 50)) == expected
+
+
+def test_multiframe_tiff(tmp_path):
+    frames = [Image.new("L", (400, 300), v) for v in (0, 128, 255)]
+    path = _save(tmp_path, frames[0], "multi.tif", save_all=True, append_images=frames[1:])
+    doc = RasterDocument(path)
+    assert doc.page_count == 3
+    assert [doc.render(i, 0.5, "L").getpixel((10, 10)) for i in range(3)] == [0, 128, 255]
+    with pytest.raises(IndexError):
+        doc.render(3)
+
+
+def test_page_source_triage_bilevel(bilevel_tiff):
+    from utils.page_source import PageSource
+
+    source = PageSource(bilevel_tiff)
+    try:
+        for stage in ("display", "triage", "diff", "ocr"):
+            arr = source.get_page_array(0, stage, gray=True)
+            assert arr is not None and arr.ndim == 2
+    finally:
+        source.close()
@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+
+from utils.region_classify import class_counts, classify_regions, format_class_counts
+
+
+def _pair(h=80, w=120):
+    rgb = np.full((h, w, 3), 255, np.uint8)
+    return rgb, rgb.copy()
+
+
+def _gray(rgb):
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+
+
+def _classify(rgb1, rgb2, boxes, text_boxes=None):
+    return classify_regions(boxes, rgb1, rgb2, _gray(rgb1), _gray(rgb2), text_boxes)
+
+
+def test_empty_boxes():
+    rgb1, rgb2 = _pair()
+    assert _classify(rgb1, rgb2, []) == []
+
+
+def test_recolored_shape_is_color():
+    rgb1, rgb2 = _pair()
+    cv2.rectangle(rgb1, (20, 20), (60, 50), (200, 30, 30), -1)
+    cv2.rectangle(rgb2, (20, 20), (60, 50), (30, 30, 200), -1)
+    assert _classify(rgb1, rgb2, [(18, 18, 45, 35)]) == ["color"]
+
+
+def test_added_shape_is_graphic():
+    rgb1, rgb2 = _pair()
+    cv2.circle(rgb2, (60, 40), 20, (0, 0, 0), 2)
+    assert _classify(rgb1, rgb2, [(36, 16, 49, 49)]) == ["graphic"]
+
+
+def test_text_span_decides_text():
+    rgb1, rgb2 = _pair()
+    cv2.putText(rgb2, "Ab", (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+    box = (18, 25, 45, 30)
+    assert _classify(rgb1, rgb2, [box], text_boxes=[box]) == ["text"]
+    # Span bilgisi başka yerdeyse aynı kutu metin sayılmaz
+    assert _classify(rgb1, rgb2, [box], text_boxes=[(90, 60, 10, 10)]) == ["graphic"]
+
+
+def test_labels_follow_box_order_and_sizes_differ():
+    rgb1, _ = _pair()
+    rgb2 = np.full((90, 120, 3), 255, np.uint8)
+    cv2.rectangle(rgb1, (5, 5), (30, 30), (200, 30, 30), -1)
+    cv2.rectangle(rgb2, (5, 5), (30, 30), (30, 30, 200), -1)
+    cv2.rectangle(rgb2, (70, 50), (110, 85), (90, 90, 90), -1)
+    boxes = [(68, 48, 45, 40), (3, 3, 30, 30)]
+    assert _classify(rgb1, rgb2, boxes) == ["graphic", "color"]
+
+
+def test_class_counts_and_format():
+    labels = ["graphic", "text", "text", "color"]
+    assert list(class_counts(labels)) == ["text", "graphic", "color"]
+    assert class_counts(labels)["text"] == 2
+    assert format_class_counts(labels) == "2 Metin • 1 Grafik • 1 Renk tonu"
+    assert format_class_counts(None) == ""
+    assert format_class_counts([]) == ""
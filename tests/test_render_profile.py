@@ -0,0 +1,62 @@
+import pytest
+
+from utils.render_profile import DEFAULT_PROFILE, RENDER_PROFILES, ROI_MAX_ZOOM, STAGES, RenderProfile
+
+A4 = (595, 842)
+
+
+def test_profiles_cover_all_stages():
+    assert DEFAULT_PROFILE in RENDER_PROFILES
+    for settings in RENDER_PROFILES.values():
+        assert set(settings) == set(STAGES)
+
+
+def test_unknown_names_raise():
+    with pytest.raises(ValueError):
+        RenderProfile("Yok")
+    with pytest.raises(ValueError):
+        RenderProfile().dpi_and_budget("yok")
+
+
+def test_zoom_uses_target_dpi_within_budget():
+    profile = RenderProfile("Dengeli")
+    assert profile.zoom_for(*A4, "diff") == pytest.approx(216 / 72)
+    assert profile.zoom_for(*A4, "triage") == pytest.approx(1.0)
+
+
+def test_zoom_respects_pixel_budget():
+    profile = RenderProfile("Dengeli")
+    _, budget = profile.dpi_and_budget("diff")
+    w, h = 2384, 3370  # A0
+    zoom = profile.zoom_for(w, h, "diff")
+    assert zoom < 216 / 72
+    assert (w * zoom) * (h * zoom) == pytest.approx(budget)
+
+
+def test_raster_scale_never_upscales():
+    profile = RenderProfile("Dengeli")
+    assert profile.scale_for_pixels(1000, 1000, "diff") == 1.0
+    _, budget = profile.dpi_and_budget("diff")
+    scale = profile.scale_for_pixels(8000, 8000, "diff")
+    assert (8000 * scale) ** 2 == pytest.approx(budget)
+
+
+def test_pixel_scale_only_governs_diff_and_ocr():
+    profile = RenderProfile("Dengeli")
+    base = {stage: profile.zoom_for(*A4, stage) for stage in STAGES}
+    profile.pixel_scale = 0.25
+    assert profile.zoom_for(*A4, "diff") == pytest.approx(base["diff"] / 2)
+    assert profile.zoom_for(*A4, "ocr") == pytest.approx(base["ocr"] / 2)
+    assert profile.zoom_for(*A4, "display") == base["display"]
+    assert profile.scale_for_pixels(1000, 1000, "diff") == pytest.approx(0.5)
+    assert profile.scale_for_pixels(1000, 1000, "display") == 1.0
+
+
+def test_roi_zoom_upscales_small_regions():
+    profile = RenderProfile("Dengeli")
+    # 400x200 pt'lik bölge uzun kenarı ROI_TARGET_SIDE olacak kadar, çok küçükler ROI_MAX_ZOOM'a kadar büyütülür
+    assert profile.roi_zoom(100, 50, "diff") == pytest.approx(ROI_MAX_ZOOM)
+    assert profile.roi_zoom(400, 200, "diff") == pytest.approx(5.0)
+    assert profile.roi_zoom(400, 200, "display") == profile.zoom_for(400, 200, "display")
+    # Bütün sayfa büyütülmez
+    assert profile.roi_zoom(*A4, "diff") == profile.zoom_for(*A4, "diff")
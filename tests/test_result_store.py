@@ -0,0 +1,102 @@
+import hashlib
+import io
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils import result_store
+from utils.memory_governor import pack_result
+from utils.result_store import ResultStore, comparison_key, file_digest, summarize_page_results
+
+SETTINGS = {"profile": "Standart", "merge": "Kelime", "vector": True, "orientation": "auto", "tolerance": "Kapalı"}
+
+
+def test_comparison_key_is_stable():
+    # Anahtar biçimi değişirse kayıtlı sonuçlar sessizce kullanılmaz hale gelir
+    assert comparison_key("a" * 40, "b" * 40, SETTINGS) == "7718ae662f94a977c637f05c983fbf2e41f71504"
+    reordered = dict(reversed(list(SETTINGS.items())))
+    assert comparison_key("a" * 40, "b" * 40, reordered) == comparison_key("a" * 40, "b" * 40, SETTINGS)
+    # Kayıttan okunan (JSON) ayarlar aynı anahtarı verir
+    assert comparison_key("a", "b", json.loads(json.dumps(SETTINGS))) == comparison_key("a", "b", SETTINGS)
+
+
+def test_comparison_key_separates_inputs(monkeypatch):
+    key = comparison_key("a", "b", SETTINGS)
+    assert comparison_key("b", "a", SETTINGS) != key
+    assert comparison_key("a", "b", dict(SETTINGS, tolerance="Hafif")) != key
+    monkeypatch.setattr(result_store, "RESULT_VERSION", result_store.RESULT_VERSION + 1)
+    assert comparison_key("a", "b", SETTINGS) != key
+
+
+def test_compare_settings_key_survives_json():
+    pixel_compare = pytest.importorskip("ui.pixel_compare")
+    settings = pixel_compare.compare_settings("Standart", "Kelime", 1, ((90, 0.5), (0, 0.0)))
+    assert settings["orientation"] == [[90, 0.5], [0, 0.0]]
+    assert comparison_key("a", "b", json.loads(json.dumps(settings))) == comparison_key("a", "b", settings)
+
+
+def test_file_digest(tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"x" * (3 << 20))
+    assert file_digest(str(path)) == hashlib.sha1(path.read_bytes()).hexdigest()
+    other = tmp_path / "b.bin"
+    other.write_bytes(b"x" * (3 << 20) + b"y")
+    assert file_digest(str(path)) != file_digest(str(other))
+
+
+def _page(num, n_diffs, ssim):
+    img = Image.fromarray(np.full((600, 400, 3), 200, np.uint8))
+    return {
+        "page_num": num,
+        "differences": [(i * 10, 5, 8, 8) for i in range(n_diffs)],
+        "diff_classes": None,
+        "diff_image": img, "img1_norm": img.copy(), "img2_norm": img.copy(),
+        "ssim_result": {"score": ssim, "diff_image": None},
+        "text_result": {"ratio": 0.98},
+        "vector_result": None, "image_result": None,
+        "timings": {"diff": {"wall": 0.5, "cpu": 0.4, "rss_delta": None}},
+    }
+
+
+def test_summary():
+    summary = summarize_page_results([_page(1, 2, 0.9), _page(2, 0, 0.99)])
+    assert summary["differences"] == 2
+    assert summary["min_ssim"] == pytest.approx(0.9)
+    assert summary["wall"] == pytest.approx(1.0)
+    assert summary["pages"][0]["differences"] == [[0, 5, 8, 8], [10, 5, 8, 8]]
+    json.dumps(summary)
+
+
+def test_store_roundtrip(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    try:
+        packed = _page(2, 0, 0.99)
+        pack_result(packed)  # Bellek yöneticisinin sıkıştırdığı sonuç da kaydedilebilir
+        first = store.save("/m/etiket.pdf", "/p/etiket.pdf", "m1", "p1", SETTINGS, [_page(1, 3, 0.8), packed])
+        assert store.lookup("m1", "p1", SETTINGS)["id"] == first
+        assert store.lookup("m1", "p1", dict(SETTINGS, merge="Satır")) is None
+
+        pages = store.pages(first)
+        assert [p["page_num"] for p in pages] == [1, 2]
+        assert (pages[0]["width"], pages[0]["height"]) == (400, 600)
+        assert all(p["diff_thumb"][:2] == b"\xff\xd8" for p in pages)  # JPEG
+        assert max(Image.open(io.BytesIO(pages[0]["master_thumb"])).size) <= 480
+
+        # Aynı anahtar yeniden kaydedilince eski kayıt değişir
+        second = store.save("/m/etiket.pdf", "/p/etiket.pdf", "m1", "p1", SETTINGS, [_page(1, 0, 1.0)])
+        assert len(store.history()) == 1
+        assert [p["page_num"] for p in store.pages(second)] == [1]
+        assert store.lookup("m1", "p1", SETTINGS)["summary"]["differences"] == 0
+
+        store.save("/m/kutu.pdf", "/p/kutu.pdf", "m2", "p1", SETTINGS, [_page(1, 1, 0.9)])
+        assert [h["master_path"] for h in store.history()] == ["/m/kutu.pdf", "/m/etiket.pdf"]
+        assert [h["master_path"] for h in store.history(search="kutu")] == ["/m/kutu.pdf"]
+        assert len(store.history(digest="p1")) == 2
+        assert len(store.history(digest="m2")) == 1
+
+        store.delete(second)
+        assert store.lookup("m1", "p1", SETTINGS) is None
+    finally:
+        store.close()
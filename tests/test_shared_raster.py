@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import fitz
+import numpy as np
+import pytest
+
+from utils.page_source import PageSource
+from utils.shared_raster import RasterHandle, RasterTransport, init_worker
+
+START_METHODS = [m for m in ("spawn", "fork") if m in multiprocessing.get_all_start_methods()]
+
+
+def _checksum(handle):
+    """Havuz işçisi: bloğu kopyasız okuyup payını bırakır."""
+    with handle.open() as arr:
+        total = int(arr.sum(dtype=np.int64))
+    handle.release()
+    return total
+
+
+def _released(handle):
+    try:
+        shm = shared_memory.SharedMemory(name=handle.name)
+    except FileNotFoundError:
+        return True
+    shm.close()
+    return False
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    for text in ("Sayfa 1", "Sayfa 2"):
+        doc.new_page().insert_text((72, 72), text, fontsize=24)
+    path = str(tmp_path / "doc.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.mark.parametrize("method", START_METHODS)
+def test_pool_reads_and_releases_segments(pdf_path, method):
+    ctx = multiprocessing.get_context(method)
+    transport = RasterTransport(ctx)
+    source = PageSource(pdf_path)
+    try:
+        arrays = [source.get_page_array(i, "triage", gray=True) for i in range(source.total_pages)]
+        # Her sayfayı iki işçi okur (örn. diff ve SSIM)
+        handles = [source.publish_page(transport, i, "triage", gray=True, consumers=2)
+                   for i in range(source.total_pages)]
+        assert source.publish_page(transport, 5, "triage") is None
+        with ctx.Pool(2, initializer=init_worker, initargs=transport.worker_args()) as pool:
+            sums = pool.map(_checksum, handles * 2)
+        assert sums == [int(arr.sum(dtype=np.int64)) for arr in arrays] * 2
+        assert all(_released(h) for h in handles)
+        assert transport.outstanding() == (0, 0)
+        if os.path.isdir("/dev/shm"):
+            assert not any(os.path.exists(os.path.join("/dev/shm", h.name.lstrip("/"))) for h in handles)
+    finally:
+        transport.close()
+        source.close()
+
+
+def test_last_consumer_unlinks():
+    transport = RasterTransport()
+    try:
+        handle = transport.publish(np.arange(12, dtype=np.uint16).reshape(3, 4), consumers=2)
+        assert transport.outstanding()[0] == 1
+        with handle.open() as arr:
+            assert arr.dtype == np.uint16 and arr[2, 3] == 11
+            assert not arr.flags.writeable
+        assert handle.release() == 1
+        assert not _released(handle)
+        assert handle.release() == 0
+        assert _released(handle)
+        assert transport.outstanding() == (0, 0)
+    finally:
+        transport.close()
+
+
+def test_close_unlinks_unreleased_blocks():
+    transport = RasterTransport()
+    handle, view = transport.allocate((4, 4), consumers=3)
+    view[...] = 7
+    del view
+    transport.close()
+    assert _released(handle)
+
+
+def test_handle_pickles_without_pixels():
+    import pickle
+
+    handle = RasterHandle("blok", (100, 200, 3), np.uint8)
+    copy = pickle.loads(pickle.dumps(handle))
+    assert (copy.name, copy.shape, copy.dtype, copy.nbytes) == ("blok", (100, 200, 3), "|u1", 60000)
+    assert len(pickle.dumps(handle)) < 200
+
+    with pytest.raises(ValueError):
+        RasterTransport().allocate((2, 2), consumers=0)
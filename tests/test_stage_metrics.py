@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+import pytest
+
+from utils.stage_metrics import PeakRss, StageRecorder, current_rss, format_stage_metrics
+
+
+def _vm_hwm():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def test_stages_accumulate_wall_time():
+    recorder = StageRecorder()
+    for _ in range(2):
+        with recorder.stage("render"):
+            time.sleep(0.01)
+        recorder.start("diff")
+    recorder.stop()
+    assert list(recorder.stages) == ["render", "diff"]
+    assert recorder.stages["render"]["wall"] >= 0.02
+    assert all(m["cpu"] >= 0 for m in recorder.stages.values())
+
+
+@pytest.mark.skipif(current_rss() is None, reason="RSS ölçülemiyor")
+def test_rss_delta_is_current_rss_growth():
+    recorder = StageRecorder()
+    with recorder.stage("alloc"):
+        kept = np.ones(64 * 1024 * 1024, np.uint8)  # 64 MB, aşama sonunda hâlâ bellekte
+    with recorder.stage("idle"):
+        pass
+    assert recorder.stages["alloc"]["rss_delta"] >= 48 * 1024 * 1024
+    assert recorder.stages["idle"]["rss_delta"] < 16 * 1024 * 1024
+    del kept
+
+
+@pytest.mark.skipif(current_rss() is None, reason="RSS ölçülemiyor")
+def test_peak_rss_sees_freed_buffers():
+    with PeakRss() as peak:
+        buf = np.ones(128 * 1024 * 1024, np.uint8)  # 128 MB, blok bitmeden bırakılır
+        time.sleep(0.05)
+        del buf
+    assert peak.delta >= 96 * 1024 * 1024
+    with PeakRss() as idle:
+        time.sleep(0.02)
+    assert idle.delta < 16 * 1024 * 1024
+
+
+@pytest.mark.skipif(_vm_hwm() is None, reason="VmHWM yok")
+def test_process_peak_is_not_reset():
+    buf = np.ones(64 * 1024 * 1024, np.uint8)
+    del buf
+    peak = _vm_hwm()
+    recorder = StageRecorder()
+    with recorder.stage("render"):
+        pass
+    assert _vm_hwm() >= peak
+
+
+def test_format_stage_metrics():
+    metrics = {
+        "render": {"wall": 1.234, "cpu": 1.0, "rss_delta": 3 * 1024 * 1024},
+        "ocr": {"wall": 0.5, "cpu": 0.25, "rss_delta": None},
+    }
+    assert format_stage_metrics(metrics, {"render": "Render"}) == \
+        "Render 1.23s (CPU 1.00s, +3 MB) • ocr 0.50s (CPU 0.25s)"
@@ -0,0 +1,112 @@
+import os
+import time
+
+import fitz  # PyMuPDF
+import pytest
+from PIL import Image
+
+from utils.app_paths import app_data_path
+from utils.thumbnail_cache import THUMB_DIR, ThumbnailRenderer, prune_thumbnail_cache, thumbnail_key
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    for i in range(4):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), f"Sayfa {i + 1}")
+    path = tmp_path / "doc.pdf"
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def _collect(renderer, count, timeout=10.0):
+    items = {}
+    deadline = time.monotonic() + timeout
+    while len(items) < count and time.monotonic() < deadline:
+        items.update(renderer.ready())
+        time.sleep(0.01)
+    return items
+
+
+def test_key_tracks_file_identity_and_view(tmp_path):
+    path = tmp_path / "a.png"
+    Image.new("RGB", (10, 10)).save(path)
+    key = thumbnail_key(str(path), 0, 0, 120)
+    assert key == thumbnail_key(str(path), 0, 0, 120)
+    assert key != thumbnail_key(str(path), 1, 0, 120)
+    assert key != thumbnail_key(str(path), 0, 90, 120)
+    assert key != thumbnail_key(str(path), 0, 0, 200)
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert key != thumbnail_key(str(path), 0, 0, 120)
+
+
+def test_prune_keeps_newest(app_home):
+    folder = app_data_path(THUMB_DIR)
+    os.makedirs(folder)
+    for i in range(5):
+        name = os.path.join(folder, f"{i}.jpg")
+        open(name, "wb").close()
+        os.utime(name, (1000 + i, 1000 + i))
+    prune_thumbnail_cache(max_files=2)
+    assert sorted(os.listdir(folder)) == ["3.jpg", "4.jpg"]
+
+
+def test_renders_pages_and_reuses_disk_cache(pdf_path):
+    renderer = ThumbnailRenderer(max_side=60)
+    try:
+        renderer.set_document(pdf_path, 4)
+        items = _collect(renderer, 4)
+    finally:
+        renderer.close()
+    assert sorted(items) == [0, 1, 2, 3]
+    assert max(items[0].size) == 60
+    cached = os.listdir(app_data_path(THUMB_DIR))
+    assert len(cached) == 4
+
+    # Aynı dosya tekrar açılınca sonuçlar diskten gelir, yeni dosya yazılmaz
+    renderer = ThumbnailRenderer(max_side=60)
+    try:
+        renderer.set_document(pdf_path, 4)
+        assert sorted(_collect(renderer, 4)) == [0, 1, 2, 3]
+    finally:
+        renderer.close()
+    assert sorted(os.listdir(app_data_path(THUMB_DIR))) == sorted(cached)
+
+
+def test_rotation_swaps_thumbnail_size(pdf_path):
+    renderer = ThumbnailRenderer(max_side=60)
+    try:
+        renderer.set_document(pdf_path, 1, rotation=90)
+        img = _collect(renderer, 1)[0]
+    finally:
+        renderer.close()
+    assert img.width > img.height
+
+
+def test_prioritize_moves_pages_to_front(pdf_path):
+    renderer = ThumbnailRenderer()
+    try:
+        # Koşul kilidi tutulurken thread sıradan sayfa alamaz
+        with renderer._cond:
+            renderer.set_document(pdf_path, 4)
+            renderer.prioritize([3, 2, 3, 9])
+            assert renderer._pending == [3, 2, 0, 1]
+    finally:
+        renderer.close()
+
+
+def test_stale_generation_is_dropped(pdf_path):
+    renderer = ThumbnailRenderer(max_side=60)
+    try:
+        renderer.set_document(pdf_path, 4)
+        _collect(renderer, 4)
+        with renderer._cond:
+            renderer._ready.put((renderer._generation, 0, Image.new("RGB", (1, 1))))
+            renderer.set_document(None, 0)
+        assert renderer.ready() == []
+    finally:
+        renderer.close()
@@ -0,0 +1,82 @@
+import cv2
+import numpy as np
+import pytest
+
+from utils.tolerant_diff import (
+    DEFAULT_TOLERANCE, DIFF_TOLERANCES, STRICT_THRESHOLD, default_sensitivity, diff_magnitude, diff_mask,
+    extract_boxes, tolerance_params,
+)
+
+
+def _page(h=60, w=80):
+    return np.full((h, w), 255, np.uint8)
+
+
+def test_default_is_strict_baseline():
+    assert DEFAULT_TOLERANCE == "Kapalı"
+    assert tolerance_params(DEFAULT_TOLERANCE) is None
+    assert default_sensitivity() == (STRICT_THRESHOLD, 3, 2)
+
+
+def test_tolerance_params():
+    assert tolerance_params("Hafif") == DIFF_TOLERANCES["Hafif"]
+    assert tolerance_params((2, 30)) == (2, 30)
+    assert tolerance_params(None) is None
+    with pytest.raises(ValueError):
+        tolerance_params("Yok")
+
+
+def test_strict_mask_matches_baseline_threshold():
+    rng = np.random.default_rng(0)
+    gray1 = rng.integers(0, 256, (50, 70), dtype=np.uint8)
+    gray2 = rng.integers(0, 256, (50, 70), dtype=np.uint8)
+    _, baseline = cv2.threshold(cv2.absdiff(gray1, gray2), 10, 255, cv2.THRESH_BINARY)
+    assert np.array_equal(diff_mask(gray1, gray2), baseline)
+    assert np.array_equal(diff_mask(gray1, gray2, "Kapalı"), baseline)
+
+    # Eşik 10: 10 birimlik fark sayılmaz, 11 sayılır
+    gray2 = _page()
+    gray2[0, 0] = 245
+    gray2[0, 1] = 244
+    mask = diff_mask(_page(), gray2)
+    assert mask[0, 0] == 0 and mask[0, 1] == 255
+
+
+def test_envelope_ignores_subpixel_shift():
+    gray1, gray2 = _page(), _page()
+    gray1[20:40, 20:22] = 0
+    gray2[20:40, 21:23] = 0  # 1 px kayma
+    assert diff_mask(gray1, gray2, "Kapalı").any()
+    assert not diff_mask(gray1, gray2, "Hafif").any()
+
+
+def test_envelope_detects_added_and_removed_lines():
+    blank, line = _page(), _page()
+    line[30, 10:70] = 0  # 1 px ince çizgi
+    for gray1, gray2 in ((blank, line), (line, blank)):
+        for tolerance in ("Hafif", "Normal", "Geniş"):
+            assert diff_mask(gray1, gray2, tolerance).any(), tolerance
+
+
+def test_diff_magnitude_is_unthresholded():
+    gray2 = _page()
+    gray2[5, 5] = 250
+    magnitude = diff_magnitude(_page(), gray2, "Kapalı")
+    assert magnitude.dtype == np.uint8
+    assert magnitude[5, 5] == 5
+    assert diff_mask(_page(), gray2, threshold=4)[5, 5] == 255
+
+
+def test_extract_boxes():
+    magnitude = np.zeros((60, 80), np.uint8)
+    magnitude[5:10, 5:10] = 200
+    magnitude[30:35, 40:45] = 200
+    magnitude[30:35, 46:50] = 200  # 1 px boşluk kapamayla birleşir
+    magnitude[55, 75] = 200        # tek piksel gürültü
+    boxes = sorted(extract_boxes(magnitude, 10))
+    assert boxes == [(5, 5, 5, 5), (40, 30, 10, 5)]
+
+    # Kapama yoksa parçalar ayrı kalır; eşik yükselince fark kaybolur
+    assert len(extract_boxes(magnitude, 10, kernel=1)) == 3
+    assert extract_boxes(magnitude, 200) == []
+    assert len(extract_boxes(magnitude, 10, min_area=100)) == 0
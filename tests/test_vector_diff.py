@@ -0,0 +1,178 @@
+import fitz
+import numpy as np
+import pytest
+
+from utils.tolerant_diff import uncovered_boxes
+from utils.vector_diff import MAX_PAIR_CANDIDATES, _match, add_unexplained_regions, compare_pages, match_overlapping
+
+
+def _base(page):
+    page.insert_text((72, 72), "Kullanma talimati", fontsize=14)
+    page.draw_rect(fitz.Rect(72, 100, 200, 140), color=(0, 0, 0), width=1)
+
+
+def _append_stream(page, stream):
+    xref = page.get_contents()[0]
+    page.parent.update_stream(xref, page.read_contents() + b"\n" + stream)
+
+
+def _clip(rect):
+    def modify(page):
+        _append_stream(page, b"q %d %d %d %d re W n 0 0 1 rg 100 300 300 300 re f Q" % rect)
+    return modify
+
+
+def _annot(page):
+    page.add_rect_annot(fitz.Rect(300, 300, 400, 400))
+
+
+def _ocg(on):
+    def modify(page):
+        ocg = page.parent.add_ocg("Katman", on=on)
+        page.draw_rect(fitz.Rect(300, 300, 400, 400), color=(1, 0, 0), fill=(1, 0, 0), oc=ocg)
+    return modify
+
+
+def _shading(color):
+    def modify(page):
+        doc = page.parent
+        xref = doc.get_new_xref()
+        doc.update_object(xref, "<</ShadingType 2/ColorSpace/DeviceRGB/Coords[100 300 400 300]"
+                                "/Function<</FunctionType 2/Domain[0 1]/C0[1 1 1]/C1[%s]/N 1>>>>" % color)
+        kind, res = doc.xref_get_key(page.xref, "Resources")
+        if kind == "xref":
+            doc.xref_set_key(int(res.split()[0]), "Shading", "<</Sh1 %d 0 R>>" % xref)
+        else:
+            doc.xref_set_key(page.xref, "Resources/Shading", "<</Sh1 %d 0 R>>" % xref)
+        _append_stream(page, b"q 100 300 300 200 re W n /Sh1 sh Q")
+    return modify
+
+
+def _text(text, render_mode=0):
+    def modify(page):
+        page.insert_text((72, 400), text, fontsize=24, render_mode=render_mode)
+    return modify
+
+
+def _pdf_pair(tmp_path, modify1, modify2):
+    paths = []
+    for tag, modify in (("a", modify1), ("b", modify2)):
+        doc = fitz.open()
+        page = doc.new_page()
+        _base(page)
+        modify(page)
+        path = str(tmp_path / f"{tag}.pdf")
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    pixel_compare = pytest.importorskip("ui.pixel_compare")
+    return pixel_compare.CompareAnalyzer()
+
+
+# Yalnızca içerik listesinde görünmeyen özelliklerde farklı sayfa çiftleri
+FEATURE_PAIRS = {
+    "clip": (_clip((100, 300, 100, 100)), _clip((100, 300, 200, 100))),
+    "annot": (lambda page: None, _annot),
+    "ocg": (_ocg(True), _ocg(False)),
+    "shading": (_shading("0 0 1"), _shading("1 0 0")),
+    "render_mode": (_text("Doz 500 mg", 0), _text("Doz 500 mg", 1)),
+}
+
+
+@pytest.mark.parametrize("feature", sorted(FEATURE_PAIRS))
+def test_vector_mode_finds_non_vector_differences(tmp_path, analyzer, feature):
+    path1, path2 = _pdf_pair(tmp_path, *FEATURE_PAIRS[feature])
+    results, skipped = analyzer.compare_files(path1, path2)
+    assert not skipped
+    page = results[0]
+    assert page["vector_result"] is not None
+    assert page["differences"], feature
+
+
+def test_clip_only_difference_is_not_conclusive(tmp_path, analyzer):
+    path1, path2 = _pdf_pair(tmp_path, *FEATURE_PAIRS["clip"])
+    with fitz.open(path1) as d1, fitz.open(path2) as d2:
+        # İçerik listesi kırpma farkını görmez...
+        assert compare_pages(d1[0], d2[0])["conclusive"]
+    # ...kaba raster kontrolü görür
+    vector_result = analyzer.compare_files(path1, path2)[0][0]["vector_result"]
+    assert not vector_result["conclusive"]
+    assert vector_result["raster_regions"]
+    assert "kaba raster" in vector_result["reason"]
+
+
+def test_identical_and_text_only_changes_stay_conclusive(tmp_path, analyzer):
+    path1, path2 = _pdf_pair(tmp_path, _text("Doz 500 mg"), _text("Doz 500 mg"))
+    page = analyzer.compare_files(path1, path2)[0][0]
+    assert page["vector_result"]["conclusive"]
+    assert page["differences"] == []
+
+    path1, path2 = _pdf_pair(tmp_path, _text("Doz 500 mg"), _text("Doz 250 mg"))
+    page = analyzer.compare_files(path1, path2)[0][0]
+    assert page["vector_result"]["conclusive"]
+    assert page["vector_result"]["changes"]
+    assert page["differences"]
+
+
+def test_add_unexplained_regions_keeps_previous_reason():
+    result = {"conclusive": True, "reason": None, "changes": [], "raster_regions": []}
+    add_unexplained_regions(result, [])
+    assert result["conclusive"]
+
+    result["reason"] = "1 görsel alanı piksel ile karşılaştırılacak"
+    result["raster_regions"] = [(fitz.Rect(0, 0, 10, 10), None)]
+    add_unexplained_regions(result, [(fitz.Rect(5, 5, 8, 8), fitz.Rect(5, 5, 8, 8))])
+    assert not result["conclusive"]
+    assert len(result["raster_regions"]) == 2
+    assert result["reason"].startswith("1 görsel alanı")
+    assert "kaba raster kontrolü 1 alanda" in result["reason"]
+
+
+def test_uncovered_boxes_skips_covered_differences():
+    gray1 = np.full((100, 100), 255, np.uint8)
+    gray2 = gray1.copy()
+    gray2[10:20, 10:20] = 0
+    gray2[60:70, 60:80] = 0
+    assert len(uncovered_boxes(gray1, gray2, [], "Kapalı")) == 2
+    boxes = uncovered_boxes(gray1, gray2, [(10, 10, 10, 10)], "Kapalı")
+    assert boxes == [(60, 60, 20, 10)]
+    assert uncovered_boxes(gray1, gray2, [(0, 0, 100, 100)], "Kapalı") == []
+
+
+def _grid_items(n, x_off=0.0, y_off=0.0, text="•"):
+    cols = 30
+    return [
+        {"text": text, "rect": (x_off + (i % cols) * 20, y_off + (i // cols) * 20,
+                                x_off + (i % cols) * 20 + 10, y_off + (i // cols) * 20 + 10)}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n", [400, 600])
+def test_crowded_overlap_matching_respects_iou(n):
+    # 400: tüm çiftler denenir; 600: kalabalık grup, uzamsal indeks yolu
+    assert (n * n > MAX_PAIR_CANDIDATES) == (n == 600)
+    # Hiç örtüşmeyen nesneler eşlenmez: hepsi eklendi / silindi kalır
+    pairs, rest1, rest2 = match_overlapping(_grid_items(n), _grid_items(n, y_off=2000))
+    assert pairs == [] and len(rest1) == len(rest2) == n
+    # Hafif kaymış nesneler kendi karşılıklarıyla eşlenir
+    pairs, rest1, rest2 = match_overlapping(_grid_items(n), _grid_items(n, x_off=1))
+    assert len(pairs) == n and not rest1 and not rest2
+    assert all(abs(a["rect"][0] + 1 - b["rect"][0]) < 1e-9 and a["rect"][1] == b["rect"][1] for a, b in pairs)
+
+
+def test_crowded_same_text_pairs_nearest_then_reading_order():
+    items1 = _grid_items(600)
+    items2 = _grid_items(600, x_off=1)
+    items2[0] = dict(items2[0], rect=(5000, 5000, 5010, 5010))  # uzağa taşınmış tek nesne
+    pairs, rest1, rest2 = _match(items1, items2, lambda s: s["text"],
+                                 lambda a, b: abs(a["rect"][0] - b["rect"][0]) + abs(a["rect"][1] - b["rect"][1]))
+    assert len(pairs) == 600 and not rest1 and not rest2
+    by_id = {id(a): b for a, b in pairs}
+    assert by_id[id(items1[0])] is items2[0]
+    assert by_id[id(items1[1])] is items2[1]
@@ -1,8 +1,8 @@
-
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk, ImageChops, ImageDraw, ImageFont
 import fitz  # PyMuPDF
+import io
 import os
 import sys
 
@@ -15,7 +15,32 @@ import difflib
 import math
 import numpy as np
 import tempfile
+import threading
+import time
+import cProfile
+import sqlite3
 import webbrowser
+from collections import OrderedDict
+
+from utils.render_profile import RENDER_PROFILES, DEFAULT_PROFILE
+from utils.page_raster import render_page_array, as_array, to_gray, to_rgb, rotate_image
+from utils.diff_regions import MERGE_PRESETS, DEFAULT_MERGE, merge_with_preset
+from utils.tolerant_diff import (
+    DIFF_TOLERANCES, DEFAULT_TOLERANCE, default_sensitivity, diff_magnitude, extract_boxes, uncovered_boxes,
+)
+from utils.region_classify import REGION_CLASSES, REGION_COLORS, classify_regions, format_class_counts
+from utils.compare_job import CompareJob, CompareCancelled
+from utils.page_source import PageSource
+from utils.batch_queue import BatchQueue, BatchRunner, JOB_STATUS_LABELS, pair_folders
+from utils.folder_watch import (
+    FolderWatcher, enqueue_watched_file, load_watch_config, rematch_unpaired, save_watch_config, watch_batch_id
+)
+from utils.result_store import ResultStore, file_digest, summarize_page_results
+from utils.memory_governor import MemoryGovernor, result_image, unpack_result
+from utils.stage_metrics import PeakRss, format_stage_metrics
+from utils.thumbnail_cache import ThumbnailRenderer
+from utils.vector_diff import add_unexplained_regions, compare_page_content, rect_to_pixels
+from utils.image_digest import IMAGE_STATUS_LABELS, UNCHANGED_STATUSES, compare_images, prune_raster_regions
 
 # Gerekli kütüphaneleri kontrol et
 try:
@@ -60,6 +85,80 @@ except ImportError:
     REPORTLAB_SUPPORT = False
 
 
+# Feature matching modu: "pyramid" (küçültülmüş ORB + FLANN LSH) veya "bruteforce" (tam çözünürlük BFMatcher)
+FEATURE_MATCH_MODE = "pyramid"
+FEATURE_PYRAMID_MAX_SIDE = 1200  # ORB tespiti uzun kenarı bu değerin altındaki piramit seviyesinde yapılır
+FLANN_INDEX_LSH = 6
+
+# Sayfa başına karşılaştırma aşamaları (ilerleme ve iptal noktaları)
+COMPARE_STAGES = ("vector", "images", "render", "diff", "ocr", "ssim", "color", "feature")
+STAGE_LABELS = {
+    "vector": "Vektör",
+    "images": "Gömülü görsel",
+    "render": "Render",
+    "diff": "Piksel farkı",
+    "ocr": "OCR",
+    "ssim": "SSIM",
+    "color": "Renk",
+    "feature": "Feature matching",
+}
+
+# Bellek yöneticisinin son eylemi toplu iş ekranında bu kadar süre gösterilir (sn)
+MEMORY_NOTE_SECONDS = 60
+
+# Sonuç ekranı sekmeleri: (anahtar, başlık, sadece sonuç varsa). Sekme içeriği
+# ilk gösterildiğinde _build_<anahtar>_tab ile kurulur; "visual" tüm sonucu,
+# diğerleri sonucun "<anahtar>_result" alanını alır.
+RESULT_TABS = (
+    ("visual", "  Görsel Farklar  ", False),
+    ("vector", "  Vektör Farklar  ", True),
+    ("image", "  Gömülü Görseller  ", True),
+    ("text", "  Metin Karsilastirma  ", False),
+    ("ssim", "  Yapisal Benzerlik  ", False),
+    ("color", "  Renk Karsilastirma  ", False),
+    ("feature", "  Feature Matching  ", False),
+)
+# Kurulmuş sayfa görünümlerinden (sekmeler) bellekte tutulan en fazla sayı
+PAGE_VIEW_CACHE = 4
+# Hassasiyet kaydırıcısı bırakılmadan bu kadar beklenip uygulanır (ms)
+SENSITIVITY_DELAY_MS = 40
+
+# Vektör karşılaştırma sonuç etiketleri
+VECTOR_KIND_LABELS = {"added": "Eklendi", "removed": "Silindi", "moved": "Taşındı", "modified": "Değişti"}
+VECTOR_TYPE_LABELS = {"text": "Metin", "path": "Çizim"}
+
+
+def compare_settings(profile, merge, vector, orientation=((0, 0.0), (0, 0.0)), tolerance=DEFAULT_TOLERANCE):
+    """
+    Sonuç kaydının anahtarına giren karşılaştırma ayarları.
+    orientation: her taraf için (rotasyon, eğrilik) veya otomatik yön tespiti için "auto".
+    """
+    if orientation != "auto":
+        orientation = [[int(rot), float(skew)] for rot, skew in orientation]
+    return {
+        "profile": profile, "merge": merge, "vector": bool(vector), "orientation": orientation,
+        "tolerance": tolerance,
+    }
+
+
+def build_match_image(feature_result):
+    """Feature matching sonucunun eşleşme görselini ilk ihtiyaçta oluşturur ve saklar."""
+    if not feature_result:
+        return None
+    if feature_result.get("match_image") is None and feature_result.get("_match_data"):
+        img1, kp1, img2, kp2, matches = feature_result.pop("_match_data")
+        match_img = cv2.drawMatches(
+            img1, kp1, img2, kp2, matches,
+            None, flags=cv2.DrawMatchesFlags_NOT_DRAW_SINGLE_POINTS,
+            matchColor=(0, 255, 0),
+        )
+        if match_img.ndim == 3 and img1.ndim == 2:
+            # Gri seviyeden çizildiyse çıktı BGR'dir
+            match_img = cv2.cvtColor(match_img, cv2.COLOR_BGR2RGB)
+        feature_result["match_image"] = Image.fromarray(match_img)
+    return feature_result.get("match_image")
+
+
 class ScrollableImageFrame(tk.Frame):
     """Kaydırma çubukları olan bir resim görüntüleme çerçevesi."""
     def __init__(self, parent, *args, **kwargs):
@@ -125,8 +224,199 @@ class ScrollableImageFrame(tk.Frame):
         self._update_image()
 
 
+class ThumbnailStrip(tk.Frame):
+    """
+    Sayfa küçük resimleri şeridi (yatay: dosya panelleri, dikey: sonuç ekranı).
+    Tüm sayfalar için hemen numaralı yer tutucular çizilir; küçük resimler
+    ThumbnailRenderer ile arka planda, önce görünür sayfalar olmak üzere
+    üretilir ve geldikçe yerleştirilir. Tıklanan sayfa on_select(sayfa_indeksi)
+    ile bildirilir.
+    """
+    POLL_MS = 100
+    PAD = 6
+    LABEL_H = 16
+
+    def __init__(self, parent, on_select, side=96, orient=tk.HORIZONTAL, bg="#252526"):
+        super().__init__(parent, bg=bg)
+        self.on_select = on_select
+        self.side = side
+        self.orient = orient
+        self.total = 0
+        self.selected = None
+        self.renderer = None  # İlk belgede oluşturulur (thread)
+        self._photos = {}     # sayfa -> PhotoImage (referans tutulmalı)
+        self._poll_id = None
+        self.cell = side + 2 * self.PAD + self.LABEL_H  # Kaydırma yönündeki hücre boyu
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.scroll = tk.Scrollbar(self, orient=orient, command=self._scroll_to)
+        if orient == tk.HORIZONTAL:
+            self.canvas.configure(height=self.cell, xscrollcommand=self._on_scrolled)
+            self.scroll.pack(side=tk.BOTTOM, fill=tk.X)
+            self.canvas.pack(side=tk.TOP, fill=tk.X, expand=True)
+        else:
+            self.canvas.configure(width=side + 2 * self.PAD, yscrollcommand=self._on_scrolled)
+            self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+            self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<ButtonPress-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Configure>", lambda e: self._request_visible())
+        self.bind("<Destroy>", self._on_destroy)
+
+    def set_document(self, path, total_pages, rotation=0):
+        """Şeridi belgenin sayfalarıyla (yer tutucular) yeniden kurar; path None ise boşaltır."""
+        self.canvas.delete("all")
+        self._photos = {}
+        self.selected = None
+        self.total = total_pages if path else 0
+        if path and self.renderer is None:
+            self.renderer = ThumbnailRenderer(max_side=self.side)
+        if self.renderer:
+            self.renderer.set_document(path, self.total, rotation)
+
+        for idx in range(self.total):
+            x0, y0, x1, y1 = self._cell_box(idx)
+            self.canvas.create_rectangle(
+                x0 + 2, y0 + 2, x1 - 2, y1 - 2, outline="#3c3c3c", width=2, tags=(f"frame{idx}", "frame")
+            )
+            cx, cy = self._thumb_center(idx)
+            self.canvas.create_text(cx, cy, text=str(idx + 1), fill="#666666", font=("Segoe UI", 10),
+                                    tags=(f"holder{idx}",))
+            self.canvas.create_text(cx, y1 - self.PAD - self.LABEL_H // 2 + 2, text=str(idx + 1), fill="#aaaaaa",
+                                    font=("Segoe UI", 8))
+        length = self.total * self.cell
+        if self.orient == tk.HORIZONTAL:
+            self.canvas.config(scrollregion=(0, 0, length, self.cell))
+            self.canvas.xview_moveto(0)
+        else:
+            self.canvas.config(scrollregion=(0, 0, self.cell, length))
+            self.canvas.yview_moveto(0)
+        self._request_visible()
+        if self.total and self._poll_id is None:
+            self._poll_id = self.after(self.POLL_MS, self._poll)
+
+    def select(self, idx):
+        """Sayfayı vurgular ve görünür değilse şeridi kaydırır."""
+        if self.selected is not None:
+            self.canvas.itemconfig(f"frame{self.selected}", outline="#3c3c3c")
+        self.selected = idx
+        if idx is None or not 0 <= idx < self.total:
+            return
+        self.canvas.itemconfig(f"frame{idx}", outline="#0078d4")
+        first, last = self._visible_range()
+        if not first <= idx < last:
+            self._move_to(max(0, idx - (last - first) // 2) / self.total)
+
+    def set_badge(self, idx, text, color="#ff5555"):
+        """Sayfa köşesine kısa bir etiket yazar (örn. fark sayısı)."""
+        if not 0 <= idx < self.total:
+            return
+        self.canvas.delete(f"badge{idx}")
+        x0, y0, x1, y1 = self._cell_box(idx)
+        item = self.canvas.create_text(x1 - self.PAD, y0 + self.PAD, text=text, anchor=tk.NE, fill="white",
+                                       font=("Segoe UI", 8, "bold"), tags=(f"badge{idx}",))
+        bx0, by0, bx1, by1 = self.canvas.bbox(item)
+        self.canvas.create_rectangle(bx0 - 3, by0 - 1, bx1 + 3, by1 + 1, fill=color, outline="",
+                                     tags=(f"badge{idx}",))
+        self.canvas.tag_raise(item)
+
+    def _cell_box(self, idx):
+        if self.orient == tk.HORIZONTAL:
+            return idx * self.cell, 0, (idx + 1) * self.cell, self.cell
+        return 0, idx * self.cell, self.side + 2 * self.PAD, (idx + 1) * self.cell
+
+    def _thumb_center(self, idx):
+        x0, y0, x1, y1 = self._cell_box(idx)
+        return (x0 + x1) // 2, y0 + self.PAD + self.side // 2
+
+    def _visible_range(self):
+        """Görünen sayfa aralığı [ilk, son)."""
+        lo, hi = self.canvas.xview() if self.orient == tk.HORIZONTAL else self.canvas.yview()
+        first = int(lo * self.total)
+        return first, max(first + 1, min(self.total, math.ceil(hi * self.total)))
+
+    def _request_visible(self):
+        """Görünür sayfaları, sonra onlara yakın olanları öne alır."""
+        if not self.renderer or not self.total:
+            return
+        first, last = self._visible_range()
+        center = (first + last) / 2
+        rest = sorted((i for i in range(self.total) if not first <= i < last), key=lambda i: abs(i - center))
+        self.renderer.prioritize(list(range(first, last)) + rest[:2 * (last - first)])
+
+    def _poll(self):
+        self._poll_id = None
+        if not self.renderer:
+            return
+        for idx, img in self.renderer.ready():
+            if not 0 <= idx < self.total:
+                continue
+            photo = ImageTk.PhotoImage(img)
+            self._photos[idx] = photo
+            self.canvas.delete(f"holder{idx}")
+            cx, cy = self._thumb_center(idx)
+            self.canvas.create_image(cx, cy, image=photo)
+            self.canvas.tag_raise(f"badge{idx}")
+        if len(self._photos) < self.total:
+            self._poll_id = self.after(self.POLL_MS, self._poll)
+
+    def _scroll_to(self, *args):
+        if self.orient == tk.HORIZONTAL:
+            self.canvas.xview(*args)
+        else:
+            self.canvas.yview(*args)
+
+    def _move_to(self, fraction):
+        self._scroll_to("moveto", fraction)
+
+    def _on_scrolled(self, lo, hi):
+        self.scroll.set(lo, hi)
+        self._request_visible()
+
+    def _on_mousewheel(self, event):
+        self._scroll_to("scroll", int(-1 * (event.delta / 120)), "units")
+
+    def _on_click(self, event):
+        if self.orient == tk.HORIZONTAL:
+            idx = int(self.canvas.canvasx(event.x) // self.cell)
+        else:
+            idx = int(self.canvas.canvasy(event.y) // self.cell)
+        if 0 <= idx < self.total:
+            self.select(idx)
+            self.on_select(idx)
+
+    def _on_destroy(self, event):
+        if event.widget is self and self.renderer:
+            self.renderer.close()
+            self.renderer = None
+
+
+class PanelView:
+    """
+    Panelde gösterilen belgeye bağlı önizleme durumu. PageSource ile birlikte
+    paneller arasında taşınır: swap yeniden açma/render yapmadan iki nesneyi
+    yer değiştirir.
+    """
+
+    def __init__(self):
+        self.current_image = None # Görüntülenen sayfa (PIL) - Rotasyon uygulanmış
+        self.current_page_idx = 0
+        self.current_render = None # (sayfa, zoom/ölçek): current_image'in kaynağa göre ölçeği
+        self.selection_coords = None # (x1, y1, x2, y2) on original image
+        self.diffs = [] # (x, y, w, h) list
+
+
+def _view_property(name):
+    """FilePanel özniteliğini panelin PanelView nesnesine yönlendirir."""
+    return property(lambda self: getattr(self.view, name), lambda self, value: setattr(self.view, name, value))
+
+
 class FilePanel(tk.Frame):
     """Dosya seçimi ve önizlemesi yapan panel (Sol/Sağ)."""
+    auto_orient = True # Taranmış dosyalarda yükleme sırasında yön/eğrilik düzeltmesi
+    busy_check = None # Belge bir karşılaştırmada kullanılıyorsa True döndüren çağrı (ana pencere atar)
+    ORIENT_POLL_MS = 100 # Arka plandaki yön tespitinin bitişini kontrol aralığı
     def __init__(self, parent, title="Dosya"):
         super().__init__(parent, bg="#1e1e1e", padx=5, pady=5)
         
@@ -173,77 +463,186 @@ class FilePanel(tk.Frame):
         self.canvas.bind("<B1-Motion>", self._on_mouse_drag)
         self.canvas.bind("<ButtonRelease-1>", self._on_mouse_up)
 
-        self.file_path = None
-        self.current_image = None # Görüntülenen sayfa (PIL) - Rotasyon uygulanmış
-        self.original_image = None # Orijinal ham görsel (sadece resim dosyaları için)
-        self.doc = None           # PDF ise fitz document
-        self.total_pages = 0
-        self.current_page_idx = 0
-        self.rotation = 0 # 0, 90, 180, 270
-        self.diffs = [] # (x, y, w, h) list
+        # Çok sayfalı belgelerde sayfa şeridi (önizlemenin altında)
+        self.thumb_strip = ThumbnailStrip(self, on_select=self.show_page, side=72)
+
+        self.source = PageSource() # Belge durumu ve aşama render'ları (dosya, doc, rotasyon, profil)
+        self.view = PanelView() # Önizleme, seçim ve fark kutuları (belgeyle birlikte taşınır)
+        self._orient_poll = None
         
         # ROI Selection vars
         self.selection_active = False
         self.start_x = None
         self.start_y = None
         self.rect_id = None
-        self.selection_coords = None # (x1, y1, x2, y2) on original image
 
+    # Önizleme durumu PanelView'da tutulur (bkz. exchange_state)
+    current_image = _view_property("current_image")
+    current_page_idx = _view_property("current_page_idx")
+    current_render = _view_property("current_render")
+    selection_coords = _view_property("selection_coords")
+    diffs = _view_property("diffs")
 
+    # Belge durumu PageSource'ta tutulur; panel sadece önizleme ve seçimi yönetir
+    @property
+    def file_path(self):
+        return self.source.file_path
+
+    @property
+    def doc(self):
+        return self.source.doc
+
+    @property
+    def raster(self):
+        return self.source.raster
+
+    @property
+    def total_pages(self):
+        return self.source.total_pages
+
+    @property
+    def render_profile(self):
+        return self.source.render_profile
+
+    @property
+    def rotation(self):
+        return self.source.rotation
+
+    @rotation.setter
+    def rotation(self, value):
+        self.source.rotation = value
+
+    @property
+    def skew(self):
+        return self.source.skew
+
+    @property
+    def _render_lock(self):
+        # Karşılaştırma thread'i ile arayüz aynı doc'u kullanır
+        return self.source.lock
+
+    def exchange_state(self, other):
+        """
+        İki panelin belge ve önizleme durumunu yer değiştirir (dosyalar yeniden
+        açılmaz, render edilmez); rotasyon, seçim ve önbellekler belgeyle gider.
+        """
+        self.source, other.source = other.source, self.source
+        self.view, other.view = other.view, self.view
+        self.redisplay()
+        other.redisplay()
+        # Süren yön tespiti belgeyle birlikte taşındı: bitince doğru panel yenilenir
+        self._watch_orientation()
+        other._watch_orientation()
+
+    def reset(self, profile=DEFAULT_PROFILE):
+        """Belgeyi kapatır (doc ve önbellekler hemen bırakılır) ve paneli boşaltır."""
+        self.source.close()
+        self.source = PageSource(profile=profile)
+        self.view = PanelView()
+        self.redisplay()
+
+    def redisplay(self):
+        """Etiketi ve önizlemeyi mevcut durumdan yeniden çizer (render yapmaz)."""
+        self.rect_id = None
+        self.canvas.delete("all")
+        if self.file_path:
+            self._update_label_with_page_count()
+        else:
+            self.file_label.config(text="Dosya seçilmedi", fg="#666666")
+        self._update_thumb_strip()
+        if self.current_image:
+            self._show_image(self.current_image)
+
+    def _update_thumb_strip(self):
+        """Sayfa şeridini belgeye göre kurar; tek sayfalı belgede gizler."""
+        if self.file_path and self.total_pages > 1:
+            if not self.thumb_strip.winfo_manager():
+                self.thumb_strip.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0), before=self.preview_frame)
+            self.thumb_strip.set_document(self.file_path, self.total_pages, self.rotation)
+            self.thumb_strip.select(self.current_page_idx)
+        else:
+            self.thumb_strip.set_document(None, 0)
+            self.thumb_strip.pack_forget()
+
+    def show_page(self, page_idx):
+        """Önizlemede başka bir sayfaya geçer (seçim sayfaya özel olduğundan temizlenir)."""
+        if not self.file_path or page_idx == self.current_page_idx:
+            return
+        self.selection_coords = None
+        self.diffs = []
+        self.current_page_idx = page_idx
+        self.thumb_strip.select(page_idx)
+        self._refresh_view()
 
-        
     def _update_label_with_page_count(self):
         filename = os.path.basename(self.file_path)
         if len(filename) > 20: filename = filename[:17] + "..."
         
-        if self.total_pages > 1:
-            self.file_label.config(text=f"{filename} ({self.total_pages} Sayfa)", fg="#4fc3f7")
-        else:
-            self.file_label.config(text=filename, fg="#4fc3f7")
+        text = f"{filename} ({self.total_pages} Sayfa)" if self.total_pages > 1 else filename
+        orientation = self.source.orientation
+        if orientation and (orientation["rotation"] or orientation["skew"]):
+            # Otomatik düzeltme uygulandıysa göster
+            text += f" ↻{orientation['rotation']}°"
+            if orientation["skew"]:
+                text += f" ∠{orientation['skew']:+.1f}°"
+        self.file_label.config(text=text, fg="#4fc3f7")
             
+    def _busy(self):
+        """Çalışan iş panelin PageSource'unu okurken belge/rotasyon/profil değiştirilmez."""
+        return bool(self.busy_check and self.busy_check())
+
     def load_file(self, path):
-        self.file_path = path
+        if self._busy():
+            return False
         # Initial label set
         filename = os.path.basename(path)
         if len(filename) > 20: filename = filename[:17] + "..."
         self.file_label.config(text=filename, fg="#4fc3f7")
 
-        ext = path.lower().split('.')[-1]
-        self.rotation = 0 # Yeni dosya yüklendiğinde rotasyonu sıfırla
-        
         try:
-            if ext == "pdf":
-                self.doc = fitz.open(path)
-                self.original_image = None
-                self.total_pages = len(self.doc)
-                self.current_page_idx = 0
+            # Yeni dosya yüklendiğinde rotasyon, önbellekler ve seçim sıfırlanır
+            self.source.open(path)
+            self.view = PanelView()
+            if self.auto_orient and self.source.start_auto_orient():
+                # Taranmış girdide yön/eğrilik arka planda bir kez tahmin edilip tüm
+                # render'lara uygulanır; önizleme önce düzeltilmeden gösterilir
+                self._watch_orientation()
+            if self.doc:
                 self._render_pdf_page(0)
             else:
-                self.doc = None
-                self.total_pages = 1
-                self.current_page_idx = 0
-                # Orijinal resmi sakla
-                img = Image.open(path)
-                self.original_image = img
-                self.current_image = img.copy() # Rotasyon yok
-                self._show_image(self.current_image)
+                self._refresh_view()
             
             self._update_label_with_page_count()
+            self._update_thumb_strip()
                 
         except Exception as e:
             messagebox.showerror("Hata", f"Dosya yüklenemedi:\n{e}")
+        return True
+
+    @property
+    def orienting(self):
+        return self.source.orienting
+
+    def _watch_orientation(self):
+        """Arka plandaki yön tespiti bitince önizlemeyi, etiketi ve sayfa şeridini yeniler."""
+        if self._orient_poll is None and self.source.orienting:
+            self._orient_poll = self.after(self.ORIENT_POLL_MS, self._poll_orientation)
+
+    def _poll_orientation(self):
+        self._orient_poll = None
+        if self.source.orienting:
+            self._orient_poll = self.after(self.ORIENT_POLL_MS, self._poll_orientation)
+        elif self.file_path and self.source.orientation:
+            self._refresh_view()
+            self._update_label_with_page_count()
+            self._update_thumb_strip()
 
     def _render_pdf_page(self, page_idx):
         if not self.doc: return
+        # Önizleme çözünürlüğü sayfa boyutuna ve profile göre seçilir
+        img = self.get_page_image(page_idx, "display")
         page = self.doc.load_page(page_idx)
-        # 3x zoom (önceki adımdaki değişiklik korunuyor)
-        pix = page.get_pixmap(matrix=fitz.Matrix(3, 3)) 
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        
-        # Rotasyon uygula (varsa)
-        if self.rotation != 0:
-            img = img.rotate(-self.rotation, expand=True) # expand=True ile kırpmaz
-            
+        self.current_render = (page_idx, self.render_profile.zoom_for(page.rect.width, page.rect.height, "display"))
         self.current_image = img
         self._show_image(img)
 
@@ -305,6 +704,7 @@ class FilePanel(tk.Frame):
         """Farkları görsel üzerine işaretle ve göster."""
         # Not: pil_img normalize edilmiş görsel olmalı
         self.current_image = pil_img
+        self.current_render = None # Artık kaynağa geri eşlenemez, ROI kırpma ile alınır
         self.diffs = diffs
         self._show_image(pil_img)
 
@@ -390,54 +790,152 @@ class FilePanel(tk.Frame):
         self.start_x = None
         self.start_y = None
         
-    def get_selection_image(self):
-        """Varsa seçili alanı crop edip döndürür, yoksa tüm resmi."""
+    def get_selection_image(self, stage=None):
+        """
+        Varsa seçili alanı döndürür, yoksa tüm resmi.
+        stage verilirse seçim kaynaktan aşama çözünürlüğünde alınır (bkz. get_selection_array).
+        """
         if not self.current_image: return None
         
         if self.selection_coords:
+            if stage:
+                return Image.fromarray(self.get_selection_array(stage))
             return self.current_image.crop(self.selection_coords)
         return self.current_image
 
-    
-    def get_page_image(self, page_idx):
-        """Belirtilen sayfanın PIL görselini döndürür (Rotasyon uygulanmış)."""
-        if not self.file_path: return None
-
-        img = None
-        if self.doc: # PDF
-            if 0 <= page_idx < self.total_pages:
-                page = self.doc.load_page(page_idx)
-                # Yüksek çözünürlüklü render (OCR için önemli)
-                pix = page.get_pixmap(matrix=fitz.Matrix(3, 3)) 
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        else: # Resim dosyası
-            if page_idx == 0 and self.original_image:
-                img = self.original_image.copy()
-
-        if img and self.rotation != 0:
-            img = img.rotate(-self.rotation, expand=True)
-            
-        return img
+    def get_selection_array(self, stage, gray=False):
+        """
+        Seçili alanı numpy dizisi olarak döndürür. Seçim kaynağa (PDF
+        koordinatı / orijinal raster) geri çevrilir ve sadece o bölge
+        aşama çözünürlüğünde render edilir.
+        """
+        if self.current_render:
+            with self._render_lock:
+                if self.doc:
+                    return self._render_selection_clip(stage, gray)
+                if self.raster and self.skew:
+                    return self._crop_selection_stage(stage, gray)
+                if self.raster:
+                    return self._crop_selection_original(gray)
+        arr = as_array(self.current_image.crop(self.selection_coords))
+        return to_gray(arr) if gray else to_rgb(arr)
+
+    def _render_selection_clip(self, stage, gray=False):
+        """Seçimi PDF koordinatına çevirip get_pixmap(clip=...) ile sadece o bölgeyi render eder."""
+        page_idx, disp_zoom = self.current_render
+        page = self.doc.load_page(page_idx)
+
+        # Önizleme matrisi (rotasyon dahil) ve piksel uzayındaki sayfa sınırı
+        disp_mat = fitz.Matrix(disp_zoom, disp_zoom).prerotate(self.rotation + self.skew)
+        bbox = (page.rect * disp_mat).irect
+        x1, y1, x2, y2 = self.selection_coords
+        pix_rect = fitz.Rect(x1 + bbox.x0, y1 + bbox.y0, x2 + bbox.x0, y2 + bbox.y0)
+        clip = (pix_rect * ~disp_mat) & page.rect
+        if clip.is_empty:
+            arr = as_array(self.current_image.crop(self.selection_coords))
+            return to_gray(arr) if gray else to_rgb(arr)
+
+        zoom = self.render_profile.roi_zoom(clip.width, clip.height, stage)
+        return render_page_array(page, zoom, gray=gray, clip=clip, rotation=self.rotation + self.skew)
+
+    def _crop_selection_stage(self, stage, gray=False):
+        """Eğriliği düzeltilmiş rasterde seçimi aşama render'ından kırpar (önizleme ile aynı geometri)."""
+        arr = self.source._get_page_array(self.current_render[0], stage, gray)
+        ratio = arr.shape[1] / self.current_image.size[0]
+        x1, y1, x2, y2 = (int(round(v * ratio)) for v in self.selection_coords)
+        return np.ascontiguousarray(arr[y1:y2, x1:x2])
+
+    def _crop_selection_original(self, gray=False):
+        """Seçimi orijinal (ölçeklenmemiş) raster görsele eşleyip oradan kırpar."""
+        page_idx, scale = self.current_render
+        ow, oh = self.raster.page_size(page_idx)
+        # Önizleme ölçeğindeki döndürülmemiş boyut
+        w, h = ow * scale, oh * scale
+        x1, y1, x2, y2 = self.selection_coords
+
+        # Saat yönünde döndürülmüş görüntüdeki noktayı döndürülmemiş koordinata çevir
+        def unrotate(u, v):
+            if self.rotation == 90:
+                return v, h - u
+            if self.rotation == 180:
+                return w - u, h - v
+            if self.rotation == 270:
+                return w - v, u
+            return u, v
+
+        ax, ay = unrotate(x1, y1)
+        bx, by = unrotate(x2, y2)
+        box = (
+            max(0, int(min(ax, bx) / scale)), max(0, int(min(ay, by) / scale)),
+            min(ow, int(math.ceil(max(ax, bx) / scale))), min(oh, int(math.ceil(max(ay, by) / scale)))
+        )
+        img = self.raster.crop(page_idx, box, "L" if gray else "RGB")
+        return np.asarray(rotate_image(img, self.rotation))
+
+    def get_page_image(self, page_idx, stage="diff"):
+        """Belirtilen sayfanın PIL görselini döndürür (Rotasyon uygulanmış, önizleme için)."""
+        arr = self.get_page_array(page_idx, stage)
+        if arr is None:
+            return None
+        return Image.fromarray(arr)
+
+    def get_page_array(self, page_idx, stage="diff", gray=False):
+        """Sayfayı aşama çözünürlüğünde numpy dizisi olarak döndürür (bkz. PageSource.get_page_array)."""
+        return self.source.get_page_array(page_idx, stage, gray)
+
+    def get_compare_array(self, page_idx, stage="diff", gray=False):
+        """Karşılaştırma dizisi: seçim (ROI) varsa o bölge, yoksa aşama çözünürlüğünde sayfa."""
+        if not self.current_image: return None
+        if self.selection_coords:
+            return self.get_selection_array(stage, gray)
+        return self.get_page_array(page_idx, stage, gray)
+
+    def get_vector_content(self, page_idx):
+        return self.source.get_vector_content(page_idx)
+
+    def get_image_entries(self, page_idx):
+        return self.source.get_image_entries(page_idx)
+
+    def decoded_image_digest(self, xref):
+        return self.source.decoded_image_digest(xref)
+
+    def page_to_pixel_matrix(self, page_idx, stage="diff"):
+        return self.source.page_to_pixel_matrix(page_idx, stage)
+
+    def set_render_profile(self, name):
+        """Render profilini değiştirir ve önizlemeyi yeniler."""
+        if self._busy():
+            return False
+        self.source.set_render_profile(name)
+        if self.file_path:
+            self.selection_coords = None
+            self._refresh_view()
+        return True
 
     def rotate_left(self):
         """Saat yönünün tersine 90 derece döndür."""
-        if not self.file_path: return
+        if not self.file_path or self._busy(): return
         self.rotation = (self.rotation - 90) % 360
         self._refresh_view()
+        self._update_thumb_strip()
 
     def rotate_right(self):
         """Saat yönünde 90 derece döndür."""
-        if not self.file_path: return
+        if not self.file_path or self._busy(): return
         self.rotation = (self.rotation + 90) % 360
         self._refresh_view()
+        self._update_thumb_strip()
 
     def _refresh_view(self):
         """Mevcut görünümü rotasyona göre güncelle."""
         if self.doc:
             self._render_pdf_page(self.current_page_idx)
-        elif self.original_image:
-            # Orijinalden tekrar oluştur
-            self.current_image = self.original_image.rotate(-self.rotation, expand=True)
+        elif self.raster:
+            # Önizleme kaynaktan azaltılmış çözümlemeyle tekrar oluşturulur
+            page_idx = self.current_page_idx
+            w, h = self.raster.page_size(page_idx)
+            self.current_render = (page_idx, self.render_profile.scale_for_pixels(w, h, "display"))
+            self.current_image = self.get_page_image(page_idx, "display")
             self._show_image(self.current_image)
 
     def get_total_pages(self):
@@ -445,15 +943,44 @@ class FilePanel(tk.Frame):
 
 
 class DiffResultWindow(tk.Frame):
-    """Karşılaştırma sonuçlarını ve detaylarını gösteren pencere (Ana ekrana gömülü)."""
-    def __init__(self, parent, page_results, on_back=None):
+    """
+    Karşılaştırma sonuçlarını ve detaylarını gösteren pencere (Ana ekrana gömülü).
+    total_pages verilirse pencere sonuçlar gelmeden açılır; sayfalar
+    add_page_result ile geldikçe doldurulur. Bekleyen bir sayfa seçilirse
+    on_page_request(sayfa_indeksi) ile öne alınması istenir. thumb_source
+    (yol, sayfa sayısı, rotasyon) verilirse kenar çubuğunda sayfa küçük resimleri gösterilir.
+    analyzer (CompareAnalyzer) ve sensitivity (varsayılan eşik, çekirdek, en
+    küçük alan) verilirse hassasiyet kaydırıcıları gösterilir; değişiklik
+    sayfaların saklanan fark haritalarına canlı uygulanır.
+    """
+    def __init__(self, parent, page_results, on_back=None, total_pages=None,
+                 on_page_request=None, on_cancel=None, thumb_source=None, analyzer=None, sensitivity=None):
         super().__init__(parent)
         self.on_back = on_back
+        self.on_page_request = on_page_request
+        self.on_cancel = on_cancel
         self.bg_color = "#1e1e1e"
         self.configure(bg=self.bg_color)
         
-        self.page_results = page_results
-        self.current_page_idx = 0
+        self.page_results = [] # Sayfa sırasına göre hazır sonuçlar
+        self.results_by_page = {}
+        # Karşılaştırmanın ürettiği sonuçlar; hassasiyet değişince results_by_page kopyaları tutar
+        self._base_results = {}
+        self.analyzer = analyzer
+        self.default_sensitivity = tuple(sensitivity) if sensitivity else None
+        self.sensitivity = self.default_sensitivity
+        self._sensitivity_after = None
+        self._sensitivity_queue = [] # Yeni hassasiyetin henüz uygulanmadığı sayfalar
+        self.current_page_idx = None
+        # Sayfa numarası -> {"tabs": {anahtar: Frame}, "built": set()}; en son kullanılan sonda (LRU)
+        self._page_views = OrderedDict()
+        self._current_view = None
+        self._selected_tab = "visual" # Sayfa değişince aynı sekme açık kalır
+        # Liste satırı -> sayfa numarası
+        if total_pages:
+            self.page_nums = list(range(1, total_pages + 1))
+        else:
+            self.page_nums = [res["page_num"] for res in page_results]
 
         # --- Sidebar (Sayfa Listesi) ---
         sidebar = tk.Frame(self, bg="#252526", width=200)
@@ -472,19 +999,43 @@ class DiffResultWindow(tk.Frame):
             bg="#252526", fg="#cccccc", pady=10
         ).pack(fill=tk.X)
 
+        # Devam eden karşılaştırmanın durumu
+        self.progress_label = tk.Label(
+            sidebar, text="", font=("Segoe UI", 9), bg="#252526", fg="#888888",
+            wraplength=180, justify=tk.LEFT
+        )
+        self.progress_label.pack(fill=tk.X, padx=10)
+        self.cancel_btn = None
+        if on_cancel:
+            self.cancel_btn = tk.Button(
+                sidebar, text="✖ İptal", font=("Segoe UI", 9),
+                bg="#555555", fg="white", relief=tk.FLAT, cursor="hand2",
+                command=on_cancel
+            )
+            self.cancel_btn.pack(fill=tk.X, padx=10, pady=(4, 0))
+
         self.page_listbox = tk.Listbox(
             sidebar, bg="#1e1e1e", fg="#dddddd", font=("Segoe UI", 11),
             selectbackground="#0078d4", selectforeground="white",
             relief=tk.FLAT, bd=0, highlightthickness=0
         )
-        self.page_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.page_listbox.bind("<<ListboxSelect>>", self._on_page_select)
+        self.thumb_strip = None
+        if thumb_source and len(self.page_nums) > 1:
+            # Liste kısalır, altında sayfa şeridi; şeritteki işaret fark sayısını gösterir
+            self.page_listbox.config(height=8)
+            self.page_listbox.pack(fill=tk.X, padx=5, pady=5)
+            self.thumb_strip = ThumbnailStrip(
+                sidebar, on_select=self._on_thumb_select, side=140, orient=tk.VERTICAL
+            )
+            self.thumb_strip.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+            self.thumb_strip.set_document(*thumb_source)
+        else:
+            self.page_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        # Sayfaları listeye ekle
-        for res in page_results:
-            p_num = res["page_num"]
-            diff_count = len(res["differences"])
-            self.page_listbox.insert(tk.END, f"Sayfa {p_num} ({diff_count} fark)")
+        # Sayfaları listeye ekle (sonucu gelmeyenler bekliyor olarak)
+        for p_num in self.page_nums:
+            self.page_listbox.insert(tk.END, f"Sayfa {p_num} (bekleniyor)")
         
         # --- Ana İçerik ---
         self.main_area = tk.Frame(self, bg=self.bg_color)
@@ -495,10 +1046,14 @@ class DiffResultWindow(tk.Frame):
         self.summary_frame.pack(fill=tk.X)
         
         # (Özet etiketleri burada dinamik oluşturulacak)
+
+        if analyzer and self.sensitivity:
+            self._build_sensitivity_bar()
         
         # Notebook (Sekmeler)
         self.notebook = ttk.Notebook(self.main_area)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
         # Stil
         style = ttk.Style()
@@ -507,9 +1062,9 @@ class DiffResultWindow(tk.Frame):
         style.configure("TNotebook.Tab", background="#333333", foreground="#eeeeee", padding=[15, 5], font=("Segoe UI", 10))
         style.map("TNotebook.Tab", background=[("selected", "#0078d4")], foreground=[("selected", "#ffffff")])
 
-        # İlk sayfayı seç
-        self.page_listbox.select_set(0)
-        self._load_page_result(0)
+        # Hazır sonuçları ekle; ilk gelen sayfa otomatik açılır
+        for res in page_results:
+            self.add_page_result(res)
 
         # Alt Panel (Export)
         btn_frame = tk.Frame(self.main_area, bg=self.bg_color, pady=10)
@@ -526,31 +1081,249 @@ class DiffResultWindow(tk.Frame):
         if self.on_back:
             self.on_back()
 
+    def add_page_result(self, result):
+        """Yeni gelen sayfa sonucunu listeye işler; beklenen sayfaysa hemen gösterir."""
+        p_num = result["page_num"]
+        if p_num in self.results_by_page:
+            self._drop_page_view(p_num)
+        self._base_results[p_num] = result
+        if self.analyzer and self.sensitivity != self.default_sensitivity:
+            # Kaydırıcı değiştirildikten sonra gelen sayfa
+            result = self.analyzer.apply_sensitivity(result, self.sensitivity)
+        self._set_page_result(p_num, result)
+
+        idx = self.page_nums.index(p_num)
+
+        # Henüz sayfa açılmadıysa ilk sonucu, seçili sayfa bekliyorsa onu göster
+        if self.current_page_idx is None or self.current_page_idx == idx:
+            self.page_listbox.selection_clear(0, tk.END)
+            self.page_listbox.select_set(idx)
+            self._load_page_result(idx)
+
+    def _set_page_result(self, p_num, result):
+        """Gösterilen sonucu günceller; listedeki ve şeritteki fark sayısını yazar."""
+        self.results_by_page[p_num] = result
+        self.page_results = [self.results_by_page[n] for n in sorted(self.results_by_page)]
+        if p_num not in self.page_nums:
+            self.page_nums.append(p_num)
+            self.page_listbox.insert(tk.END, "")
+        diff_count = len(result["differences"])
+        self._set_list_item(self.page_nums.index(p_num), f"Sayfa {p_num} ({diff_count} fark)")
+        if self.thumb_strip:
+            self.thumb_strip.set_badge(p_num - 1, str(diff_count), "#d9534f" if diff_count else "#28a745")
+
+    def _build_sensitivity_bar(self):
+        """Eşik / çekirdek / en küçük alan kaydırıcıları (özetin altında)."""
+        bar = tk.Frame(self.main_area, bg="#252526", padx=15, pady=4)
+        bar.pack(fill=tk.X)
+        tk.Label(bar, text="Hassasiyet:", font=("Segoe UI", 9, "bold"), bg="#252526", fg="#cccccc").pack(side=tk.LEFT)
+
+        self.sensitivity_vars = []
+        threshold, kernel, min_area = self.sensitivity
+        for label, from_, to, step, value in (
+            ("Eşik", 1, 128, 1, threshold), ("Çekirdek (px)", 1, 9, 2, kernel), ("En küçük alan (px²)", 0, 200, 1, min_area),
+        ):
+            tk.Label(bar, text=label, font=("Segoe UI", 9), bg="#252526", fg="#aaaaaa").pack(side=tk.LEFT, padx=(12, 2))
+            var = tk.IntVar(value=value)
+            tk.Scale(
+                bar, variable=var, from_=from_, to=to, resolution=step, orient=tk.HORIZONTAL, length=120,
+                bg="#333333", fg="white", highlightthickness=0, bd=0, troughcolor="#2b2b2b",
+                activebackground="#0078d4", font=("Segoe UI", 8),
+                command=lambda v: self._schedule_sensitivity()
+            ).pack(side=tk.LEFT)
+            self.sensitivity_vars.append(var)
+
+        tk.Button(
+            bar, text="Varsayılan", font=("Segoe UI", 9), bg="#444444", fg="white", relief=tk.FLAT,
+            cursor="hand2", command=self._reset_sensitivity
+        ).pack(side=tk.LEFT, padx=12)
+        self.sensitivity_label = tk.Label(bar, text="", font=("Segoe UI", 9), bg="#252526", fg="#888888")
+        self.sensitivity_label.pack(side=tk.LEFT)
+
+    def _reset_sensitivity(self):
+        for var, value in zip(self.sensitivity_vars, self.default_sensitivity):
+            var.set(value)
+        self._schedule_sensitivity()
+
+    def _schedule_sensitivity(self):
+        """Kaydırıcı hareketlerini kısa süre biriktirip tek seferde uygular."""
+        if self._sensitivity_after is not None:
+            self.after_cancel(self._sensitivity_after)
+        self._sensitivity_after = self.after(SENSITIVITY_DELAY_MS, self._apply_sensitivity)
+
+    def _apply_sensitivity(self):
+        """Yeni hassasiyeti önce açık sayfaya, sonra boşta kalan sürede diğer sayfalara uygular."""
+        self._sensitivity_after = None
+        sensitivity = tuple(var.get() for var in self.sensitivity_vars)
+        if sensitivity == self.sensitivity:
+            return
+        self.sensitivity = sensitivity
+        current = self.page_nums[self.current_page_idx] if self.current_page_idx is not None else None
+        pending = not self._sensitivity_queue
+        self._sensitivity_queue = [p for p in sorted(self._base_results) if p != current]
+
+        start = time.perf_counter()
+        if current in self._base_results:
+            self._update_page_sensitivity(current)
+        self.sensitivity_label.config(text=f"Güncelleme: {(time.perf_counter() - start) * 1000:.0f} ms")
+        if pending and self._sensitivity_queue:
+            self.after(1, self._drain_sensitivity_queue)
+
+    def _drain_sensitivity_queue(self):
+        """Bekleyen sayfalardan birini günceller; arayüz olayları araya girebilsin diye tek tek."""
+        if not self._sensitivity_queue or not self.winfo_exists():
+            return
+        self._update_page_sensitivity(self._sensitivity_queue.pop(0))
+        if self._sensitivity_queue:
+            self.after(1, self._drain_sensitivity_queue)
+
+    def _flush_sensitivity(self):
+        """Bekleyen tüm sayfalara hassasiyeti hemen uygular (rapor öncesi)."""
+        while self._sensitivity_queue:
+            self._update_page_sensitivity(self._sensitivity_queue.pop(0))
+
+    def _update_page_sensitivity(self, p_num):
+        """Sayfanın farklarını güncel hassasiyetle yeniden çıkarır ve görünümünü yeniler."""
+        result = self.analyzer.apply_sensitivity(self._base_results[p_num], self.sensitivity)
+        if result is self.results_by_page.get(p_num):
+            return
+        self._set_page_result(p_num, result)
+        view = self._page_views.get(p_num)
+        if view is None:
+            return
+        # Sadece görsel sekme farklara bağlı; diğer sekmeler olduğu gibi kalır
+        visual = view["tabs"]["visual"]
+        for widget in visual.winfo_children():
+            widget.destroy()
+        view["built"].discard("visual")
+        if view is self._current_view:
+            for widget in self.summary_frame.winfo_children():
+                widget.destroy()
+            self._build_page_summary(self.summary_frame, result)
+            self._on_tab_changed()
+
+    def mark_page_missing(self, page_idx):
+        """Sonuç üretilemeyen sayfayı (0 tabanlı) listede işaretler."""
+        p_num = page_idx + 1
+        if p_num in self.page_nums and p_num not in self.results_by_page:
+            self._set_list_item(self.page_nums.index(p_num), f"Sayfa {p_num} (yok)")
+
+    def set_progress(self, text, running=True):
+        """Kenar çubuğundaki durum yazısını günceller; iş bitince iptal butonunu kapatır."""
+        self.progress_label.config(text=text)
+        if self.cancel_btn and not running:
+            self.cancel_btn.pack_forget()
+
+    def _set_list_item(self, idx, text):
+        selected = idx in self.page_listbox.curselection()
+        self.page_listbox.delete(idx)
+        self.page_listbox.insert(idx, text)
+        if selected:
+            self.page_listbox.select_set(idx)
+
     def _on_page_select(self, event):
         selection = self.page_listbox.curselection()
         if selection:
             idx = selection[0]
             self._load_page_result(idx)
 
+    def _on_thumb_select(self, page_idx):
+        """Şeritte tıklanan sayfayı (0 tabanlı) listede seçip gösterir."""
+        if page_idx + 1 not in self.page_nums:
+            return
+        idx = self.page_nums.index(page_idx + 1)
+        self.page_listbox.selection_clear(0, tk.END)
+        self.page_listbox.select_set(idx)
+        self.page_listbox.see(idx)
+        self._load_page_result(idx)
+
     def _load_page_result(self, idx):
         self.current_page_idx = idx
-        result = self.page_results[idx]
+        result = self.results_by_page.get(self.page_nums[idx])
+        if self.thumb_strip:
+            self.thumb_strip.select(self.page_nums[idx] - 1)
         
         # 1. Özeti güncelle
         for widget in self.summary_frame.winfo_children():
             widget.destroy()
+
+        if result is None:
+            # Sonuç henüz yok: sekmeleri boşalt ve sayfanın öne alınmasını iste
+            self._show_page_view(None)
+            tk.Label(
+                self.summary_frame, text=f"Sayfa {self.page_nums[idx]} hesaplanıyor...",
+                font=("Segoe UI", 16, "bold"), bg="#252526", fg="#888888"
+            ).pack(anchor=tk.W)
+            if self.on_page_request:
+                self.on_page_request(self.page_nums[idx] - 1)
+            return
+
         self._build_page_summary(self.summary_frame, result)
 
-        # 2. Sekmeleri temizle ve yeniden oluştur
+        # 2. Sayfanın sekmeleri: daha önce kurulduysa önbellekten, yoksa boş
+        # sekmeler eklenir ve sadece açık olan sekmenin içeriği kurulur
+        p_num = self.page_nums[idx]
+        view = self._page_views.get(p_num)
+        if view is None:
+            tabs = {}
+            for key, title, optional in RESULT_TABS:
+                if optional and not result.get(f"{key}_result"):
+                    continue
+                tabs[key] = tk.Frame(self.notebook, bg="#2b2b2b")
+            view = self._page_views[p_num] = {"page_num": p_num, "tabs": tabs, "built": set()}
+            while len(self._page_views) > PAGE_VIEW_CACHE:
+                self._drop_page_view(next(iter(self._page_views)))
+        self._page_views.move_to_end(p_num)
+        self._show_page_view(view)
+
+    def _show_page_view(self, view):
+        """Notebook'ta verilen sayfa görünümünün sekmelerini gösterir (None: boş)."""
+        selected = self._selected_tab
+        self._current_view = None # Sekmeler değişirken gelen olaylar yok sayılır
         for tab in self.notebook.tabs():
             self.notebook.forget(tab)
-        
-        self._build_visual_tab(self.notebook, result)
-        self._build_text_tab(self.notebook, result["text_result"])
-        self._build_ssim_tab(self.notebook, result["ssim_result"])
-        self._build_color_tab(self.notebook, result["color_result"])
-        self._build_feature_tab(self.notebook, result["feature_result"])
-        self._build_feature_tab(self.notebook, result["feature_result"])
+        if view is None:
+            return
+        titles = {key: title for key, title, _ in RESULT_TABS}
+        for key, tab in view["tabs"].items():
+            self.notebook.add(tab, text=titles[key])
+        self._current_view = view
+        self._selected_tab = selected if selected in view["tabs"] else next(iter(view["tabs"]))
+        self.notebook.select(view["tabs"][self._selected_tab])
+        self._on_tab_changed()
+
+    def _on_tab_changed(self, event=None):
+        """Açılan sekmenin içeriğini ilk gösterimde kurar."""
+        view = self._current_view
+        if view is None or not self.notebook.tabs():
+            return
+        selected = self.notebook.select()
+        for key, tab in view["tabs"].items():
+            if str(tab) == selected:
+                break
+        else:
+            return
+        self._selected_tab = key
+        if key in view["built"]:
+            return
+        view["built"].add(key)
+        result = self.results_by_page[view["page_num"]]
+        # Bellek sınırı nedeniyle sıkıştırılmış görseller gösterim için açılır
+        # (hassasiyet kopyası iç içe alanları karşılaştırmanın sonucuyla paylaşır)
+        unpack_result(self._base_results.get(view["page_num"], result))
+        unpack_result(result)
+        builder = getattr(self, f"_build_{key}_tab")
+        builder(tab, result if key == "visual" else result[f"{key}_result"])
+
+    def _drop_page_view(self, p_num):
+        """Sayfanın kurulmuş sekmelerini yok eder (LRU'dan düşen veya yenilenen sayfa)."""
+        view = self._page_views.pop(p_num, None)
+        if view is None:
+            return
+        if view is self._current_view:
+            self._show_page_view(None)
+        for tab in view["tabs"].values():
+            tab.destroy()
 
     def _build_page_summary(self, parent, result):
         diff_count = len(result["differences"])
@@ -570,6 +1343,9 @@ class DiffResultWindow(tk.Frame):
             tk.Label(f, text=str(value), font=("Segoe UI", 11, "bold"), bg="#333333", fg=color).pack(anchor=tk.W)
 
         add_stat("Görsel Fark", f"{diff_count} Bölge", "#ff6b6b" if diff_count > 0 else "#4caf50")
+        class_text = format_class_counts(result.get("diff_classes"))
+        if class_text:
+            add_stat("Fark Türleri", class_text)
         
         ssim_score = result["ssim_result"].get("score", 0) if result["ssim_result"] else 0
         add_stat("SSIM (Yapısal)", f"%{ssim_score*100:.1f}", "#4caf50" if ssim_score > 0.9 else "#ff9800")
@@ -577,10 +1353,35 @@ class DiffResultWindow(tk.Frame):
         ocr_ratio = result["text_result"].get("ratio")
         add_stat("Metin Benzerliği", f"%{ocr_ratio*100:.1f}", "#4caf50" if ocr_ratio and ocr_ratio > 0.9 else "#ff9800")
 
-    def _build_visual_tab(self, notebook, result):
+        vector_result = result.get("vector_result")
+        if vector_result:
+            n_changes = len(vector_result["changes"])
+            if vector_result["conclusive"]:
+                add_stat("Vektör Fark", f"{n_changes} Nesne", "#ff6b6b" if n_changes else "#4caf50")
+            elif vector_result["raster_regions"]:
+                add_stat("Vektör Fark", f"{n_changes} Nesne + Görsel", "#ff9800")
+            else:
+                add_stat("Vektör Fark", "Piksel ile", "#aaaaaa")
+
+        image_result = result.get("image_result")
+        if image_result:
+            images = image_result["images"]
+            flagged = sum(1 for img in images if img["status"] != "identical")
+            add_stat("Gömülü Görsel", f"{flagged} / {len(images)} farklı", "#ff9800" if flagged else "#4caf50")
+
+        # Aşama süreleri (wall / CPU / yaklaşık RSS artışı)
+        timings = result.get("timings")
+        if timings:
+            total = sum(m["wall"] for m in timings.values())
+            add_stat("Toplam Süre", f"{total:.2f} sn")
+            tk.Label(
+                parent, text=format_stage_metrics(timings, STAGE_LABELS),
+                font=("Segoe UI", 9), bg="#252526", fg="#888888",
+                wraplength=900, justify=tk.LEFT
+            ).pack(anchor=tk.W)
+
+    def _build_visual_tab(self, tab, result):
         """Görsel farkları gösteren sekme (Yan yana Master/Print)."""
-        tab = tk.Frame(notebook, bg="#2b2b2b")
-        notebook.add(tab, text="  Görsel Farklar  ")
         
         # Split view container
         paned = tk.Frame(tab, bg="#2b2b2b")
@@ -609,31 +1410,40 @@ class DiffResultWindow(tk.Frame):
         img1_n = result.get("img1_norm")
         img2_n = result.get("img2_norm")
         diffs = result.get("differences", [])
-        
+        classes = result.get("diff_classes") or ["graphic"] * len(diffs)
+
         if img1_n and img2_n:
-            # Draw boxes on copies
-            disp1 = img1_n.copy()
-            disp2 = img2_n.copy()
-            draw1 = ImageDraw.Draw(disp1)
-            draw2 = ImageDraw.Draw(disp2)
-            
-            # Use red rectangle
-            for idx, (x, y, w, h) in enumerate(diffs):
-                # Box
-                draw1.rectangle([x, y, x+w, y+h], outline="red", width=3)
-                draw2.rectangle([x, y, x+w, y+h], outline="red", width=3)
-                
-                # Number badge (top-left)
-                # Helper for text background
-                t_bbox = draw1.textbbox((x, y), str(idx+1)) # needs font? default is ok
-                # Draw small background for number
-                draw1.rectangle([x, y-12, x+15, y], fill="red")
-                draw2.rectangle([x, y-12, x+15, y], fill="red")
-                draw1.text((x+2, y-12), str(idx+1), fill="white")
-                draw2.text((x+2, y-12), str(idx+1), fill="white")
-
-            viewer1.show_image(disp1)
-            viewer2.show_image(disp2)
+            # Tür filtresi: işaretli türlerin kutuları çizilir (numaralar değişmez)
+            class_vars = {key: tk.BooleanVar(value=True) for key in REGION_CLASSES if key in classes}
+
+            def redraw():
+                disp1 = img1_n.copy()
+                disp2 = img2_n.copy()
+                draw1 = ImageDraw.Draw(disp1)
+                draw2 = ImageDraw.Draw(disp2)
+                for idx, ((x, y, w, h), cls) in enumerate(zip(diffs, classes)):
+                    if not class_vars[cls].get():
+                        continue
+                    color = REGION_COLORS[cls]
+                    for draw in (draw1, draw2):
+                        # Kutu ve sol üstte numara rozeti
+                        draw.rectangle([x, y, x+w, y+h], outline=color, width=3)
+                        draw.rectangle([x, y-12, x+15, y], fill=color)
+                        draw.text((x+2, y-12), str(idx+1), fill="white")
+                viewer1.show_image(disp1)
+                viewer2.show_image(disp2)
+
+            if result.get("diff_classes"):
+                filter_bar = tk.Frame(tab, bg="#2b2b2b")
+                filter_bar.pack(side=tk.TOP, fill=tk.X, padx=10, before=paned)
+                tk.Label(filter_bar, text="Göster:", bg="#2b2b2b", fg="#aaaaaa", font=("Segoe UI", 9)).pack(side=tk.LEFT)
+                for key, var in class_vars.items():
+                    tk.Checkbutton(
+                        filter_bar, text=f"{REGION_CLASSES[key]} ({classes.count(key)})", variable=var,
+                        command=redraw, bg="#2b2b2b", fg=REGION_COLORS[key], selectcolor="#333333",
+                        activebackground="#2b2b2b", activeforeground=REGION_COLORS[key], font=("Segoe UI", 9, "bold")
+                    ).pack(side=tk.LEFT, padx=5)
+            redraw()
         elif result.get("diff_image"):
             # Fallback to old diff image if norm images missing logic
             viewer1.show_image(result["diff_image"])
@@ -669,15 +1479,96 @@ class DiffResultWindow(tk.Frame):
         scale2.set(1.0)
         scale2.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
 
-    def _build_text_tab(self, notebook, text_result):
+    def _build_vector_tab(self, tab, vector_result):
+        """Vektör (metin span'ı / çizim) farklarını listeleyen sekme."""
+
+        changes = vector_result["changes"]
+        if vector_result["conclusive"]:
+            info = f"{len(changes)} nesne farkı (sayfa vektörel karşılaştırıldı; kaba raster kontrolü ek fark bulmadı)"
+        elif vector_result["raster_regions"]:
+            info = f"{len(changes)} nesne farkı; {vector_result['reason']}"
+        else:
+            info = f"Vektör karşılaştırma yapılamadı ({vector_result['reason']}), piksel farkı kullanıldı."
+        tk.Label(
+            tab, text=info, font=("Segoe UI", 12, "bold"), bg="#2b2b2b",
+            fg="#ff6b6b" if changes else "#4caf50", wraplength=900, justify=tk.LEFT
+        ).pack(anchor=tk.W, padx=10, pady=10)
+
+        if not changes:
+            return
+
+        table_frame = tk.Frame(tab, bg="#2b2b2b")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        tree = ttk.Treeview(table_frame, columns=("no", "kind", "type", "detail", "box"), show="headings")
+        for col, title, width in (
+            ("no", "#", 40), ("kind", "Değişiklik", 90), ("type", "Nesne", 70),
+            ("detail", "Ayrıntı", 520), ("box", "Konum (px)", 160),
+        ):
+            tree.heading(col, text=title)
+            tree.column(col, width=width, anchor=tk.W, stretch=(col == "detail"))
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        for idx, change in enumerate(changes, 1):
+            box = change.get("box")
+            tree.insert("", tk.END, values=(
+                idx,
+                VECTOR_KIND_LABELS.get(change["kind"], change["kind"]),
+                VECTOR_TYPE_LABELS.get(change["type"], change["type"]),
+                change["detail"],
+                f"{box[0]}, {box[1]} ({box[2]}x{box[3]})" if box else "-",
+            ))
+
+    def _build_image_tab(self, tab, image_result):
+        """Gömülü görsellerin (xref özeti) karşılaştırma sekmesi."""
+
+        images = image_result["images"]
+        flagged = [img for img in images if img["status"] != "identical"]
+        tk.Label(
+            tab, text=f"{len(images)} görsel, {len(images) - len(flagged)} tanesi birebir aynı",
+            font=("Segoe UI", 12, "bold"), bg="#2b2b2b",
+            fg="#ff9800" if flagged else "#4caf50"
+        ).pack(anchor=tk.W, padx=10, pady=10)
+
+        if not flagged:
+            return
+
+        table_frame = tk.Frame(tab, bg="#2b2b2b")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        tree = ttk.Treeview(table_frame, columns=("no", "status", "box", "note"), show="headings")
+        for col, title, width in (
+            ("no", "#", 40), ("status", "Durum", 180), ("box", "Konum (px)", 180), ("note", "Not", 400),
+        ):
+            tree.heading(col, text=title)
+            tree.column(col, width=width, anchor=tk.W, stretch=(col == "note"))
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        for idx, img in enumerate(flagged, 1):
+            box = img.get("box")
+            note = ""
+            if img["status"] == "reencoded":
+                note = "Pikseller aynı, dosyadaki kodlama/sıkıştırma farklı"
+            elif img["exposed"]:
+                note = "Üstünde veya altında başka içerik var"
+            tree.insert("", tk.END, values=(
+                idx,
+                IMAGE_STATUS_LABELS.get(img["status"], img["status"]),
+                f"{box[0]}, {box[1]} ({box[2]}x{box[3]})" if box else "-",
+                note,
+            ))
+
+    def _build_text_tab(self, tab, text_result):
         """Metin karşılaştırma sekmesi."""
         try:
             with open("debug_log.txt", "a") as f:
                 f.write("Building text tab...\n")
         except: pass
 
-        tab = tk.Frame(notebook, bg="#2b2b2b")
-        notebook.add(tab, text="  Metin Karsilastirma  ")
         
         ratio = text_result.get("ratio")
         diff_text = text_result.get("diff_text")
@@ -818,10 +1709,8 @@ class DiffResultWindow(tk.Frame):
 
             diff_widget.config(state=tk.DISABLED)
 
-    def _build_ssim_tab(self, notebook, ssim_result):
+    def _build_ssim_tab(self, tab, ssim_result):
         """Yapısal Benzerlik (SSIM) sekmesi."""
-        tab = tk.Frame(notebook, bg="#2b2b2b")
-        notebook.add(tab, text="  Yapisal Benzerlik  ")
 
         score = ssim_result.get("score")
         diff_image = ssim_result.get("diff_image")
@@ -871,10 +1760,8 @@ class DiffResultWindow(tk.Frame):
             viewer.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
             viewer.show_image(diff_image)
 
-    def _build_color_tab(self, notebook, color_result):
+    def _build_color_tab(self, tab, color_result):
         """Renk karşılaştırma sekmesi."""
-        tab = tk.Frame(notebook, bg="#2b2b2b")
-        notebook.add(tab, text="  Renk Karsilastirma  ")
 
         overall = color_result.get("overall")
         channels = color_result.get("channels", {})
@@ -916,10 +1803,8 @@ class DiffResultWindow(tk.Frame):
                 font=("Segoe UI", 14, "bold"), bg="#333333", fg=c_name
             ).pack()
 
-    def _build_feature_tab(self, notebook, feature_result):
+    def _build_feature_tab(self, tab, feature_result):
         """Feature Matching (ORB) sekmesi."""
-        tab = tk.Frame(notebook, bg="#2b2b2b")
-        notebook.add(tab, text="  Feature Matching  ")
         
         if not feature_result:
             tk.Label(tab, text="Feature matching yapilamadi.", bg="#2b2b2b", fg="white").pack()
@@ -944,10 +1829,11 @@ class DiffResultWindow(tk.Frame):
             font=("Segoe UI", 10), bg="#2b2b2b", fg="#aaaaaa"
         ).pack(side=tk.LEFT, padx=10)
 
-        if match_image:
+        if match_image or feature_result.get("_match_data"):
+            # Sekme ilk açıldığında kurulur; eşleşme görseli de o an çizilir
             viewer = ScrollableImageFrame(tab, bg="#2b2b2b")
             viewer.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
-            viewer.show_image(match_image)
+            viewer.show_image(build_match_image(feature_result))
 
 
             
@@ -964,6 +1850,11 @@ class DiffResultWindow(tk.Frame):
         )
         if not file_path: return
 
+        self._flush_sensitivity()
+        if not self.page_results:
+            messagebox.showwarning("Uyarı", "Henüz rapora eklenecek sayfa sonucu yok.")
+            return
+
         try:
             c = canvas.Canvas(file_path, pagesize=A4)
             width, height = A4
@@ -987,6 +1878,11 @@ class DiffResultWindow(tk.Frame):
                 ocr_score = res["text_result"].get("ratio") or 0
                 
                 line = f"Sayfa {res['page_num']}: {diff_count} fark, SSIM: %{ssim_score*100:.1f}, Metin: %{ocr_score*100:.1f}"
+                class_text = format_class_counts(res.get("diff_classes"))
+                if class_text:
+                    line += f" ({class_text.replace(' • ', ', ')})"
+                if res.get("timings"):
+                    line += f", Sure: {sum(m['wall'] for m in res['timings'].values()):.2f} sn"
                 c.drawString(70, y, line)
                 y -= 20
                 if y < 50:
@@ -1004,7 +1900,7 @@ class DiffResultWindow(tk.Frame):
                 c.drawString(50, height - 50, f"Sayfa {p_num} Detaylari")
                 
                 # Görsel Farkı Ekle
-                diff_img = res["diff_image"]
+                diff_img = result_image(res, "diff_image")
                 if diff_img:
                     # Resmi geçici dosyaya kaydet
                     import tempfile
@@ -1047,6 +1943,58 @@ class DiffResultWindow(tk.Frame):
                     y_text -= 12
                 
                 c.setFillColorRGB(0, 0, 0)
+
+                # Fark bölgeleri türe göre öncelikli (metin önce, ilk 10)
+                diff_classes = res.get("diff_classes")
+                if diff_classes:
+                    priority = list(REGION_CLASSES)
+                    order = sorted(range(len(diff_classes)), key=lambda k: priority.index(diff_classes[k]))
+                    y_text -= 10
+                    c.setFont("Helvetica-Bold", 10)
+                    c.drawString(50, y_text, f"Fark Bolgeleri: {len(diff_classes)}")
+                    c.setFont("Helvetica", 9)
+                    for k in order[:10]:
+                        x, y, w, h = res["differences"][k]
+                        y_text -= 12
+                        c.drawString(60, y_text, f"#{k + 1} {REGION_CLASSES[diff_classes[k]]}: {w}x{h} px @ ({x}, {y})")
+
+                # Vektör farkları (ilk 10)
+                vector_result = res.get("vector_result")
+                if vector_result and vector_result["changes"]:
+                    y_text -= 10
+                    c.setFont("Helvetica-Bold", 10)
+                    c.drawString(50, y_text, f"Vektor Farklari: {len(vector_result['changes'])}")
+                    c.setFont("Helvetica", 9)
+                    for change in vector_result["changes"][:10]:
+                        y_text -= 12
+                        c.drawString(60, y_text, f"{change['kind']} {change['type']}: {change['detail']}".replace("→", "->")[:90])
+
+                # Gömülü görseller (aynı olmayanlar)
+                image_result = res.get("image_result")
+                if image_result:
+                    flagged = [img for img in image_result["images"] if img["status"] != "identical"]
+                    y_text -= 12
+                    c.setFont("Helvetica", 9)
+                    c.drawString(
+                        50, y_text,
+                        f"Gomulu gorseller: {len(image_result['images'])}, farkli: "
+                        + (", ".join(img["status"] for img in flagged) or "yok")[:90]
+                    )
+
+                # Aşama süreleri
+                timings = res.get("timings")
+                if timings:
+                    y_text -= 10
+                    c.setFont("Helvetica-Bold", 10)
+                    c.drawString(50, y_text, "Asama Sureleri:")
+                    c.setFont("Helvetica", 9)
+                    for name, m in timings.items():
+                        y_text -= 12
+                        line = f"{name}: {m['wall']:.2f} sn, CPU {m['cpu']:.2f} sn"
+                        if m.get("rss_delta") is not None:
+                            line += f", bellek +{m['rss_delta'] / (1024 * 1024):.0f} MB"
+                        c.drawString(60, y_text, line)
+
                 c.showPage()
 
             c.save()
@@ -1056,345 +2004,604 @@ class DiffResultWindow(tk.Frame):
         except Exception as e:
             messagebox.showerror("Hata", f"PDF olusturulurken hata:\n{e}")
 
-class PixelCompareFrame(tk.Frame):
-    def __init__(self, parent, on_back=None):
-        super().__init__(parent, bg="#121212")
+class BatchView(tk.Frame):
+    """
+    Klasör-klasör toplu karşılaştırma ekranı: master ve print klasörlerindeki
+    dosyalar eşlenip kalıcı kuyruğa (BatchQueue) yazılır, işçi thread'ler
+    sırayla karşılaştırır. Tablo kuyruktan periyodik olarak yenilenir;
+    satıra çift tıklanınca çift normal karşılaştırma ekranında açılır.
+    İzle: print klasörüne gelen yeni dosyalar otomatik kuyruğa alınır.
+    """
+
+    def __init__(self, parent, queue, on_start, on_stop, on_open_pair, on_back=None, is_running=None,
+                 on_toggle_watch=None, watch_status=None):
+        super().__init__(parent, bg="#1e1e1e")
+        self.queue = queue
+        self.on_start = on_start
+        self.on_stop = on_stop
+        self.on_open_pair = on_open_pair
         self.on_back = on_back
+        self.is_running = is_running or (lambda: False)
+        self.on_toggle_watch = on_toggle_watch
+        self.watch_status = watch_status or (lambda: "")
+        self.batch_id = queue.latest_batch_id() if queue else None
+        self.master_dir = tk.StringVar()
+        self.print_dir = tk.StringVar()
+        self.status_var = tk.StringVar()
+        self._rows = {}  # job id -> tablo satırı
+        self.tree_jobs = {}  # tablo satırı -> iş
+
+        header = tk.Frame(self, bg="#2d2d2d", height=50, padx=10)
+        header.pack(fill=tk.X)
+        tk.Button(
+            header, text="← Geri", command=self.go_back,
+            bg="#444444", fg="white", relief=tk.FLAT, padx=10
+        ).pack(side=tk.LEFT, pady=10)
+        tk.Label(
+            header, text="Klasör Karşılaştırma", font=("Segoe UI", 16, "bold"),
+            bg="#2d2d2d", fg="white"
+        ).pack(side=tk.LEFT, padx=20)
+
+        form = tk.Frame(self, bg="#1e1e1e", padx=10, pady=10)
+        form.pack(fill=tk.X)
+        for row, (label, var) in enumerate((("Master klasörü:", self.master_dir), ("Print klasörü:", self.print_dir))):
+            tk.Label(form, text=label, font=("Segoe UI", 10), bg="#1e1e1e", fg="#bbbbbb").grid(
+                row=row, column=0, sticky=tk.W, pady=2
+            )
+            tk.Entry(form, textvariable=var, width=80, bg="#2b2b2b", fg="white", insertbackground="white",
+                     relief=tk.FLAT).grid(row=row, column=1, sticky=tk.EW, padx=5, pady=2)
+            tk.Button(
+                form, text="📁", bg="#333333", fg="white", relief=tk.FLAT,
+                command=lambda v=var: self._pick_folder(v)
+            ).grid(row=row, column=2, pady=2)
+        form.columnconfigure(1, weight=1)
+
+        buttons = tk.Frame(self, bg="#1e1e1e", padx=10)
+        buttons.pack(fill=tk.X)
+        self.start_btn = tk.Button(
+            buttons, text="▶ Başlat", font=("Segoe UI", 10, "bold"), bg="#ff6b35", fg="white",
+            relief=tk.FLAT, padx=12, pady=4, cursor="hand2", command=self._start
+        )
+        self.start_btn.pack(side=tk.LEFT, padx=(0, 5))
+        self.stop_btn = tk.Button(
+            buttons, text="■ Durdur", font=("Segoe UI", 10), bg="#555555", fg="white",
+            relief=tk.FLAT, padx=12, pady=4, cursor="hand2", command=self._stop
+        )
+        self.stop_btn.pack(side=tk.LEFT, padx=5)
+        self.retry_btn = tk.Button(
+            buttons, text="↻ Hataları Tekrarla", font=("Segoe UI", 10), bg="#555555", fg="white",
+            relief=tk.FLAT, padx=12, pady=4, cursor="hand2", command=self._retry_failed
+        )
+        self.retry_btn.pack(side=tk.LEFT, padx=5)
+        self.watch_btn = tk.Button(
+            buttons, text="👁 Klasörü İzle", font=("Segoe UI", 10), bg="#555555", fg="white",
+            relief=tk.FLAT, padx=12, pady=4, cursor="hand2", command=self._toggle_watch,
+            state=tk.NORMAL if on_toggle_watch else tk.DISABLED
+        )
+        self.watch_btn.pack(side=tk.LEFT, padx=5)
+        tk.Label(
+            buttons, textvariable=self.status_var, font=("Segoe UI", 10),
+            bg="#1e1e1e", fg="#aaaaaa", anchor=tk.W
+        ).pack(side=tk.LEFT, padx=15)
+
+        table_frame = tk.Frame(self, bg="#1e1e1e")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        columns = ("master", "print", "pairing", "status", "diffs", "ssim", "time")
+        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings")
+        for col, title, width in (
+            ("master", "Master", 260), ("print", "Print", 260), ("pairing", "Eşleşme", 90),
+            ("status", "Durum", 110), ("diffs", "Fark", 180), ("ssim", "SSIM", 70), ("time", "Süre", 70),
+        ):
+            self.tree.heading(col, text=title)
+            self.tree.column(col, width=width, anchor=tk.W, stretch=col in ("master", "print"))
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind("<Double-1>", self._on_double_click)
+
+        if self.queue is None:
+            self.status_var.set("İş kuyruğu açılamadı; toplu karşılaştırma kullanılamıyor.")
+            self.start_btn.config(state=tk.DISABLED)
+            self.watch_btn.config(state=tk.DISABLED)
+            return
+        self._refresh()
 
-        # Header
-        self._init_ui()
+    def go_back(self):
+        if self.on_back:
+            self.on_back()
 
-    def _init_ui(self):
-        self.container = tk.Frame(self)
-        self.container.pack(fill=tk.BOTH, expand=True)
+    def _pick_folder(self, var):
+        folder = filedialog.askdirectory(title="Klasör Seç")
+        if folder:
+            var.set(folder)
+
+    def _start(self):
+        master_dir, print_dir = self.master_dir.get().strip(), self.print_dir.get().strip()
+        if not master_dir and not print_dir:
+            # Klasör seçilmediyse kuyrukta bekleyen işlere devam edilir
+            if self.queue.counts().get("pending"):
+                self.on_start(None)
+                return
+            messagebox.showwarning("Uyarı", "Lütfen master ve print klasörlerini seçin.")
+            return
+        if not (os.path.isdir(master_dir) and os.path.isdir(print_dir)):
+            messagebox.showwarning("Uyarı", "Lütfen geçerli iki klasör seçin.")
+            return
+        self.batch_id = self.on_start((master_dir, print_dir))
+        self.tree.delete(*self.tree.get_children())
+        self._rows = {}
 
-        self.selection_view = tk.Frame(self.container, bg="#121212")
-        self.selection_view.pack(fill=tk.BOTH, expand=True)
+    def _stop(self):
+        self.on_stop()
+        self.status_var.set("Durduruluyor... (süren işler mevcut aşama bitince kuyruğa geri döner)")
 
-        # Üst Header
-        header = tk.Frame(self.selection_view, bg="#1f1f1f", height=60, padx=20)
+    def _retry_failed(self):
+        if self.batch_id is None:
+            return
+        self.queue.retry_failed(self.batch_id)
+        self.on_start(None)
+
+    def _toggle_watch(self):
+        """Seçili print klasörünü izlemeye alır / izlemeyi bırakır."""
+        master_dir, print_dir = self.master_dir.get().strip(), self.print_dir.get().strip()
+        if not (os.path.isdir(master_dir) and os.path.isdir(print_dir)):
+            messagebox.showwarning("Uyarı", "İzlemek için geçerli master ve print klasörlerini seçin.")
+            return
+        watching, batch_id = self.on_toggle_watch(master_dir, print_dir)
+        self.watch_btn.config(text="👁 İzlemeyi Bırak" if watching else "👁 Klasörü İzle")
+        if batch_id is not None and batch_id != self.batch_id:
+            self.batch_id = batch_id
+            self.tree.delete(*self.tree.get_children())
+            self._rows = {}
+
+    def _on_double_click(self, event):
+        item = self.tree.focus()
+        if not item:
+            return
+        job = self.tree_jobs.get(item)
+        if job and job["master_path"] and job["print_path"]:
+            self.on_open_pair(job["master_path"], job["print_path"])
+
+    def _refresh(self):
+        """Tabloyu ve durum satırını kuyruktan günceller (500 ms'de bir)."""
+        if not self.winfo_exists():
+            return
+        if self.batch_id is not None:
+            self.tree_jobs = {}
+            for job in self.queue.jobs(self.batch_id):
+                summary = job["summary"] or {}
+                values = (
+                    os.path.basename(job["master_path"] or "") or "-",
+                    os.path.basename(job["print_path"] or "") or "-",
+                    job["pairing"] or "-",
+                    JOB_STATUS_LABELS.get(job["status"], job["status"]) + (" (kayıttan)" if summary.get("cached") else ""),
+                    summary.get("differences", "-") if job["status"] == "done" else "-",
+                    f"{summary['min_ssim']:.3f}" if summary.get("min_ssim") is not None else "-",
+                    f"{summary['wall']:.1f} sn" if summary.get("wall") is not None else "-",
+                )
+                item = self._rows.get(job["id"])
+                if item is None:
+                    item = self.tree.insert("", tk.END, values=values)
+                    self._rows[job["id"]] = item
+                elif self.tree.item(item, "values") != tuple(str(v) for v in values):
+                    self.tree.item(item, values=values)
+                if job["status"] == "failed" and job["error"]:
+                    self.tree.item(item, tags=("failed",))
+                self.tree_jobs[item] = job
+            self.tree.tag_configure("failed", foreground="#ff6b6b")
+
+            counts = self.queue.counts(self.batch_id)
+            total = sum(n for status, n in counts.items() if status != "unpaired")
+            done = counts.get("done", 0) + counts.get("failed", 0)
+            text = f"{done}/{total} çift tamamlandı"
+            if counts.get("failed"):
+                text += f" • {counts['failed']} hata"
+            if counts.get("unpaired"):
+                text += f" • {counts['unpaired']} eşleşmeyen dosya"
+            text += " • çalışıyor" if self.is_running() else ""
+            watch_text = self.watch_status()
+            self.status_var.set(f"{text} • {watch_text}" if watch_text else text)
+        self.after(500, self._refresh)
+
+
+class HistoryView(tk.Frame):
+    """
+    Kayıtlı karşılaştırmaların geçmişi: dosya adına göre arama, bir
+    artwork'ün (aynı içerik özeti) tüm karşılaştırmaları, sayfa metrikleri
+    ve küçük resimler. Kayıtlar ResultStore'dan okunur, yeniden hesaplanmaz.
+    """
+
+    def __init__(self, parent, store, on_back=None, on_open_pair=None, focus_id=None):
+        super().__init__(parent, bg="#1e1e1e")
+        self.store = store
+        self.on_back = on_back
+        self.on_open_pair = on_open_pair
+        self.search_var = tk.StringVar()
+        self.info_var = tk.StringVar()
+        self._items = {}   # tablo satırı -> kayıt
+        self._pages = {}   # tablo satırı -> sayfa kaydı
+        self._photos = []  # Tk görsellerinin referansları
+
+        header = tk.Frame(self, bg="#2d2d2d", height=50, padx=10)
         header.pack(fill=tk.X)
-        
         tk.Button(
-            header, text="← Ana Sayfa", font=("Segoe UI", 10, "bold"),
-            bg="#C0392B", fg="white", relief=tk.FLAT, padx=12, pady=4,
-            cursor="hand2", command=self._go_home
-        ).pack(side=tk.LEFT, pady=10, padx=(0, 15))
-        
-        tk.Label(
-            header, text="Pixel Compare",
-            font=("Segoe UI", 20, "bold"), bg="#1f1f1f", fg="#ffffff"
+            header, text="← Geri", command=self.go_back,
+            bg="#444444", fg="white", relief=tk.FLAT, padx=10
         ).pack(side=tk.LEFT, pady=10)
+        tk.Label(
+            header, text="Karşılaştırma Geçmişi", font=("Segoe UI", 16, "bold"),
+            bg="#2d2d2d", fg="white"
+        ).pack(side=tk.LEFT, padx=20)
+
+        bar = tk.Frame(self, bg="#1e1e1e", padx=10, pady=8)
+        bar.pack(fill=tk.X)
+        tk.Label(bar, text="Dosya adı:", font=("Segoe UI", 10), bg="#1e1e1e", fg="#bbbbbb").pack(side=tk.LEFT)
+        entry = tk.Entry(bar, textvariable=self.search_var, width=40, bg="#2b2b2b", fg="white",
+                         insertbackground="white", relief=tk.FLAT)
+        entry.pack(side=tk.LEFT, padx=5)
+        entry.bind("<Return>", lambda e: self.reload())
+        for text, command in (
+            ("Ara", self.reload),
+            ("Bu master'ın geçmişi", lambda: self._filter_selected("master_digest")),
+            ("Bu print'in geçmişi", lambda: self._filter_selected("print_digest")),
+            ("Tümü", self._clear_filter),
+        ):
+            tk.Button(bar, text=text, bg="#333333", fg="white", relief=tk.FLAT, padx=10,
+                      command=command).pack(side=tk.LEFT, padx=3)
+        tk.Label(bar, textvariable=self.info_var, font=("Segoe UI", 10), bg="#1e1e1e",
+                 fg="#aaaaaa").pack(side=tk.LEFT, padx=15)
+
+        panes = tk.PanedWindow(self, orient=tk.VERTICAL, bg="#1e1e1e", sashwidth=4)
+        panes.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        self.tree = self._make_table(panes, (
+            ("created", "Tarih", 130), ("master", "Master", 260), ("print", "Print", 260),
+            ("pages", "Sayfa", 60), ("diffs", "Fark", 60), ("ssim", "Min SSIM", 80), ("settings", "Ayarlar", 200),
+        ), stretch=("master", "print"))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Double-1>", self._on_double_click)
+
+        detail = tk.Frame(panes, bg="#1e1e1e")
+        self.page_tree = self._make_table(detail, (
+            ("page", "Sayfa", 60), ("diffs", "Fark", 180), ("ssim", "SSIM", 70), ("ocr", "OCR", 70),
+            ("vector", "Vektör", 70), ("images", "Görsel", 70),
+        ), side=tk.LEFT)
+        self.page_tree.bind("<<TreeviewSelect>>", self._on_page_select)
+        self.thumbs = tk.Frame(detail, bg="#1e1e1e")
+        self.thumbs.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+
+        panes.add(self.tree.master, minsize=150)
+        panes.add(detail, minsize=200)
+        self._digest_filter = None
+        self.reload(focus_id)
+
+    def _make_table(self, parent, columns, stretch=(), side=None):
+        frame = tk.Frame(parent, bg="#1e1e1e")
+        tree = ttk.Treeview(frame, columns=[c[0] for c in columns], show="headings")
+        for col, title, width in columns:
+            tree.heading(col, text=title)
+            tree.column(col, width=width, anchor=tk.W, stretch=col in stretch)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        if side:
+            frame.pack(side=side, fill=tk.Y)
+        return tree
 
-        # Kontrol Butonları
-        controls = tk.Frame(self.selection_view, bg="#121212", pady=10)
-        controls.pack(fill=tk.X, padx=20)
+    def go_back(self):
+        if self.on_back:
+            self.on_back()
 
-        # Tekil Dosya Seçimi Butonu (Multi-modal)
-        self.multi_select_btn = tk.Button(
-            controls, text="📁 Dosya Seç", font=("Segoe UI", 11),
-            bg="#ffffff", fg="#0078d4", activebackground="#f0f0f0",
-            relief=tk.FLAT, padx=15, pady=5, cursor="hand2",
-            command=self._select_files_multi
-        )
-        self.multi_select_btn.pack(side=tk.LEFT, padx=5)
+    def reload(self, focus_id=None):
+        """Kayıt listesini arama ve içerik filtresine göre yeniden yükler."""
+        self.tree.delete(*self.tree.get_children())
+        self._items = {}
+        records = self.store.history(search=self.search_var.get().strip() or None, digest=self._digest_filter)
+        focus_item = None
+        for rec in records:
+            settings = rec["settings"]
+            item = self.tree.insert("", tk.END, values=(
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(rec["created"])),
+                os.path.basename(rec["master_path"] or "") or "-",
+                os.path.basename(rec["print_path"] or "") or "-",
+                rec["page_count"],
+                rec["differences"],
+                f"{rec['min_ssim']:.3f}" if rec["min_ssim"] is not None else "-",
+                f"{settings.get('profile', '-')} • {settings.get('merge', '-')}"
+                + (" • vektör" if settings.get("vector") else ""),
+            ))
+            self._items[item] = rec
+            if rec["id"] == focus_id:
+                focus_item = item
+        text = f"{len(records)} kayıt"
+        if self._digest_filter:
+            text += " (aynı içerik)"
+        self.info_var.set(text)
+        if focus_item is not None:
+            self.tree.selection_set(focus_item)
+            self.tree.see(focus_item)
+
+    def _filter_selected(self, field):
+        rec = self._selected()
+        if rec is None:
+            messagebox.showinfo("Bilgi", "Önce listeden bir kayıt seçin.")
+            return
+        self._digest_filter = rec[field]
+        self.reload(rec["id"])
+
+    def _clear_filter(self):
+        self._digest_filter = None
+        self.search_var.set("")
+        self.reload()
+
+    def _selected(self):
+        selection = self.tree.selection()
+        return self._items.get(selection[0]) if selection else None
+
+    def _on_select(self, event=None):
+        rec = self._selected()
+        self.page_tree.delete(*self.page_tree.get_children())
+        self._pages = {}
+        self._show_thumbs(None)
+        if rec is None:
+            return
+        first = None
+        for page in self.store.pages(rec["id"]):
+            m = page["metrics"]
+            diff_cell = len(m.get("differences", []))
+            class_text = format_class_counts(m.get("diff_classes"))
+            if class_text:
+                diff_cell = f"{diff_cell} ({class_text})"
+            item = self.page_tree.insert("", tk.END, values=(
+                page["page_num"],
+                diff_cell,
+                f"{m['ssim']:.3f}" if m.get("ssim") is not None else "-",
+                f"%{m['text_ratio'] * 100:.1f}" if m.get("text_ratio") is not None else "-",
+                m["vector_changes"] if m.get("vector_changes") is not None else "-",
+                m["images_flagged"] if m.get("images_flagged") is not None else "-",
+            ))
+            self._pages[item] = page
+            first = first or item
+        if first:
+            self.page_tree.selection_set(first)
+
+    def _on_page_select(self, event=None):
+        selection = self.page_tree.selection()
+        self._show_thumbs(self._pages.get(selection[0]) if selection else None)
+
+    def _show_thumbs(self, page):
+        for child in self.thumbs.winfo_children():
+            child.destroy()
+        self._photos = []
+        if page is None:
+            return
+        for title, key in (("Fark", "diff_thumb"), ("Master", "master_thumb"), ("Print", "print_thumb")):
+            if not page[key]:
+                continue
+            cell = tk.Frame(self.thumbs, bg="#1e1e1e")
+            cell.pack(side=tk.LEFT, padx=5, anchor=tk.N)
+            tk.Label(cell, text=title, font=("Segoe UI", 10, "bold"), bg="#1e1e1e", fg="#cccccc").pack()
+            photo = ImageTk.PhotoImage(Image.open(io.BytesIO(page[key])))
+            self._photos.append(photo)
+            tk.Label(cell, image=photo, bg="#1e1e1e").pack()
+
+    def _on_double_click(self, event):
+        rec = self._selected()
+        if rec is None or self.on_open_pair is None:
+            return
+        paths = (rec["master_path"], rec["print_path"])
+        if not all(p and os.path.exists(p) for p in paths):
+            messagebox.showwarning("Uyarı", "Kayıttaki dosyalar artık mevcut değil.")
+            return
+        self.on_open_pair(*paths)
+
+
+class CompareAnalyzer:
+    """
+    Sayfa karşılaştırma metrikleri (piksel farkı, OCR, SSIM, renk, feature matching).
+    Arayüzden bağımsızdır; PixelCompareFrame bu sınıftan türer, benchmark ve
+    toplu işler doğrudan örnekleyebilir.
+    """
+    merge_preset = DEFAULT_MERGE # Fark kutusu birleştirme ön ayarı (bkz. MERGE_PRESETS)
+    vector_mode = True # PDF çiftlerinde önce vektör (span/çizim) karşılaştırması
+    diff_tolerance = DEFAULT_TOLERANCE # Piksel farkı toleransı (bkz. DIFF_TOLERANCES)
+    memory_governor = None # Bellek bütçesi (MemoryGovernor); None ise sınırsız
+    _sensitivity_inputs = None # Son apply_sensitivity sayfasının çözülmüş dizileri (kaydırıcı aynı sayfada tekrarlar)
+
+    def _find_visual_differences(self, img1, img2, grays=None, merge=None, regions=None, extra_boxes=None,
+                                 ignore=None):
+        """
+        İki görsel (numpy dizisi veya PIL) arasındaki farkları bulur.
+        grays: önceden hesaplanmış gri diziler (aynı normalize görsellerden).
+        merge: kutu birleştirme ön ayarı (MERGE_PRESETS anahtarı veya (gap_x, gap_y)).
+        regions: piksel farkının aranacağı (x, y, w, h) bölgeleri; None ise tüm
+        sayfa, boş liste ise piksel farkı hiç hesaplanmaz (vektör sonucu kesin).
+        extra_boxes: dışarıdan gelen fark kutuları (örn. vektör farkları).
+        ignore: piksel farkı aranmayacak (x, y, w, h) alanları (örn. aynı olduğu
+        kanıtlanmış gömülü görseller).
+        Döndürür: (fark_görseli: PIL.Image, farklar: [(x, y, w, h), ...], img1_n, img2_n,
+        fark_büyüklüğü: uint8 dizi veya None). Fark büyüklüğü haritası saklanırsa
+        hassasiyet apply_sensitivity ile yeniden hesaplamadan değiştirilebilir.
+        """
+        # Boyutları farklıysa normalize et (oranı koruyarak aynı boyuta ölçekle)
+        img1_n, img2_n = self._normalize_images(img1, img2)
+        img1_n, img2_n = to_rgb(img1_n), to_rgb(img2_n)
 
-        self.clear_all_btn = tk.Button(
-            controls, text="🧹 Tümünü Temizle", font=("Segoe UI", 10),
-            bg="#005a9e", fg="white", activebackground="#004a80",
-            relief=tk.FLAT, padx=12, pady=5, cursor="hand2",
-            command=self._clear_all
-        )
-        self.clear_all_btn.pack(side=tk.LEFT, padx=5)
+        w = max(img1_n.shape[1], img2_n.shape[1])
+        h = max(img1_n.shape[0], img2_n.shape[0])
 
-        # Ana içerik
-        content = tk.Frame(self.selection_view, bg="#121212")
-        content.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        # Aynı boyutta beyaz zemin (boyutlar eşitse kopya yapılmaz)
+        arr1 = self._pad_to(img1_n, h, w)
+        arr2 = self._pad_to(img2_n, h, w)
 
-        # Sol panel (Master)
-        self.left_panel = FilePanel(content, title="📄 Master")
-        self.left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Gri tonlamaya çevir
+        if grays is not None:
+            gray1 = self._pad_to(grays[0], h, w)
+            gray2 = self._pad_to(grays[1], h, w)
+        else:
+            gray1 = to_gray(arr1)
+            gray2 = to_gray(arr2)
+
+        boxes = list(extra_boxes or [])
+        magnitude = None
+        if regions is None or regions:
+            # Fark büyüklüğü: tolerans açıksa kenar yumuşatma / alt-piksel kayması elenir
+            if regions is None:
+                magnitude = diff_magnitude(gray1, gray2, self.diff_tolerance)
+            else:
+                # Sadece vektörel karar verilemeyen bölgelerde piksel farkı
+                magnitude = np.zeros((h, w), np.uint8)
+                for x, y, bw, bh in regions:
+                    sl = (slice(y, y + bh), slice(x, x + bw))
+                    np.maximum(magnitude[sl], diff_magnitude(gray1[sl], gray2[sl], self.diff_tolerance),
+                               out=magnitude[sl])
+            for x, y, bw, bh in ignore or ():
+                magnitude[y:y + bh, x:x + bw] = 0
+
+            # Eşik, gürültü temizliği ve küçük konturların elenmesi
+            boxes += extract_boxes(magnitude, *default_sensitivity(self.diff_tolerance))
+
+        differences = self._merge_differences(boxes, self.merge_preset if merge is None else merge)
+        result_img = self._draw_difference_overlay(arr1, differences)
+
+        # numpy → PIL (sadece gösterim için)
+        diff_pil = Image.fromarray(result_img)
+        return diff_pil, differences, Image.fromarray(img1_n), Image.fromarray(img2_n), magnitude
 
-        # Master Selection Controls
-        left_controls = tk.Frame(content, bg="#121212")
-        left_controls.pack(side=tk.LEFT, fill=tk.Y)
-        
-        tk.Button(left_controls, text="⛶ Bölge Seç", bg="#333333", fg="white", 
-                  command=self.left_panel.enable_selection).pack(fill=tk.X, pady=2)
-        tk.Button(left_controls, text="❌ Temizle", bg="#333333", fg="white", 
-                  command=self.left_panel.clear_selection).pack(fill=tk.X, pady=2)
+    def _merge_differences(self, boxes, merge):
+        """Yakın/örtüşen kutuları birleştirir ve büyüklüğe göre sıralar (numaralar bu sırayla çizilir)."""
+        # Kelime, satır veya grafik bölgelerinde birleştir
+        differences = merge_with_preset(boxes, merge)
+        differences.sort(key=lambda d: d[2] * d[3], reverse=True)
+        return differences
 
+    def apply_sensitivity(self, result, sensitivity):
+        """
+        Sayfa sonucunun fark kutularını saklanan fark büyüklüğü haritasından
+        (eşik, çekirdek, en küçük alan) hassasiyetiyle yeniden çıkarır; render,
+        OCR ve diğer aşamalar tekrarlanmaz. Sonuç değiştirilmez: güncellenmiş
+        kopyası döner (hassasiyet aynıysa veya harita yoksa sonucun kendisi).
+        """
+        diff_map = result.get("diff_map")
+        sensitivity = tuple(sensitivity)
+        if not diff_map or sensitivity == diff_map["sensitivity"]:
+            return result
+        inputs = self._sensitivity_inputs
+        if inputs is None or inputs[0] is not result:
+            # Bellek sınırı nedeniyle sıkıştırılmış harita ve görseller açılır
+            unpack_result(result)
+            magnitude = diff_map["magnitude"]
+            rgb1, rgb2 = np.asarray(result["img1_norm"]), np.asarray(result["img2_norm"])
+            h = max(rgb1.shape[0], rgb2.shape[0])
+            w = max(rgb1.shape[1], rgb2.shape[1])
+            inputs = (
+                result, np.asarray(magnitude) if magnitude is not None else None,
+                rgb1, rgb2, to_gray(rgb1), to_gray(rgb2), self._pad_to(rgb1, h, w),
+            )
+            self._sensitivity_inputs = inputs
+        _, magnitude, rgb1, rgb2, gray1, gray2, canvas1 = inputs
+
+        boxes = list(diff_map["extra_boxes"])
+        if magnitude is not None:
+            boxes += extract_boxes(magnitude, *sensitivity)
+        differences = self._merge_differences(boxes, diff_map["merge"])
+        diff_classes = classify_regions(differences, rgb1, rgb2, gray1, gray2, diff_map["text_boxes"])
+        diff_image = Image.fromarray(self._draw_difference_overlay(canvas1, differences))
+        return dict(
+            result, differences=differences, diff_classes=diff_classes, diff_image=diff_image,
+            sensitivity=sensitivity,
+        )
 
-        # Orta — Compare butonu
-        middle = tk.Frame(content, bg="#121212", width=80)
-        middle.pack(side=tk.LEFT, fill=tk.Y, padx=4)
-        middle.pack_propagate(False)
-
-        spacer = tk.Frame(middle, bg="#121212")
-        spacer.pack(expand=True)
-
-        self.compare_btn = tk.Button(
-            middle,
-            text="⚡\nCompare",
-            font=("Segoe UI", 11, "bold"),
-            bg="#ff6b35", fg="white",
-            activebackground="#e55a2b", activeforeground="white",
-            relief=tk.FLAT, padx=8, pady=16,
-            cursor="hand2",
-            command=self._compare
-        )
-        self.compare_btn.pack(pady=4)
-
-        # Swap butonu
-        self.swap_btn = tk.Button(
-            middle,
-            text="⇄\nSwap",
-            font=("Segoe UI", 9),
-            bg="#555555", fg="white",
-            activebackground="#777777",
-            relief=tk.FLAT, padx=8, pady=8,
-            cursor="hand2",
-            command=self._swap_panels
-        )
-        self.swap_btn.pack(pady=4)
-
-        # Print Selection Controls
-        right_controls = tk.Frame(content, bg="#121212")
-        right_controls.pack(side=tk.LEFT, fill=tk.Y)
-        
-        # Use lambda to delay evaluation of self.right_panel until click
-        tk.Button(right_controls, text="⛶ Bölge Seç", bg="#333333", fg="white", 
-                  command=lambda: self.right_panel.enable_selection()).pack(fill=tk.X, pady=2)
-        tk.Button(right_controls, text="❌ Temizle", bg="#333333", fg="white", 
-                  command=lambda: self.right_panel.clear_selection()).pack(fill=tk.X, pady=2)
-
-        # Sağ panel (Print)
-        self.right_panel = FilePanel(content, title="📄 Print")
-        self.right_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        # Alt durum çubuğu
-        self.status_var = tk.StringVar(value="Karşılaştırmak için her iki panele de dosya yükleyin.")
-        status_bar = tk.Label(
-            self.selection_view, textvariable=self.status_var,
-            font=("Segoe UI", 9), bg="#252525", fg="#888888",
-            anchor=tk.W, padx=12, pady=4
-        )
-        status_bar.pack(fill=tk.X, side=tk.BOTTOM)
-
-    def _select_files_multi(self):
-        """Kullanıcının 1 veya 2 dosya seçmesine izin verir."""
-        files = filedialog.askopenfilenames(
-            title="Dosya Seç (1 veya 2 adet)",
-            filetypes=[("Desteklenenler", "*.png;*.jpg;*.jpeg;*.bmp;*.pdf"), ("Tüm Dosyalar", "*.*")]
-        )
-        if not files: return
-
-        if len(files) == 1:
-            # Tek dosya -> Boş olana yükle
-            if not self.left_panel.file_path:
-                self.left_panel.load_file(files[0])
-            elif not self.right_panel.file_path:
-                self.right_panel.load_file(files[0])
-            else:
-                # İkisi de doluysa -> Solu ez (kullanıcı soldan başlar mantığı)
-                self.left_panel.load_file(files[0])
-        elif len(files) >= 2:
-            # İki dosya -> Sırayla yükle
-            self.left_panel.load_file(files[0])
-            self.right_panel.load_file(files[1])
-            if len(files) > 2:
-                messagebox.showinfo("Bilgi", "Sadece ilk 2 dosya yüklendi.")
-        
-        self._update_status()
-
-    def _clear_all(self):
-        """Her şeyi temizle."""
-        # Panels reset
-        for panel in [self.left_panel, self.right_panel]:
-            panel.file_path = None
-            panel.doc = None
-            panel.current_image = None
-            panel.file_label.config(text="Dosya seçilmedi", fg="#666666")
-            panel.file_label.config(text="Dosya seçilmedi", fg="#666666")
-            panel.diffs = []
-            panel.canvas.delete("all")
-        
-        self._update_status()
-
-    def _update_status(self):
-        l = bool(self.left_panel.file_path)
-        r = bool(self.right_panel.file_path)
-        if l and r:
-            self.status_var.set("Karşılaştırma hazır. 'Compare' butonuna basın.")
-        elif l or r:
-            self.status_var.set("Bir dosya daha seçin.")
-        else:
-            self.status_var.set("Dosya seçilmedi.")
-
-    def _compare(self):
-        if not self.left_panel.file_path or not self.right_panel.file_path:
-            messagebox.showwarning("Uyarı", "Lütfen iki dosya seçin.")
-            return
-
-        self.status_var.set("Karşılaştırılıyor... Lütfen bekleyin.")
-        self.compare_btn.config(state=tk.DISABLED, text="Wait...")
-        self.update_idletasks()
-
-        try:
-            # Sayfa sayılarını kontrol et
-            left_pages = self.left_panel.get_total_pages()
-            right_pages = self.right_panel.get_total_pages()
-            
-            total_pages = max(left_pages, right_pages)
-            
-            page_results = [] # Her sayfa için sonuçları tutacak
-            
-            for i in range(total_pages):
-                # İlgili sayfa görsellerini al (ROI Desteği)
-                # Seçim varsa onu kullan, yoksa tam sayfayı
-                img1 = self.left_panel.get_selection_image()
-                if not img1:
-                     img1 = self.left_panel.get_page_image(i)
-                     
-                img2 = self.right_panel.get_selection_image()
-                if not img2:
-                     img2 = self.right_panel.get_page_image(i)
-                
-                if not img1 or not img2:
-                    # Sayfa sayısı uyuşmazlığı varsa boş geçebiliriz veya uyarı verebiliriz
-                    # Şimdilik devam, olmayan sayfaNone döner
-                    continue
-
-                # --- 1. Görsel (Piksel) Karşılaştırma ---
-                # --- 1. Görsel (Piksel) Karşılaştırma ---
-                diff_image, differences, img1_norm, img2_norm = self._find_visual_differences(img1, img2)
-
-                # --- 2. Metin (OCR) Karşılaştırma ---
-                text1 = self._extract_text(img1)
-                text2 = self._extract_text(img2)
-                
-                # _compare_texts artık tüm bilgileri içeren bir sözlük döndürüyor
-                text_result = self._compare_texts(text1, text2)
-
-                # --- 3. SSIM ---
-                score, ssim_diff = self._compute_ssim(img1, img2)
-                ssim_result = {"score": score, "diff_image": ssim_diff}
-
-                # 4. Color
-                overall, channels = self._compare_colors(img1, img2)
-                color_result = {"overall": overall, "channels": channels}
-
-                # 5. Feature matching
-                feature_result = self._feature_matching(img1, img2)
-
-                page_results.append({
-                    "page_num": i + 1,
-                    "diff_image": diff_image,
-                    "differences": differences,
-                    "page_num": i + 1,
-                    "diff_image": diff_image,
-                    "differences": differences,
-                    "img1_norm": img1_norm,
-                    "img2_norm": img2_norm,
-                    "text_result": text_result,
-                    "ssim_result": ssim_result,
-                    "color_result": color_result,
-                    "feature_result": feature_result
-                })
-
-            if not page_results:
-                messagebox.showwarning("Hata", "Sayfalar render edilemedi.")
-                return
-
-            self.status_var.set(f"Karsilastirma tamamlandi. {len(page_results)} sayfa analiz edildi.")
-            
-            self.status_var.set(f"Karsilastirma tamamlandi. {len(page_results)} sayfa analiz edildi.")
-            
-            # İlk sayfadaki farkları ana ekrandaki panellere de yansıt
-            if page_results:
-                first_res = page_results[0]
-                # Normalize edilmiş görselleri ve farkları panel'e gönder
-                if first_res.get("img1_norm") and first_res.get("img2_norm"):
-                     self.left_panel.show_diffs(first_res["img1_norm"], first_res["differences"])
-                     self.right_panel.show_diffs(first_res["img2_norm"], first_res["differences"])
-
-            # Sonuçları Ana Ekrada Göster
-            self.selection_view.pack_forget()
-            self.results_view = DiffResultWindow(self.container, page_results, on_back=self._show_selection)
-            self.results_view.pack(fill=tk.BOTH, expand=True)
-
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("Hata", f"Karsilastirma basarisiz:\n{e}")
-            self.status_var.set(f"Karsilastirma basarisiz: {e}")
-        finally:
-            self.compare_btn.config(state=tk.NORMAL, text="Compare")
-
-    def _show_selection(self):
-        """Sonuç ekranını kapat ve seçim ekranını göster"""
-        if hasattr(self, 'results_view'):
-            self.results_view.destroy()
-        self.selection_view.pack(fill=tk.BOTH, expand=True)
-
-    def _find_visual_differences(self, pil_img1, pil_img2):
+    def _map_vector_result(self, vector_result, mat1, mat2, width, height):
         """
-        İki görsel arasındaki farkları bulur.
-        Döndürür: (fark_görseli: PIL.Image, farklar: [(x, y, w, h), ...])
+        Vektör farklarını ve piksel karşılaştırması gereken alanları normalize
+        görüntünün piksel kutularına çevirir. Her değişikliğe "box" eklenir.
+        Döndürür: (fark_kutuları, raster_bölgeleri veya tüm sayfa için None)
         """
-        # Boyutları farklıysa normalize et (oranı koruyarak aynı boyuta ölçekle)
-        img1_n, img2_n = self._normalize_images(pil_img1, pil_img2)
-
-        w = max(img1_n.width, img2_n.width)
-        h = max(img1_n.height, img2_n.height)
-
-        canvas1 = Image.new("RGB", (w, h), (255, 255, 255))
-        canvas2 = Image.new("RGB", (w, h), (255, 255, 255))
-        canvas1.paste(img1_n, (0, 0))
-        canvas2.paste(img2_n, (0, 0))
-
-        # PIL → numpy (OpenCV formatı)
-        arr1 = np.array(canvas1)
-        arr2 = np.array(canvas2)
-
-        # Gri tonlamaya çevir
-        gray1 = cv2.cvtColor(arr1, cv2.COLOR_RGB2GRAY)
-        gray2 = cv2.cvtColor(arr2, cv2.COLOR_RGB2GRAY)
-
-        # Fark hesapla
-        diff = cv2.absdiff(gray1, gray2)
-
-        # Eşikleme (Daha hassas: 30 -> 10)
-        _, thresh = cv2.threshold(diff, 10, 255, cv2.THRESH_BINARY)
-
-        # Gürültü temizle (Daha küçük kernel: 5x5 -> 3x3)
-        kernel = np.ones((3, 3), np.uint8)
-        thresh = cv2.dilate(thresh, kernel, iterations=1)
-        thresh = cv2.erode(thresh, kernel, iterations=1)
-
-        # Konturları bul
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        # Fark bölgelerini topla
-        differences = []
-        result_img = arr1.copy()
-
-        for cnt in contours:
-            area = cv2.contourArea(cnt)
-            if area < 2: continue # Çok küçük gürültüleri atla (sembolleri yakala)
-            x, y, bw, bh = cv2.boundingRect(cnt)
-            differences.append((x, y, bw, bh))
-
+        def to_box(rect, mat):
+            return rect_to_pixels(rect, mat, width, height) if rect is not None else None
+
+        boxes = []
+        for change in vector_result["changes"]:
+            pair = [b for b in (to_box(change["rect1"], mat1), to_box(change["rect2"], mat2)) if b]
+            boxes.extend(pair)
+            change["box"] = pair[0] if pair else None
+
+        if not vector_result["conclusive"] and not vector_result["raster_regions"]:
+            return boxes, None
+        regions = []
+        for rect1, rect2 in vector_result["raster_regions"]:
+            regions.extend(b for b in (to_box(rect1, mat1), to_box(rect2, mat2)) if b)
+        return boxes, regions
+
+    def _unexplained_boxes(self, tri1, tri2, width, height, covered):
+        """
+        Vektör sonucunun açıklamadığı farkları kaba (triage) çözünürlükte arar.
+        covered: vektör farkı ve piksel bölgesi kutuları (normalize diff pikseli).
+        Döndürür: normalize diff pikselinde (x, y, w, h) kutuları.
+        """
+        tri1, tri2 = self._normalize_images(tri1, tri2)
+        tw = tri1.shape[1]
+        th = max(tri1.shape[0], tri2.shape[0])
+        gray1 = self._pad_to(to_gray(tri1), th, tw)
+        gray2 = self._pad_to(to_gray(tri2), th, tw)
+
+        f = width / tw # triage pikseli -> diff pikseli
+        covered = [
+            (int(x / f), int(y / f), math.ceil((x + w) / f) - int(x / f), math.ceil((y + h) / f) - int(y / f))
+            for x, y, w, h in covered
+        ]
+        pad = math.ceil(f)
+        boxes = []
+        for x, y, w, h in uncovered_boxes(gray1, gray2, covered, self.diff_tolerance):
+            x0, y0 = max(0, int(x * f) - pad), max(0, int(y * f) - pad)
+            x1, y1 = min(width, int((x + w) * f) + pad), min(height, int((y + h) * f) + pad)
+            if x1 > x0 and y1 > y0:
+                boxes.append((x0, y0, x1 - x0, y1 - y0))
+        return boxes
+
+    def _map_image_result(self, image_result, mat1, mat2, width, height):
+        """
+        Gömülü görsel sonuçlarına piksel kutusu ("box") ekler ve piksel
+        farkından çıkarılabilecek alanları döndürür: içeriği aynı, yeri
+        değişmemiş ve üstünde/altında başka içerik olmayan görseller.
+        """
+        ignore = []
+        for img in image_result["images"]:
+            box1 = rect_to_pixels(img["rect1"], mat1, width, height) if img["rect1"] else None
+            box2 = rect_to_pixels(img["rect2"], mat2, width, height) if img["rect2"] else None
+            img["box"] = box1 or box2
+            if img["status"] in UNCHANGED_STATUSES and not img["exposed"]:
+                ignore.extend(b for b in (box1, box2) if b)
+        return ignore
+
+    def _draw_difference_overlay(self, arr, differences):
+        """Fark bölgelerini numaralı kırmızı kutu ve yarı saydam dolgu ile işaretler."""
+        result_img = arr.copy()
+
+        # Daha belirgin yarı saydam kırmızı dolgu (Marker etkisi)
+        # Tüm dolgular tek katmana çizilip bir kez karıştırılır; karıştırma
+        # sadece kutuları kapsayan alanda yapılır (dışarısı değişmez)
+        if differences:
+            h, w = result_img.shape[:2]
+            x0 = max(min(x for x, _, _, _ in differences), 0)
+            y0 = max(min(y for _, y, _, _ in differences), 0)
+            x1 = min(max(x + bw for x, _, bw, _ in differences) + 1, w)
+            y1 = min(max(y + bh for _, y, _, bh in differences) + 1, h)
+            if x0 < x1 and y0 < y1:
+                area = result_img[y0:y1, x0:x1]
+                overlay = area.copy()
+                for x, y, bw, bh in differences:
+                    cv2.rectangle(overlay, (x - x0, y - y0), (x + bw - x0, y + bh - y0), (255, 0, 0), -1)
+                area[...] = cv2.addWeighted(overlay, 0.3, area, 0.7, 0)
+
+        for idx, (x, y, bw, bh) in enumerate(differences, 1):
             # Kırmızı dikdörtgen çerçeve
             cv2.rectangle(result_img, (x, y), (x + bw, y + bh), (200, 0, 0), 1)
 
-            # Daha belirgin yarı saydam kırmızı dolgu (Marker etkisi)
-            overlay = result_img.copy()
-            cv2.rectangle(overlay, (x, y), (x + bw, y + bh), (255, 0, 0), -1)
-            result_img = cv2.addWeighted(overlay, 0.3, result_img, 0.7, 0)
-
             # Numara yaz (Sadece kutu yeterince büyükse veya kutunun yanına yaz)
-            idx = len(differences)
             if bw > 15 and bh > 15:
                 cv2.putText(
                     result_img, str(idx),
@@ -1408,38 +2615,39 @@ class PixelCompareFrame(tk.Frame):
                     (x + bw + 2, y + bh + 2), cv2.FONT_HERSHEY_SIMPLEX,
                     0.4, (200, 0, 0), 1
                 )
-
-        # Büyüklüğe göre sırala (en büyük önce)
-        differences.sort(key=lambda d: d[2] * d[3], reverse=True)
-
-        # numpy → PIL
-        diff_pil = Image.fromarray(result_img)
-        return diff_pil, differences, img1_n, img2_n
-
-    def _normalize_images(self, pil_img1, pil_img2):
-        """İki görseli aynı boyuta normalize eder (oranı koruyarak)."""
-        w1, h1 = pil_img1.size
-        w2, h2 = pil_img2.size
+        return result_img
+
+    def _normalize_images(self, img1, img2):
+        """İki görseli (numpy dizisi veya PIL) aynı genişliğe normalize eder (oranı koruyarak)."""
+        arr1 = as_array(img1)
+        arr2 = as_array(img2)
+        h1, w1 = arr1.shape[:2]
+        h2, w2 = arr2.shape[:2]
         
         # En büyük genişliği al
         final_w = max(w1, w2)
-        # Orantılı yükseklik (img1 için)
-        ratio1 = final_w / w1
-        h1_new = int(h1 * ratio1)
-        img1_res = pil_img1.resize((final_w, h1_new), Image.Resampling.LANCZOS)
-        
-        # img2 için
-        ratio2 = final_w / w2
-        h2_new = int(h2 * ratio2)
-        img2_res = pil_img2.resize((final_w, h2_new), Image.Resampling.LANCZOS)
-        
-        return img1_res, img2_res
 
-    def _preprocess_for_ocr(self, pil_image):
-        """OCR öncesi görüntü iyileştirme."""
-        # PIL -> OpenCV (Gri tonlama)
-        img_cv = np.array(pil_image)
-        gray = cv2.cvtColor(img_cv, cv2.COLOR_RGB2GRAY)
+        def resize(arr, w, h):
+            # Genişlik zaten hedefteyse kopyalama
+            if w == final_w:
+                return arr
+            # Orantılı yükseklik
+            new_h = int(h * final_w / w)
+            return cv2.resize(arr, (final_w, new_h), interpolation=cv2.INTER_LANCZOS4)
+
+        return resize(arr1, w1, h1), resize(arr2, w2, h2)
+
+    def _pad_to(self, arr, h, w):
+        """Diziyi sağ/alt kenardan beyazla (h, w) boyutuna tamamlar."""
+        if arr.shape[0] == h and arr.shape[1] == w:
+            return arr
+        out = np.full((h, w) + arr.shape[2:], 255, dtype=np.uint8)
+        out[:arr.shape[0], :arr.shape[1]] = arr
+        return out
+
+    def _preprocess_for_ocr(self, image):
+        """OCR öncesi görüntü iyileştirme. Gri dizi gelirse dönüşüm yapılmaz; ikili numpy dizisi döndürür."""
+        gray = to_gray(image)
 
         # 1. Upscale — küçük görsellerde OCR doğruluğunu artırır
         h, w = gray.shape
@@ -1460,37 +2668,21 @@ class PixelCompareFrame(tk.Frame):
             cv2.THRESH_BINARY, 31, 10
         )
 
-        # 5. Eğrilik düzeltme (deskew)
-        coords = np.column_stack(np.where(binary < 128))
-        if len(coords) > 100:
-            angle = cv2.minAreaRect(coords)[-1]
-            if angle < -45:
-                angle = -(90 + angle)
-            else:
-                angle = -angle
-            if abs(angle) > 0.5 and abs(angle) < 15:
-                (bh, bw) = binary.shape
-                center = (bw // 2, bh // 2)
-                M = cv2.getRotationMatrix2D(center, angle, 1.0)
-                binary = cv2.warpAffine(
-                    binary, M, (bw, bh),
-                    flags=cv2.INTER_CUBIC,
-                    borderMode=cv2.BORDER_REPLICATE
-                )
-
-        return Image.fromarray(binary)
+        # Eğrilik düzeltmesi burada yapılmaz: taranmış girdiler yüklenirken
+        # düzeltilir (PageSource.auto_orient), OCR dizisi zaten düz gelir
+        return binary
 
-    def _extract_text(self, pil_image):
-        """OCR ile görselden metin çıkarır. PaddleOCR > Tesseract sırasıyla dener."""
-        # Ön-işleme uygula
-        processed = self._preprocess_for_ocr(pil_image)
+    def _extract_text(self, image):
+        """OCR ile görselden (numpy dizisi veya PIL) metin çıkarır. PaddleOCR > Tesseract sırasıyla dener."""
+        if not PADDLE_SUPPORT and not TESSERACT_SUPPORT:
+            return None
 
         # Önce PaddleOCR dene (daha yüksek doğruluk)
         if PADDLE_SUPPORT:
             try:
                 if not hasattr(self, '_paddle_ocr'):
                     self._paddle_ocr = PaddleOCR(lang="tr", show_log=False)
-                arr = np.array(pil_image)  # PaddleOCR orijinal renkli görsel ister
+                arr = to_rgb(image)  # PaddleOCR orijinal renkli görsel ister
                 result = self._paddle_ocr.ocr(arr, cls=True)
                 lines = []
                 if result and result[0]:
@@ -1510,6 +2702,8 @@ class PixelCompareFrame(tk.Frame):
         # PaddleOCR başarısızsa Tesseract'a düş
         if TESSERACT_SUPPORT:
             try:
+                # Ön-işleme sadece Tesseract için gerekli
+                processed = self._preprocess_for_ocr(image)
                 try:
                     text = pytesseract.image_to_string(processed, lang="tur+eng")
                 except pytesseract.TesseractError:
@@ -1558,27 +2752,19 @@ class PixelCompareFrame(tk.Frame):
 
         return result
 
-    def _compute_ssim(self, pil_img1, pil_img2):
-        """SSIM (Yapısal Benzerlik) hesaplar."""
+    def _compute_ssim(self, img1, img2):
+        """SSIM (Yapısal Benzerlik) hesaplar. Gri diziler doğrudan kullanılır."""
         if not SSIM_SUPPORT or not CV2_SUPPORT:
             return None, None
 
         # Aynı boyuta getir
-        img1, img2 = self._normalize_images(pil_img1, pil_img2)
+        img1, img2 = self._normalize_images(to_gray(img1), to_gray(img2))
 
         # Aynı canvas boyutuna yerleştir
-        w = max(img1.width, img2.width)
-        h = max(img1.height, img2.height)
-        canvas1 = Image.new("RGB", (w, h), (255, 255, 255))
-        canvas2 = Image.new("RGB", (w, h), (255, 255, 255))
-        canvas1.paste(img1, (0, 0))
-        canvas2.paste(img2, (0, 0))
-
-        arr1 = np.array(canvas1)
-        arr2 = np.array(canvas2)
-
-        gray1 = cv2.cvtColor(arr1, cv2.COLOR_RGB2GRAY)
-        gray2 = cv2.cvtColor(arr2, cv2.COLOR_RGB2GRAY)
+        w = max(img1.shape[1], img2.shape[1])
+        h = max(img1.shape[0], img2.shape[0])
+        gray1 = self._pad_to(img1, h, w)
+        gray2 = self._pad_to(img2, h, w)
 
         score, diff_map = ssim(gray1, gray2, full=True)
 
@@ -1591,13 +2777,13 @@ class PixelCompareFrame(tk.Frame):
 
         return score, diff_pil
 
-    def _compare_colors(self, pil_img1, pil_img2):
+    def _compare_colors(self, img1, img2):
         """Renk histogramı karşılaştırması yapar."""
         if not CV2_SUPPORT:
             return None, {}
 
-        arr1 = np.array(pil_img1)
-        arr2 = np.array(pil_img2)
+        arr1 = to_rgb(img1)
+        arr2 = to_rgb(img2)
 
         similarities = {}
         channel_names = ["Kırmızı (R)", "Yeşil (G)", "Mavi (B)"]
@@ -1613,15 +2799,29 @@ class PixelCompareFrame(tk.Frame):
         overall = sum(similarities.values()) / len(similarities)
         return overall, similarities
 
-    def _feature_matching(self, pil_img1, pil_img2):
-        """ORB feature matching ile içerik bazlı görsel karşılaştırma."""
+    def _feature_matching(self, img1, img2, mode=None):
+        """ORB feature matching ile içerik bazlı görsel karşılaştırma.
+
+        mode: "pyramid" (varsayılan) ORB'yi küçültülmüş piramit seviyesinde
+        çalıştırır ve FLANN LSH ile eşleştirir; "bruteforce" eski tam
+        çözünürlük + BFMatcher davranışıdır. Eşleşme görseli sekme açılana
+        kadar oluşturulmaz (bkz. build_match_image).
+        """
         if not CV2_SUPPORT:
             return None
 
-        arr1 = np.array(pil_img1)
-        arr2 = np.array(pil_img2)
-        gray1 = cv2.cvtColor(arr1, cv2.COLOR_RGB2GRAY)
-        gray2 = cv2.cvtColor(arr2, cv2.COLOR_RGB2GRAY)
+        mode = mode or FEATURE_MATCH_MODE
+
+        arr1 = to_rgb(img1)
+        arr2 = to_rgb(img2)
+        gray1 = to_gray(arr1)
+        gray2 = to_gray(arr2)
+
+        if mode == "pyramid":
+            # Tespit piramidin küçük seviyesinde: maliyet sayfa pikseline değil
+            # keypoint sayısına bağlı kalır (ORB kendi içinde ölçek piramidi kurar)
+            gray1 = self._pyramid_down(gray1, FEATURE_PYRAMID_MAX_SIDE)
+            gray2 = self._pyramid_down(gray2, FEATURE_PYRAMID_MAX_SIDE)
 
         # ORB dedektör (fazla özellik bul)
         orb = cv2.ORB_create(nfeatures=2000)
@@ -1637,9 +2837,14 @@ class PixelCompareFrame(tk.Frame):
                 "match_image": None,
             }
 
-        # BFMatcher ile eşleştir
-        bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
-        matches = bf.knnMatch(des1, des2, k=2)
+        if mode == "pyramid":
+            # FLANN LSH indeksi: binary (Hamming) tanımlayıcılar için
+            index_params = dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1)
+            matcher = cv2.FlannBasedMatcher(index_params, dict(checks=50))
+        else:
+            # BFMatcher ile eşleştir
+            matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
+        matches = matcher.knnMatch(des1, des2, k=2)
 
         # Lowe's ratio test — iyi eşleşmeleri filtrele
         good_matches = []
@@ -1654,41 +2859,1010 @@ class PixelCompareFrame(tk.Frame):
         score = len(good_matches) / max_possible if max_possible > 0 else 0.0
         score = min(score, 1.0)
 
-        # Eşleşme görselini oluştur
+        # Eşleşme görseli tembel: sadece çizim için gereken veriyi sakla
         good_matches_sorted = sorted(good_matches, key=lambda x: x.distance)
-        match_img = cv2.drawMatches(
-            arr1, kp1, arr2, kp2,
-            good_matches_sorted[:100],  # En iyi 100 eşleşme
-            None, flags=cv2.DrawMatchesFlags_NOT_DRAW_SINGLE_POINTS,
-            matchColor=(0, 255, 0),
-        )
-        match_pil = Image.fromarray(match_img)
+        if mode == "pyramid":
+            img1_vis, img2_vis = gray1, gray2
+        else:
+            img1_vis, img2_vis = arr1, arr2
 
         return {
             "score": score,
             "total_kp1": len(kp1),
             "total_kp2": len(kp2),
             "good_matches": len(good_matches),
-            "match_image": match_pil
+            "match_image": None,
+            "_match_data": (img1_vis, kp1, img2_vis, kp2, good_matches_sorted[:100]),  # En iyi 100 eşleşme
+        }
+
+    def _pyramid_down(self, gray, max_side):
+        """Görseli uzun kenarı max_side altına inene kadar pyrDown ile yarılar."""
+        while max(gray.shape[:2]) > max_side:
+            gray = cv2.pyrDown(gray)
+        return gray
+
+    def compare_files(self, path1, path2, profile=DEFAULT_PROFILE, cancel_event=None, auto_orient=True):
+        """
+        İki dosyayı arayüz olmadan tüm sayfalarıyla karşılaştırır.
+        Döndürür: (sayfa sırasına göre sonuçlar, sonuç üretmeyen sayfa indeksleri)
+        cancel_event set edilirse bir sonraki aşama sınırında CompareCancelled fırlatılır.
+        auto_orient: taranmış girdilerde yön/eğrilik düzeltmesi (bkz. PageSource.auto_orient).
+        """
+        left, right = PageSource(path1, profile), PageSource(path2, profile)
+        try:
+            if auto_orient:
+                left.auto_orient()
+                right.auto_orient()
+            job = CompareJob(max(left.total_pages, right.total_pages), COMPARE_STAGES, cancel_event=cancel_event)
+            self._compare_all_pages(job, left, right)
+            return sorted(job.results, key=lambda r: r["page_num"]), job.skipped
+        finally:
+            left.close()
+            right.close()
+
+    def _compare_all_pages(self, job, left, right):
+        """Job'daki sayfaları sırayla karşılaştırır; sonuçlar job.results'a eklenir."""
+        governor = self.memory_governor
+        if governor is not None:
+            # FilePanel'in önbelleği kaynağındadır
+            governor.track(renders=[getattr(side, "source", side) for side in (left, right)], results=[job])
+        # Düşürülen çözünürlük sadece bu işe aittir: panel profilleri iş bitince eski ölçeğine döner
+        profiles = [left.render_profile, right.render_profile]
+        saved_scales = [profile.pixel_scale for profile in profiles]
+        try:
+            # Sıra job'dan alınır: arayüzde seçilen bekleyen sayfa öne geçer
+            while True:
+                i = job.next_page()
+                if i is None:
+                    break
+                if governor is not None:
+                    # Bütçe aşılıyorsa önbellek boşaltma / sıkıştırma / çözünürlük düşürme burada olur
+                    scale = governor.admit_page()
+                    for profile in profiles:
+                        profile.pixel_scale = scale
+                job.begin_page(i)
+                # Sayfa ihtiyacı tepe RSS'ten ölçülür: SSIM/OCR/feature ara dizileri aşama sonunda bırakılır
+                with PeakRss() as peak:
+                    result = self._compare_page(i, job, left, right)
+                job.end_page(result)
+                if governor is not None and result is not None:
+                    governor.note_page_footprint(peak.delta)
+        finally:
+            for profile, scale in zip(profiles, saved_scales):
+                profile.pixel_scale = scale
+
+    def _compare_page(self, i, job, left, right):
+        """
+        Tek sayfayı tüm aşamalardan geçirir; sayfa yoksa None döndürür.
+        left/right: FilePanel (seçim destekli) veya PageSource (toplu iş).
+        """
+        # --- 0. Vektör karşılaştırma (iki taraf da PDF ve seçim yoksa) ---
+        job.begin_stage("vector")
+        vector_result = None
+        content1 = content2 = None
+        use_vector = self.vector_mode and not (left.selection_coords or right.selection_coords)
+        if use_vector:
+            content1 = left.get_vector_content(i)
+            content2 = right.get_vector_content(i)
+            if content1 is not None and content2 is not None:
+                vector_result = compare_page_content(content1, content2)
+
+        # --- 0b. Gömülü görseller: ham akış (gerekirse çözümlenmiş piksel) özeti ---
+        job.begin_stage("images")
+        image_result = None
+        if not (left.selection_coords or right.selection_coords):
+            entries1 = left.get_image_entries(i)
+            entries2 = right.get_image_entries(i)
+            if entries1 is not None and entries2 is not None and (entries1 or entries2):
+                image_result = compare_images(
+                    entries1, entries2,
+                    left.decoded_image_digest, right.decoded_image_digest
+                )
+                if vector_result is not None:
+                    # Aynı görseller vektör sonucunda piksel karşılaştırması gerektirmez
+                    prune_raster_regions(vector_result, image_result)
+
+        job.begin_stage("render")
+        # İlgili sayfa dizilerini al (ROI Desteği)
+        # Seçim varsa onu kullan, yoksa aşamaya uygun çözünürlükte tam sayfayı
+        raw1 = left.get_compare_array(i, "diff")
+        raw2 = right.get_compare_array(i, "diff")
+
+        if raw1 is None or raw2 is None:
+            # Sayfa sayısı uyuşmazlığı varsa boş geçebiliriz veya uyarı verebiliriz
+            # Şimdilik devam, olmayan sayfaNone döner
+            return None
+
+        # Ortak genişliğe bir kez normalize et; gri kopyayı diff ve SSIM paylaşır
+        img1, img2 = self._normalize_images(raw1, raw2)
+        gray1, gray2 = to_gray(img1), to_gray(img2)
+        # Kaba diziler: vektör sonucunun raster kontrolü, renk ve feature aşamaları
+        tri1 = left.get_compare_array(i, "triage")
+        tri2 = right.get_compare_array(i, "triage")
+
+        # --- 1. Görsel (Piksel) Karşılaştırma ---
+        job.begin_stage("diff")
+        regions, vector_boxes, ignore, text_boxes = None, None, None, None
+        if vector_result is not None or image_result is not None:
+            # Sayfa koordinatı -> diff render -> normalize ölçeği
+            s1 = img1.shape[1] / raw1.shape[1]
+            s2 = img2.shape[1] / raw2.shape[1]
+            mat1 = left.page_to_pixel_matrix(i, "diff") * fitz.Matrix(s1, s1)
+            mat2 = right.page_to_pixel_matrix(i, "diff") * fitz.Matrix(s2, s2)
+            width = max(img1.shape[1], img2.shape[1])
+            height = max(img1.shape[0], img2.shape[0])
+            if vector_result is not None:
+                vector_boxes, regions = self._map_vector_result(vector_result, mat1, mat2, width, height)
+                if regions is not None:
+                    # İçerik listesi kırpma yolu, gölgelendirme, not, katman görünürlüğü gibi
+                    # farkları göstermez: açıklanmayan alanlar piksel karşılaştırmasına eklenir
+                    extra = self._unexplained_boxes(tri1, tri2, width, height, vector_boxes + regions)
+                    if extra:
+                        regions.extend(extra)
+                        inv1, inv2 = ~mat1, ~mat2
+                        add_unexplained_regions(vector_result, [
+                            (fitz.Rect(x, y, x + w, y + h) * inv1, fitz.Rect(x, y, x + w, y + h) * inv2)
+                            for x, y, w, h in extra
+                        ])
+            if image_result is not None:
+                ignore = self._map_image_result(image_result, mat1, mat2, width, height)
+            if vector_result is not None:
+                # Bölge sınıflandırması için iki tarafın metin span'ları
+                text_boxes = []
+                for content, mat in ((content1, mat1), (content2, mat2)):
+                    for span in content["spans"]:
+                        box = rect_to_pixels(span["rect"], mat, width, height, pad=0)
+                        if box:
+                            text_boxes.append(box)
+        diff_image, differences, img1_norm, img2_norm, magnitude = self._find_visual_differences(
+            img1, img2, grays=(gray1, gray2), regions=regions, extra_boxes=vector_boxes, ignore=ignore
+        )
+        # Hassasiyet ayarı için eşiklenmemiş harita ve kutu girdileri saklanır
+        diff_map = {
+            "magnitude": Image.fromarray(magnitude) if magnitude is not None else None,
+            "extra_boxes": list(vector_boxes or []),
+            "merge": self.merge_preset,
+            "text_boxes": text_boxes,
+            "sensitivity": default_sensitivity(self.diff_tolerance),
         }
+        diff_classes = classify_regions(differences, to_rgb(img1), to_rgb(img2), gray1, gray2, text_boxes)
+
+        # --- 2. Metin (OCR) Karşılaştırma ---
+        job.begin_stage("ocr")
+        # PaddleOCR renkli görsel ister, Tesseract yolu doğrudan gri pixmap alır
+        ocr_gray = not PADDLE_SUPPORT
+        text1 = self._extract_text(left.get_compare_array(i, "ocr", gray=ocr_gray))
+        job.check()
+        text2 = self._extract_text(right.get_compare_array(i, "ocr", gray=ocr_gray))
+
+        # _compare_texts artık tüm bilgileri içeren bir sözlük döndürüyor
+        text_result = self._compare_texts(text1, text2)
+
+        # --- 3. SSIM ---
+        job.begin_stage("ssim")
+        score, ssim_diff = self._compute_ssim(gray1, gray2)
+        ssim_result = {"score": score, "diff_image": ssim_diff}
+
+        # 4. Color (kaba metrikler düşük çözünürlükte yeterli)
+        job.begin_stage("color")
+        overall, channels = self._compare_colors(tri1, tri2)
+        color_result = {"overall": overall, "channels": channels}
+
+        # 5. Feature matching
+        job.begin_stage("feature")
+        feature_result = self._feature_matching(tri1, tri2)
+
+        return {
+            "page_num": i + 1,
+            "diff_image": diff_image,
+            "differences": differences,
+            "diff_classes": diff_classes,
+            "diff_map": diff_map,
+            "img1_norm": img1_norm,
+            "img2_norm": img2_norm,
+            "text_result": text_result,
+            "ssim_result": ssim_result,
+            "color_result": color_result,
+            "feature_result": feature_result,
+            "vector_result": vector_result,
+            "image_result": image_result,
+        }
+
+
+class PixelCompareFrame(CompareAnalyzer, tk.Frame):
+    def __init__(self, parent, on_back=None):
+        super().__init__(parent, bg="#121212")
+        self.on_back = on_back
+        self.batch_view = None
+        self.history_view = None
+
+        # Header
+        self._init_ui()
+        self.memory_governor = MemoryGovernor()
+        self._init_result_store()
+        self._init_batch_queue()
+        self._init_folder_watch()
+        self.bind("<Destroy>", self._on_destroy)
+
+    def _init_ui(self):
+        self.container = tk.Frame(self)
+        self.container.pack(fill=tk.BOTH, expand=True)
+
+        self.selection_view = tk.Frame(self.container, bg="#121212")
+        self.selection_view.pack(fill=tk.BOTH, expand=True)
+
+        # Üst Header
+        header = tk.Frame(self.selection_view, bg="#1f1f1f", height=60, padx=20)
+        header.pack(fill=tk.X)
+        
+        tk.Button(
+            header, text="← Ana Sayfa", font=("Segoe UI", 10, "bold"),
+            bg="#C0392B", fg="white", relief=tk.FLAT, padx=12, pady=4,
+            cursor="hand2", command=self._go_home
+        ).pack(side=tk.LEFT, pady=10, padx=(0, 15))
+        
+        tk.Label(
+            header, text="Pixel Compare",
+            font=("Segoe UI", 20, "bold"), bg="#1f1f1f", fg="#ffffff"
+        ).pack(side=tk.LEFT, pady=10)
+
+        # Kontrol Butonları
+        controls = tk.Frame(self.selection_view, bg="#121212", pady=10)
+        controls.pack(fill=tk.X, padx=20)
+
+        # Tekil Dosya Seçimi Butonu (Multi-modal)
+        self.multi_select_btn = tk.Button(
+            controls, text="📁 Dosya Seç", font=("Segoe UI", 11),
+            bg="#ffffff", fg="#0078d4", activebackground="#f0f0f0",
+            relief=tk.FLAT, padx=15, pady=5, cursor="hand2",
+            command=self._select_files_multi
+        )
+        self.multi_select_btn.pack(side=tk.LEFT, padx=5)
+
+        self.clear_all_btn = tk.Button(
+            controls, text="🧹 Tümünü Temizle", font=("Segoe UI", 10),
+            bg="#005a9e", fg="white", activebackground="#004a80",
+            relief=tk.FLAT, padx=12, pady=5, cursor="hand2",
+            command=self._clear_all
+        )
+        self.clear_all_btn.pack(side=tk.LEFT, padx=5)
+
+        # Klasör-klasör toplu karşılaştırma
+        tk.Button(
+            controls, text="🗂 Klasör Karşılaştır", font=("Segoe UI", 10),
+            bg="#005a9e", fg="white", activebackground="#004a80",
+            relief=tk.FLAT, padx=12, pady=5, cursor="hand2",
+            command=self._show_batch_view
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Kayıtlı sonuçlar
+        tk.Button(
+            controls, text="🕘 Geçmiş", font=("Segoe UI", 10),
+            bg="#005a9e", fg="white", activebackground="#004a80",
+            relief=tk.FLAT, padx=12, pady=5, cursor="hand2",
+            command=self._show_history
+        ).pack(side=tk.LEFT, padx=5)
 
+        # Kalite/performans profili (render çözünürlüğü)
+        tk.Label(
+            controls, text="Profil:", font=("Segoe UI", 10),
+            bg="#121212", fg="#bbbbbb"
+        ).pack(side=tk.LEFT, padx=(15, 2))
+        self.profile_var = tk.StringVar(value=DEFAULT_PROFILE)
+        profile_box = ttk.Combobox(
+            controls, textvariable=self.profile_var, values=list(RENDER_PROFILES),
+            state="readonly", width=10
+        )
+        profile_box.pack(side=tk.LEFT, padx=5)
+        profile_box.bind("<<ComboboxSelected>>", self._on_profile_change)
 
+        # Fark kutusu birleştirme (boşluk toleransı)
+        tk.Label(
+            controls, text="Birleştirme:", font=("Segoe UI", 10),
+            bg="#121212", fg="#bbbbbb"
+        ).pack(side=tk.LEFT, padx=(15, 2))
+        self.merge_var = tk.StringVar(value=self.merge_preset)
+        merge_box = ttk.Combobox(
+            controls, textvariable=self.merge_var, values=list(MERGE_PRESETS),
+            state="readonly", width=8
+        )
+        merge_box.pack(side=tk.LEFT, padx=5)
+        merge_box.bind("<<ComboboxSelected>>", self._on_merge_change)
+
+        # Piksel farkı toleransı (kenar yumuşatma / alt-piksel kayma)
+        tk.Label(
+            controls, text="Tolerans:", font=("Segoe UI", 10),
+            bg="#121212", fg="#bbbbbb"
+        ).pack(side=tk.LEFT, padx=(15, 2))
+        self.tolerance_var = tk.StringVar(value=self.diff_tolerance)
+        tolerance_box = ttk.Combobox(
+            controls, textvariable=self.tolerance_var, values=list(DIFF_TOLERANCES),
+            state="readonly", width=8
+        )
+        tolerance_box.pack(side=tk.LEFT, padx=5)
+        tolerance_box.bind("<<ComboboxSelected>>", self._on_tolerance_change)
+
+        # Tek bir karşılaştırma için cProfile kaydı
+        self.profile_job_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            controls, text="cProfile", variable=self.profile_job_var,
+            font=("Segoe UI", 10), bg="#121212", fg="#bbbbbb",
+            selectcolor="#333333", activebackground="#121212", activeforeground="white"
+        ).pack(side=tk.LEFT, padx=(15, 5))
+
+        # PDF çiftlerinde önce vektör karşılaştırma (piksel farkı sadece gerekirse)
+        self.vector_mode_var = tk.BooleanVar(value=self.vector_mode)
+        tk.Checkbutton(
+            controls, text="Vektör", variable=self.vector_mode_var,
+            font=("Segoe UI", 10), bg="#121212", fg="#bbbbbb",
+            selectcolor="#333333", activebackground="#121212", activeforeground="white"
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Taranmış dosyalarda otomatik yön / eğrilik düzeltmesi (yüklemede uygulanır)
+        self.auto_orient_var = tk.BooleanVar(value=FilePanel.auto_orient)
+        tk.Checkbutton(
+            controls, text="Oto. Yön", variable=self.auto_orient_var,
+            font=("Segoe UI", 10), bg="#121212", fg="#bbbbbb",
+            selectcolor="#333333", activebackground="#121212", activeforeground="white",
+            command=self._on_auto_orient_change
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Ana içerik
+        content = tk.Frame(self.selection_view, bg="#121212")
+        content.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+        # Sol panel (Master)
+        self.left_panel = FilePanel(content, title="📄 Master")
+        self.left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Master Selection Controls
+        left_controls = tk.Frame(content, bg="#121212")
+        left_controls.pack(side=tk.LEFT, fill=tk.Y)
+        
+        tk.Button(left_controls, text="⛶ Bölge Seç", bg="#333333", fg="white", 
+                  command=self.left_panel.enable_selection).pack(fill=tk.X, pady=2)
+        tk.Button(left_controls, text="❌ Temizle", bg="#333333", fg="white", 
+                  command=self.left_panel.clear_selection).pack(fill=tk.X, pady=2)
+
+
+        # Orta — Compare butonu
+        middle = tk.Frame(content, bg="#121212", width=80)
+        middle.pack(side=tk.LEFT, fill=tk.Y, padx=4)
+        middle.pack_propagate(False)
+
+        spacer = tk.Frame(middle, bg="#121212")
+        spacer.pack(expand=True)
+
+        self.compare_btn = tk.Button(
+            middle,
+            text="⚡\nCompare",
+            font=("Segoe UI", 11, "bold"),
+            bg="#ff6b35", fg="white",
+            activebackground="#e55a2b", activeforeground="white",
+            relief=tk.FLAT, padx=8, pady=16,
+            cursor="hand2",
+            command=self._compare
+        )
+        self.compare_btn.pack(pady=4)
+
+        # Swap butonu
+        self.swap_btn = tk.Button(
+            middle,
+            text="⇄\nSwap",
+            font=("Segoe UI", 9),
+            bg="#555555", fg="white",
+            activebackground="#777777",
+            relief=tk.FLAT, padx=8, pady=8,
+            cursor="hand2",
+            command=self._swap_panels
+        )
+        self.swap_btn.pack(pady=4)
+
+        # İptal butonu (sadece karşılaştırma sürerken aktif)
+        self.cancel_btn = tk.Button(
+            middle,
+            text="✖\nİptal",
+            font=("Segoe UI", 9),
+            bg="#555555", fg="white",
+            activebackground="#C0392B",
+            relief=tk.FLAT, padx=8, pady=8,
+            cursor="hand2", state=tk.DISABLED,
+            command=self._cancel_compare
+        )
+        self.cancel_btn.pack(pady=4)
+
+        # Print Selection Controls
+        right_controls = tk.Frame(content, bg="#121212")
+        right_controls.pack(side=tk.LEFT, fill=tk.Y)
+        
+        # Use lambda to delay evaluation of self.right_panel until click
+        tk.Button(right_controls, text="⛶ Bölge Seç", bg="#333333", fg="white", 
+                  command=lambda: self.right_panel.enable_selection()).pack(fill=tk.X, pady=2)
+        tk.Button(right_controls, text="❌ Temizle", bg="#333333", fg="white", 
+                  command=lambda: self.right_panel.clear_selection()).pack(fill=tk.X, pady=2)
+
+        # Sağ panel (Print)
+        self.right_panel = FilePanel(content, title="📄 Print")
+        self.right_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        for panel in (self.left_panel, self.right_panel):
+            panel.busy_check = self._compare_running
+
+        # Alt durum çubuğu
+        self.status_var = tk.StringVar(value="Karşılaştırmak için her iki panele de dosya yükleyin.")
+        status_bar = tk.Label(
+            self.selection_view, textvariable=self.status_var,
+            font=("Segoe UI", 9), bg="#252525", fg="#888888",
+            anchor=tk.W, padx=12, pady=4
+        )
+        status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+
+        # İlerleme çubuğu (sayfa + aşama bazlı)
+        self.progress_var = tk.DoubleVar(value=0.0)
+        self.progress_bar = ttk.Progressbar(
+            self.selection_view, variable=self.progress_var, maximum=1.0, mode="determinate"
+        )
+        self.progress_bar.pack(fill=tk.X, side=tk.BOTTOM)
+        self.compare_job = None
+        self._deferred_compare = None
+
+    def _select_files_multi(self):
+        """Kullanıcının 1 veya 2 dosya seçmesine izin verir."""
+        files = filedialog.askopenfilenames(
+            title="Dosya Seç (1 veya 2 adet)",
+            filetypes=[("Desteklenenler", "*.png;*.jpg;*.jpeg;*.bmp;*.tif;*.tiff;*.pdf"), ("Tüm Dosyalar", "*.*")]
+        )
+        if not files or self._compare_running(): return
+
+        if len(files) == 1:
+            # Tek dosya -> Boş olana yükle
+            if not self.left_panel.file_path:
+                self.left_panel.load_file(files[0])
+            elif not self.right_panel.file_path:
+                self.right_panel.load_file(files[0])
+            else:
+                # İkisi de doluysa -> Solu ez (kullanıcı soldan başlar mantığı)
+                self.left_panel.load_file(files[0])
+        elif len(files) >= 2:
+            # İki dosya -> Sırayla yükle
+            self.left_panel.load_file(files[0])
+            self.right_panel.load_file(files[1])
+            if len(files) > 2:
+                messagebox.showinfo(
+                    "Bilgi", "Sadece ilk 2 dosya yüklendi. Çok sayıda dosya için 'Klasör Karşılaştır' kullanın."
+                )
+        
+        self._update_status()
+
+    def _clear_all(self):
+        """Her şeyi temizle."""
+        if self._compare_running():
+            return
+        # Belgeler hemen kapatılır (GC'ye bırakılmaz)
+        for panel in [self.left_panel, self.right_panel]:
+            panel.reset(self.profile_var.get())
+        
+        self._update_status()
+
+    def _on_profile_change(self, event=None):
+        if self._compare_running():
+            # Seçim geri alınır; profil iş bitince değiştirilebilir
+            self.profile_var.set(self.left_panel.render_profile.name)
+            return
+        name = self.profile_var.get()
+        for panel in [self.left_panel, self.right_panel]:
+            panel.set_render_profile(name)
+        diff_dpi, _ = self.left_panel.render_profile.dpi_and_budget("diff")
+        ocr_dpi, _ = self.left_panel.render_profile.dpi_and_budget("ocr")
+        self.status_var.set(f"Profil: {name} (fark {diff_dpi} DPI, OCR {ocr_dpi} DPI)")
+
+    def _on_merge_change(self, event=None):
+        self.merge_preset = self.merge_var.get()
+        gaps = MERGE_PRESETS.get(self.merge_preset)
+        if gaps:
+            self.status_var.set(f"Fark birleştirme: {self.merge_preset} (boşluk {gaps[0]}x{gaps[1]} px)")
+        else:
+            self.status_var.set("Fark birleştirme kapalı.")
+
+    def _on_tolerance_change(self, event=None):
+        self.diff_tolerance = self.tolerance_var.get()
+        params = DIFF_TOLERANCES.get(self.diff_tolerance)
+        if params:
+            self.status_var.set(
+                f"Fark toleransı: {self.diff_tolerance} (kayma {params[0]} px, yoğunluk {params[1]})"
+            )
+        else:
+            self.status_var.set("Fark toleransı kapalı (doğrudan piksel farkı).")
+
+    def _on_auto_orient_change(self):
+        enabled = self.auto_orient_var.get()
+        for panel in [self.left_panel, self.right_panel]:
+            panel.auto_orient = enabled
+        if enabled:
+            self.status_var.set("Taranmış dosyalarda yön ve eğrilik yüklemede otomatik düzeltilir.")
+        else:
+            self.status_var.set("Otomatik yön düzeltmesi kapalı (sonraki yüklemelerde).")
+
+    def _update_status(self):
+        l = bool(self.left_panel.file_path)
+        r = bool(self.right_panel.file_path)
+        if l and r:
+            self.status_var.set("Karşılaştırma hazır. 'Compare' butonuna basın.")
+        elif l or r:
+            self.status_var.set("Bir dosya daha seçin.")
+        else:
+            self.status_var.set("Dosya seçilmedi.")
+
+    def _compare(self):
+        if not self.left_panel.file_path or not self.right_panel.file_path:
+            messagebox.showwarning("Uyarı", "Lütfen iki dosya seçin.")
+            return
+        if self.compare_job and not self.compare_job.finished:
+            return
+        if self.left_panel.orienting or self.right_panel.orienting:
+            # Rotasyon kayıt anahtarına ve render'lara girer: yön tespiti bitince kendiliğinden başlar
+            self.status_var.set("Taranmış sayfanın yönü tespit ediliyor, karşılaştırma birazdan başlayacak...")
+            if self._deferred_compare is None:
+                self._deferred_compare = self.after(100, self._run_deferred_compare)
+            return
+
+        # Sayfa sayılarını kontrol et
+        left_pages = self.left_panel.get_total_pages()
+        right_pages = self.right_panel.get_total_pages()
+        total_pages = max(left_pages, right_pages)
+
+        # Aynı içerik ve ayarlarla daha önce karşılaştırıldıysa kayıtlı sonuç önerilir
+        store_request = self._store_request()
+        if store_request is not None:
+            found = self.result_store.lookup(*store_request[2:])
+            if found is not None and messagebox.askyesno(
+                "Kayıtlı Sonuç",
+                "Bu dosya çifti aynı ayarlarla "
+                f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(found['created']))} tarihinde karşılaştırılmış.\n"
+                "Kayıtlı sonuç açılsın mı? (Hayır: yeniden hesapla)"
+            ):
+                self._show_history(focus_id=found["id"])
+                return
+
+        job = CompareJob(total_pages, COMPARE_STAGES)
+        self.compare_job = job
+        self.vector_mode = self.vector_mode_var.get()
+        self._delivered_results = 0
+        self._compare_started = time.time()
+        self.status_var.set("Karşılaştırılıyor... Lütfen bekleyin.")
+        self.compare_btn.config(state=tk.DISABLED, text="Wait...")
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.progress_var.set(0.0)
+
+        # Sonuç ekranı hemen açılır, sayfalar hazır oldukça dolar
+        self._close_results_view()
+        self.selection_view.pack_forget()
+        self.results_view = DiffResultWindow(
+            self.container, [], on_back=self._show_selection, total_pages=total_pages,
+            on_page_request=job.prioritize, on_cancel=self._cancel_compare,
+            thumb_source=(self.left_panel.file_path, left_pages, self.left_panel.rotation),
+            analyzer=self, sensitivity=default_sensitivity(self.diff_tolerance),
+        )
+        self.results_view.pack(fill=tk.BOTH, expand=True)
+
+        # Hesaplama ayrı thread'de; arayüz _poll_compare_job ile güncellenir
+        profile = self.profile_job_var.get()
+        threading.Thread(target=self._run_compare_job, args=(job, profile, store_request), daemon=True).start()
+        self.after(100, self._poll_compare_job)
+
+    def _run_deferred_compare(self):
+        self._deferred_compare = None
+        # Bu arada paneller boşaltıldıysa uyarı gösterilmez
+        if self.left_panel.file_path and self.right_panel.file_path:
+            self._compare()
+
+    def _run_compare_job(self, job, profile=False, store_request=None):
+        """
+        İşçi thread: sayfaları sırayla karşılaştırır, sonuçları job.results'a ekler.
+        profile=True ise iş cProfile ile izlenir ve .prof dosyası job.profile_path'e yazılır.
+        store_request verilmişse tamamlanan iş sonuç kaydına yazılır.
+        """
+        profiler = None
+        if profile:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            self._compare_all_pages(job, self.left_panel, self.right_panel)
+            if store_request is not None and job.results:
+                self._save_results(store_request, job.results, job.skipped)
+            job.finish()
+        except CompareCancelled:
+            job.finish()
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            job.finish(error=e)
+        finally:
+            if profiler:
+                profiler.disable()
+                path = os.path.join(tempfile.gettempdir(), f"pixel_compare_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+                profiler.dump_stats(path)
+                job.profile_path = path
+
+    def _init_result_store(self):
+        try:
+            self.result_store = ResultStore()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Sonuç kaydı açılamadı: {e}")
+            self.result_store = None
+
+    def _store_request(self):
+        """
+        Paneldeki çift için kayıt anahtarı bilgileri:
+        (master yolu, print yolu, master özeti, print özeti, ayarlar).
+        Bölge seçimi varsa (kısmi sonuç) veya kayıt yoksa None.
+        """
+        left, right = self.left_panel, self.right_panel
+        if self.result_store is None or left.selection_coords or right.selection_coords:
+            return None
+        try:
+            digests = file_digest(left.file_path), file_digest(right.file_path)
+        except OSError:
+            return None
+        settings = compare_settings(
+            self.profile_var.get(), self.merge_var.get(), self.vector_mode_var.get(),
+            ((left.rotation, left.skew), (right.rotation, right.skew)), self.tolerance_var.get()
+        )
+        return (left.file_path, right.file_path, *digests, settings)
+
+    def _save_results(self, store_request, page_results, skipped, summary=None):
+        """Sonuçları kayda yazar; kayıt hatası karşılaştırmayı bozmaz."""
+        page_results = sorted(page_results, key=lambda r: r["page_num"])
+        summary = summary or summarize_page_results(page_results)
+        summary["skipped"] = [i + 1 for i in skipped]
+        try:
+            self.result_store.save(*store_request, page_results, summary=summary)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Sonuç kaydedilemedi: {e}")
+        return summary
+
+    def _show_history(self, focus_id=None):
+        if self.result_store is None:
+            messagebox.showwarning("Uyarı", "Sonuç kaydı açılamadı; geçmiş kullanılamıyor.")
+            return
+        self._close_results_view()
+        self._close_history_view()
+        self.selection_view.pack_forget()
+        self.history_view = HistoryView(
+            self.container, self.result_store, on_back=self._close_history_view,
+            on_open_pair=self._open_history_pair, focus_id=focus_id
+        )
+        self.history_view.pack(fill=tk.BOTH, expand=True)
+
+    def _close_history_view(self):
+        if self.history_view is not None:
+            self.history_view.destroy()
+            self.history_view = None
+            self.selection_view.pack(fill=tk.BOTH, expand=True)
+
+    def _open_history_pair(self, master_path, print_path):
+        if self._compare_running():
+            return
+        self._close_history_view()
+        self.left_panel.load_file(master_path)
+        self.right_panel.load_file(print_path)
+        self._update_status()
+
+    def _cancel_compare(self):
+        """Çalışan karşılaştırmayı bir sonraki aşama sınırında durdurur."""
+        if self.compare_job and not self.compare_job.finished:
+            self.compare_job.cancel()
+            self.cancel_btn.config(state=tk.DISABLED)
+            text = "İptal ediliyor... (mevcut aşama bitince durur)"
+            self.status_var.set(text)
+            if self._results_view_alive():
+                self.results_view.set_progress(text)
+
+    def _deliver_results(self, job):
+        """Job'ın yeni bitirdiği sayfaları sonuç ekranına aktarır."""
+        new_results, skipped = job.results_since(self._delivered_results)
+        self._delivered_results += len(new_results)
+        if not self._results_view_alive():
+            return
+        for res in new_results:
+            self.results_view.add_page_result(res)
+        for page_idx in skipped:
+            self.results_view.mark_page_missing(page_idx)
+
+    def _poll_compare_job(self):
+        job = self.compare_job
+        if job is None:
+            return
+        snap = job.snapshot()
+        self.progress_var.set(snap["progress"])
+        self._deliver_results(job)
+
+        if not snap["finished"]:
+            if not snap["cancelled"] and snap["page"]:
+                eta = snap["eta"]
+                eta_text = ""
+                if eta is not None:
+                    eta_text = f" • kalan ~{int(eta)} sn" if eta < 90 else f" • kalan ~{int(eta / 60)} dk"
+                text = (
+                    f"Sayfa {snap['page']}/{snap['total_pages']} • "
+                    f"{STAGE_LABELS.get(snap['stage'], snap['stage'])}{eta_text}"
+                )
+                memory_note = self.memory_governor.last_event(since=self._compare_started)
+                if memory_note:
+                    text += f" • bellek: {memory_note}"
+                self.status_var.set(text)
+                if self._results_view_alive():
+                    self.results_view.set_progress(f"{snap['pages_done']}/{snap['total_pages']} sayfa hazır\n{text}")
+            self.after(100, self._poll_compare_job)
+            return
+
+        self._finish_compare(job)
+
+    def _finish_compare(self, job):
+        """İş bittiğinde (tamamlandı, iptal edildi veya hata) durumu sonuç ekranına yansıtır."""
+        self.compare_btn.config(state=tk.NORMAL, text="Compare")
+        self.cancel_btn.config(state=tk.DISABLED)
+        self._deliver_results(job)
+        page_results = sorted(job.results, key=lambda r: r["page_num"])
+
+        if job.error is not None:
+            messagebox.showerror("Hata", f"Karsilastirma basarisiz:\n{job.error}")
+            text = f"Karsilastirma basarisiz: {job.error}"
+        elif not page_results:
+            text = "Karşılaştırma iptal edildi." if job.cancelled else "Sayfalar render edilemedi."
+        elif job.cancelled:
+            text = f"Karşılaştırma iptal edildi. Tamamlanan {len(page_results)}/{job.total_pages} sayfa gösteriliyor."
+        else:
+            text = f"Karsilastirma tamamlandi. {len(page_results)} sayfa analiz edildi."
+        if job.profile_path:
+            text += f" Profil: {job.profile_path}"
+        memory_note = self.memory_governor.last_event(since=self._compare_started)
+        if memory_note:
+            text += f" Bellek: {memory_note}"
+        self.status_var.set(text)
+
+        if not page_results:
+            # Gösterilecek sonuç yok: seçim ekranına dön
+            if not job.cancelled and job.error is None:
+                messagebox.showwarning("Hata", "Sayfalar render edilemedi.")
+            self._show_selection()
+            return
+
+        if self._results_view_alive():
+            self.results_view.set_progress(text, running=False)
+
+        # İlk sayfadaki farkları ana ekrandaki panellere de yansıt
+        first_res = page_results[0]
+        img1_norm, img2_norm = result_image(first_res, "img1_norm"), result_image(first_res, "img2_norm")
+        # Normalize edilmiş görselleri ve farkları panel'e gönder
+        if img1_norm and img2_norm:
+             self.left_panel.show_diffs(img1_norm, first_res["differences"])
+             self.right_panel.show_diffs(img2_norm, first_res["differences"])
+
+    def _results_view_alive(self):
+        return getattr(self, "results_view", None) is not None and self.results_view.winfo_exists()
+
+    def _close_results_view(self):
+        if getattr(self, "results_view", None) is not None:
+            self.results_view.destroy()
+            self.results_view = None
+        self._sensitivity_inputs = None # Hassasiyet için çözülmüş sayfa dizileri bırakılır
+
+    def _show_selection(self):
+        """Sonuç ekranını kapat ve seçim ekranını göster"""
+        # Sonuç ekranından geri dönülürse süren karşılaştırma da durdurulur
+        if self.compare_job and not self.compare_job.finished:
+            self._cancel_compare()
+        self._close_results_view()
+        self.selection_view.pack(fill=tk.BOTH, expand=True)
 
     def _swap_panels(self):
         """Sol ve sağ paneldeki dosyaları yer değiştirir."""
-        path1 = self.left_panel.file_path
-        path2 = self.right_panel.file_path
-        
-        # Temizleyip yeniden yükle
-        self.left_panel.file_path = None
-        self.right_panel.file_path = None
-        self.left_panel.file_label.config(text="Dosya seçilmedi", fg="#666666")
-        self.right_panel.file_label.config(text="Dosya seçilmedi", fg="#666666")
-        self.left_panel.canvas.delete("all")
-        self.right_panel.canvas.delete("all")
-
-        if path2: self.left_panel.load_file(path2)
-        if path1: self.right_panel.load_file(path1)
+        if self._compare_running():
+            return
+        # Belgeler yeniden açılmaz: durum nesneleri paneller arasında taşınır
+        self.left_panel.exchange_state(self.right_panel)
+        self._update_status()
+
+    def _compare_running(self):
+        """Karşılaştırma sürerken (iptal edilmiş olsa bile) panel belgeleri değiştirilmez."""
+        if self.compare_job and not self.compare_job.finished:
+            self.status_var.set("Karşılaştırma bitmeden dosyalar değiştirilemez.")
+            return True
+        return False
+
+    def _init_batch_queue(self):
+        """Kalıcı iş kuyruğunu açar; önceki oturumdan kalan işler varsa devam eder."""
+        self.batch_runner = None
+        self._batch_local = threading.local()
+        try:
+            self.batch_queue = BatchQueue()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Toplu iş kuyruğu açılamadı: {e}")
+            self.batch_queue = None
+            return
+        self.batch_runner = BatchRunner(self.batch_queue, self._batch_analyze, governor=self.memory_governor)
+        interrupted = self.batch_queue.requeue_interrupted()
+        pending = self.batch_queue.counts().get("pending", 0)
+        if pending:
+            self.batch_runner.start()
+            note = f" ({interrupted} yarım kalan dahil)" if interrupted else ""
+            self.status_var.set(
+                f"Önceki oturumdan {pending} toplu karşılaştırma işi{note} arka planda sürdürülüyor."
+            )
+
+    def _init_folder_watch(self):
+        """Kayıtlı izleme kuralları varsa klasör izleyiciyi başlatır."""
+        self.folder_watcher = None
+        self.watch_rules = load_watch_config()
+        if self.watch_rules and self.batch_queue is not None:
+            self._restart_folder_watch()
+
+    def _restart_folder_watch(self):
+        if self.folder_watcher is not None:
+            self.folder_watcher.stop()
+            self.folder_watcher = None
+        if self.watch_rules:
+            self.folder_watcher = FolderWatcher(
+                self.watch_rules, self._on_watched_file, on_masters=self._on_master_change
+            )
+            self.folder_watcher.start()
+
+    def _on_watched_file(self, rule, path):
+        """İzleyici thread: yazımı biten dosyayı master'ıyla eşleyip kuyruğa ekler."""
+        if enqueue_watched_file(self.batch_queue, rule, path) is not None:
+            self.batch_runner.start()
+
+    def _on_master_change(self, rule):
+        """İzleyici thread: master klasörü değişti; master'ı beklenen print dosyaları eşlenir."""
+        if rematch_unpaired(self.batch_queue, rule):
+            self.batch_runner.start()
+
+    def _toggle_watch(self, master_dir, print_dir):
+        """
+        print klasörünü izlemeye alır veya izlemeyi bırakır; kural kalıcı kaydedilir.
+        Döndürür: (izleniyor mu, izleme toplu işinin id'si)
+        """
+        same = [r for r in self.watch_rules if r["watch_dir"] == print_dir and r["master_dir"] == master_dir]
+        if same:
+            self.watch_rules = [r for r in self.watch_rules if r not in same]
+            watching = False
+        else:
+            self.watch_rules.append({
+                "watch_dir": print_dir,
+                "master_dir": master_dir,
+                "settings": self._batch_settings(),
+            })
+            watching = True
+        save_watch_config(self.watch_rules)
+        self._restart_folder_watch()
+        if watching:
+            return True, watch_batch_id(self.batch_queue, self.watch_rules[-1])
+        return False, self.batch_queue.find_batch(master_dir, print_dir, watch=True)
+
+    def _watch_status(self):
+        if self.folder_watcher is None:
+            return ""
+        mode = self.folder_watcher.mode or "..."
+        return f"{len(self.watch_rules)} klasör izleniyor ({mode})"
+
+    def _batch_status(self):
+        """Toplu iş ekranının durum satırına eklenen bilgi: izlenen klasörler ve son bellek eylemi."""
+        parts = [self._watch_status()]
+        memory_note = self.memory_governor.last_event(since=time.time() - MEMORY_NOTE_SECONDS)
+        if memory_note:
+            parts.append(f"bellek: {memory_note}")
+        return " • ".join(p for p in parts if p)
+
+    def _batch_settings(self):
+        """Toplu / izlenen klasör işlerine yazılan karşılaştırma ayarları (arayüzdeki seçimler)."""
+        return {
+            "profile": self.profile_var.get(),
+            "merge": self.merge_var.get(),
+            "vector": self.vector_mode_var.get(),
+            "orient": self.auto_orient_var.get(),
+            "tolerance": self.tolerance_var.get(),
+        }
+
+    def _batch_analyze(self, job, cancel_event):
+        """İşçi thread: kuyruktaki bir dosya çiftini karşılaştırıp kalıcı özetini döndürür."""
+        # Her işçi kendi analyzer'ını kullanır (OCR motoru thread'ler arasında paylaşılmaz)
+        analyzer = getattr(self._batch_local, "analyzer", None)
+        if analyzer is None:
+            analyzer = self._batch_local.analyzer = CompareAnalyzer()
+            analyzer.memory_governor = self.memory_governor
+        settings = job["settings"]
+        analyzer.merge_preset = settings.get("merge", DEFAULT_MERGE)
+        analyzer.vector_mode = settings.get("vector", True)
+        analyzer.diff_tolerance = settings.get("tolerance", DEFAULT_TOLERANCE)
+        profile = settings.get("profile", DEFAULT_PROFILE)
+        auto_orient = settings.get("orient", True)
+
+        # Aynı içerik ve ayarlarla yapılmış karşılaştırma varsa yeniden hesaplanmaz
+        store_request = None
+        if self.result_store is not None:
+            digests = file_digest(job["master_path"]), file_digest(job["print_path"])
+            key_settings = compare_settings(
+                profile, analyzer.merge_preset, analyzer.vector_mode,
+                orientation="auto" if auto_orient else ((0, 0.0), (0, 0.0)),
+                tolerance=analyzer.diff_tolerance
+            )
+            store_request = (job["master_path"], job["print_path"], *digests, key_settings)
+            found = self.result_store.lookup(*store_request[2:])
+            if found is not None:
+                return dict(found["summary"], cached=True)
+
+        results, skipped = analyzer.compare_files(
+            job["master_path"], job["print_path"], profile=profile, cancel_event=cancel_event,
+            auto_orient=auto_orient
+        )
+        if store_request is not None and results:
+            return self._save_results(store_request, results, skipped)
+        summary = summarize_page_results(results)
+        summary["skipped"] = [i + 1 for i in skipped]
+        return summary
+
+    def _show_batch_view(self):
+        if self.compare_job and not self.compare_job.finished:
+            self._cancel_compare()
+        self._close_results_view()
+        self.selection_view.pack_forget()
+        self.batch_view = BatchView(
+            self.container, self.batch_queue, on_start=self._start_batch,
+            on_stop=self._stop_batch, on_open_pair=self._open_batch_pair, on_back=self._close_batch_view,
+            is_running=lambda: self.batch_runner is not None and self.batch_runner.running,
+            on_toggle_watch=self._toggle_watch if self.batch_queue is not None else None,
+            watch_status=self._batch_status
+        )
+        self.batch_view.pack(fill=tk.BOTH, expand=True)
+
+    def _close_batch_view(self):
+        """Toplu ekranı kapatır; kuyruk arka planda çalışmaya devam eder."""
+        if self.batch_view is not None:
+            self.batch_view.destroy()
+            self.batch_view = None
+        self.selection_view.pack(fill=tk.BOTH, expand=True)
+
+    def _start_batch(self, folders):
+        """
+        folders=(master, print) ise klasörler eşlenip yeni toplu iş kuyruğa eklenir;
+        None ise kuyrukta bekleyen işler sürdürülür. Yeni toplu işin id'sini döndürür.
+        """
+        batch_id = None
+        if folders:
+            master_dir, print_dir = folders
+            pairs, rest_m, rest_p = pair_folders(master_dir, print_dir)
+            if not pairs:
+                messagebox.showwarning("Uyarı", "Klasörlerde eşlenebilen dosya bulunamadı.")
+            batch_id = self.batch_queue.create_batch(
+                master_dir, print_dir, pairs, rest_m, rest_p, self._batch_settings()
+            )
+        self.batch_runner.start()
+        return batch_id
+
+    def _stop_batch(self):
+        if self.batch_runner is not None:
+            self.batch_runner.stop()
+
+    def _open_batch_pair(self, master_path, print_path):
+        """Toplu sonuçtaki bir çifti normal karşılaştırma ekranına yükler."""
+        if self._compare_running():
+            return
+        self._close_batch_view()
+        self.left_panel.load_file(master_path)
+        self.right_panel.load_file(print_path)
+        self._update_status()
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            # Yarım kalan işler kuyruğa geri bırakılır, sonraki açılışta sürer
+            self._stop_batch()
+            if self.folder_watcher is not None:
+                self.folder_watcher.stop()
+
     def _go_home(self):
+        # Arka planda süren karşılaştırmayı bırakma
+        if self.compare_job and not self.compare_job.finished:
+            self.compare_job.cancel()
+        self._stop_batch()
         if self.on_back:
             self.on_back()
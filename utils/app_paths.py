@@ -0,0 +1,10 @@
+import os
+
+APP_DIR_NAME = ".pixel_compare"
+
+
+def app_data_path(*parts):
+    """Kullanıcıya özel uygulama verisi yolu (~/.pixel_compare/...); klasör yoksa oluşturulur."""
+    base = os.environ.get("PIXEL_COMPARE_HOME") or os.path.join(os.path.expanduser("~"), APP_DIR_NAME)
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, *parts)
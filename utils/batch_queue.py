@@ -0,0 +1,454 @@
+import difflib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+from utils.app_paths import app_data_path
+from utils.compare_job import CompareCancelled
+
+SUPPORTED_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+BATCH_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+GOVERNOR_WAIT = 0.5  # Bellek bütçesi doluyken boştaki işçinin tekrar deneme aralığı (sn)
+
+# Dosya adı eşleştirmesinde yok sayılan kelimeler (sürüm / taraf / kopya işaretleri)
+_NAME_STOPWORDS = {"master", "print", "baski", "onay", "final", "son", "ornek", "copy", "kopya"}
+_NAME_STOP_PATTERN = re.compile(r"^(v\d+|rev\d*|r\d+)$")  # v2, rev3
+_COPY_SUFFIX = re.compile(r"\s*\(\d+\)$")  # "dosya (1)" kopya eki; doz / parça numaraları anahtarda kalır
+_TR_FOLD = str.maketrans("ıİşŞğĞüÜöÖçÇ", "iissgguuoocc")
+
+NAME_MIN_RATIO = 0.8      # Benzer isim eşleşmesi için en az difflib oranı
+CONTENT_MIN_SCORE = 0.5   # İçerik eşleşmesi için en az benzerlik (0..1)
+
+JOB_STATUS_LABELS = {
+    "pending": "Bekliyor",
+    "running": "Çalışıyor",
+    "done": "Tamamlandı",
+    "failed": "Hata",
+    "unpaired": "Eşleşmedi",
+}
+
+
+def list_supported_files(folder):
+    """Klasördeki desteklenen dosyalar (alt klasörler hariç), ada göre sıralı."""
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(SUPPORTED_EXTENSIONS) and os.path.isfile(os.path.join(folder, name))
+    )
+
+
+def name_key(path):
+    """Dosya adını eşleştirme anahtarına indirger (küçük harf, Türkçe harf katlama, sürüm/kopya ekleri atılır)."""
+    stem = os.path.splitext(os.path.basename(path))[0].lower().translate(_TR_FOLD)
+    stem = _COPY_SUFFIX.sub("", stem)
+    tokens = re.findall(r"[a-z0-9]+", stem)
+    return " ".join(t for t in tokens if t not in _NAME_STOPWORDS and not _NAME_STOP_PATTERN.match(t))
+
+
+def _name_ratio(key1, key2):
+    """Benzer isim oranı; sayılar (doz, folyo / parça no) farklıysa benzer sayılmaz."""
+    if re.findall(r"\d+", key1) != re.findall(r"\d+", key2):
+        return 0.0
+    return difflib.SequenceMatcher(None, key1, key2).ratio()
+
+
+def content_fingerprint(path):
+    """İçerik eşleştirmesi için kaba parmak izi: PDF'te ilk sayfanın kelimeleri, görselde 16x16 gri küçük resim."""
+    try:
+        if path.lower().endswith(".pdf"):
+            with fitz.open(path) as doc:
+                if not len(doc):
+                    return None
+                words = {w[4].lower() for w in doc[0].get_text("words") if len(w[4]) > 2}
+                if words:
+                    return ("words", words)
+                pix = doc[0].get_pixmap(matrix=fitz.Matrix(0.2, 0.2), colorspace=fitz.csGRAY)
+                thumb = Image.frombytes("L", (pix.w, pix.h), pix.samples)
+        else:
+            with Image.open(path) as img:
+                img.draft("L", (64, 64))
+                thumb = img.convert("L")
+        return ("thumb", np.asarray(thumb.resize((16, 16)), dtype=np.float32))
+    except Exception:
+        return None
+
+
+def _content_score(fp1, fp2):
+    if fp1 is None or fp2 is None or fp1[0] != fp2[0]:
+        return 0.0
+    if fp1[0] == "words":
+        a, b = fp1[1], fp2[1]
+        return len(a & b) / len(a | b)
+    return 1.0 - float(np.abs(fp1[1] - fp2[1]).mean()) / 255.0
+
+
+def _greedy_pairs(left, right, score, min_score):
+    candidates = []
+    for i, a in enumerate(left):
+        for j, b in enumerate(right):
+            s = score(a, b)
+            if s >= min_score:
+                candidates.append((s, i, j))
+    candidates.sort(reverse=True)
+    used_l, used_r, pairs = set(), set(), []
+    for s, i, j in candidates:
+        if i in used_l or j in used_r:
+            continue
+        used_l.add(i)
+        used_r.add(j)
+        pairs.append((i, j))
+    return pairs
+
+
+def pair_folders(master_dir, print_dir):
+    """
+    İki klasördeki dosyaları eşler. Sıra: aynı isim anahtarı, benzer isim,
+    son olarak içerik benzerliği.
+    Döndürür: ([(master, print, yöntem), ...], eşleşmeyen_master, eşleşmeyen_print)
+    yöntem: "isim", "benzer isim" veya "içerik"
+    """
+    masters = list_supported_files(master_dir)
+    prints = list_supported_files(print_dir)
+    pairs = []
+
+    # 1. Aynı anahtar
+    by_key = {}
+    for path in prints:
+        by_key.setdefault(name_key(path), []).append(path)
+    rest_m = []
+    for path in masters:
+        candidates = by_key.get(name_key(path))
+        if candidates:
+            pairs.append((path, candidates.pop(0), "isim"))
+        else:
+            rest_m.append(path)
+    rest_p = [p for group in by_key.values() for p in group]
+
+    # 2. Benzer isim
+    keys_m = [name_key(p) for p in rest_m]
+    keys_p = [name_key(p) for p in rest_p]
+    matched = _greedy_pairs(
+        range(len(rest_m)), range(len(rest_p)),
+        lambda i, j: _name_ratio(keys_m[i], keys_p[j]), NAME_MIN_RATIO
+    )
+    pairs.extend((rest_m[i], rest_p[j], "benzer isim") for i, j in matched)
+    rest_m = [p for i, p in enumerate(rest_m) if i not in {i for i, _ in matched}]
+    rest_p = [p for j, p in enumerate(rest_p) if j not in {j for _, j in matched}]
+
+    # 3. İçerik
+    if rest_m and rest_p:
+        fps_m = [content_fingerprint(p) for p in rest_m]
+        fps_p = [content_fingerprint(p) for p in rest_p]
+        matched = _greedy_pairs(
+            range(len(rest_m)), range(len(rest_p)),
+            lambda i, j: _content_score(fps_m[i], fps_p[j]), CONTENT_MIN_SCORE
+        )
+        pairs.extend((rest_m[i], rest_p[j], "içerik") for i, j in matched)
+        rest_m = [p for i, p in enumerate(rest_m) if i not in {i for i, _ in matched}]
+        rest_p = [p for j, p in enumerate(rest_p) if j not in {j for _, j in matched}]
+
+    pairs.sort(key=lambda pair: pair[0])
+    return pairs, rest_m, rest_p
+
+
+def match_master(path, master_dir):
+    """
+    Tek bir print dosyasını master klasöründeki karşılığıyla eşler (pair_folders
+    ile aynı sıra). Döndürür: (master yolu, yöntem) veya (None, None).
+    """
+    masters = list_supported_files(master_dir)
+    key = name_key(path)
+    for master in masters:
+        if name_key(master) == key:
+            return master, "isim"
+    ratios = [(_name_ratio(name_key(m), key), m) for m in masters]
+    ratios = [r for r in ratios if r[0] >= NAME_MIN_RATIO]
+    if ratios:
+        return max(ratios)[1], "benzer isim"
+    fp = content_fingerprint(path)
+    scores = [(_content_score(content_fingerprint(m), fp), m) for m in masters]
+    scores = [s for s in scores if s[0] >= CONTENT_MIN_SCORE]
+    if scores:
+        return max(scores)[1], "içerik"
+    return None, None
+
+
+class BatchQueue:
+    """
+    Toplu karşılaştırma işleri için SQLite tabanlı kalıcı kuyruk.
+    Uygulama kapansa da işler diskte kalır; açılışta requeue_interrupted()
+    yarım kalan ("running") işleri tekrar bekleyene çeker.
+    Tek bağlantı birden fazla işçi thread'i tarafından lock ile paylaşılır.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or app_data_path("batch_queue.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS batches (
+                    id INTEGER PRIMARY KEY,
+                    master_dir TEXT NOT NULL,
+                    print_dir TEXT NOT NULL,
+                    settings TEXT NOT NULL,
+                    created REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY,
+                    batch_id INTEGER NOT NULL REFERENCES batches(id),
+                    master_path TEXT,
+                    print_path TEXT,
+                    pairing TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    summary TEXT,
+                    error TEXT,
+                    updated REAL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, id);
+                CREATE TABLE IF NOT EXISTS watched_files (
+                    path TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    updated REAL NOT NULL
+                );
+            """)
+
+    def create_batch(self, master_dir, print_dir, pairs, unpaired_master=(), unpaired_print=(), settings=None):
+        """Eşlenmiş çiftleri kuyruğa ekler; eşleşmeyen dosyalar bilgi için "unpaired" kaydedilir."""
+        now = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO batches (master_dir, print_dir, settings, created) VALUES (?, ?, ?, ?)",
+                (master_dir, print_dir, json.dumps(settings or {}), now),
+            )
+            batch_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO jobs (batch_id, master_path, print_path, pairing, status, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                [(batch_id, m, p, how, "pending", now) for m, p, how in pairs]
+                + [(batch_id, m, None, None, "unpaired", now) for m in unpaired_master]
+                + [(batch_id, None, p, None, "unpaired", now) for p in unpaired_print],
+            )
+        return batch_id
+
+    def add_job(self, batch_id, master_path, print_path, pairing):
+        """
+        Var olan toplu işe tek çift ekler (izlenen klasörler). Aynı print dosyası
+        için bekleyen iş zaten varsa yenisi eklenmez; master'ı sonradan bulunan
+        dosyanın "unpaired" işi bekleyene çevrilir. Eklenen / çevrilen işin id'si veya None.
+        """
+        status = "pending" if master_path and print_path else "unpaired"
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE batch_id = ? AND print_path IS ? AND status = ?",
+                (batch_id, print_path, status),
+            ).fetchone()
+            if row is not None:
+                return None
+            if status == "pending" and master_path:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE batch_id = ? AND print_path = ? AND status = 'unpaired'",
+                    (batch_id, print_path),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET master_path = ?, pairing = ?, status = 'pending', updated = ? WHERE id = ?",
+                        (master_path, pairing, time.time(), row["id"]),
+                    )
+                    return row["id"]
+            cur = self._conn.execute(
+                "INSERT INTO jobs (batch_id, master_path, print_path, pairing, status, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (batch_id, master_path, print_path, pairing, status, time.time()),
+            )
+        return cur.lastrowid
+
+    def find_batch(self, master_dir, print_dir, **settings):
+        """Aynı klasörler ve verilen ayar değerleriyle oluşturulmuş en son toplu işin id'si (yoksa None)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, settings FROM batches WHERE master_dir = ? AND print_dir = ? ORDER BY id DESC",
+                (master_dir, print_dir),
+            ).fetchall()
+        for row in rows:
+            stored = json.loads(row["settings"])
+            if all(stored.get(k) == v for k, v in settings.items()):
+                return row["id"]
+        return None
+
+    def file_changed(self, path, digest):
+        """Dosya bu özetle daha önce kuyruğa alınmadıysa True (izlenen klasörlerde artımlı karşılaştırma)."""
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM watched_files WHERE path = ?", (path,)).fetchone()
+        return row is None or row["digest"] != digest
+
+    def mark_file(self, path, digest):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watched_files (path, digest, updated) VALUES (?, ?, ?)",
+                (path, digest, time.time()),
+            )
+
+    def claim_next(self):
+        """Sıradaki bekleyen işi "running" yapıp döndürür (ayarlarıyla birlikte); yoksa None."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT jobs.*, batches.settings FROM jobs JOIN batches ON batches.id = jobs.batch_id "
+                "WHERE status = 'pending' ORDER BY jobs.id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated = ? WHERE id = ?",
+                (time.time(), row["id"]),
+            )
+        job = dict(row)
+        job["settings"] = json.loads(job["settings"])
+        return job
+
+    def complete(self, job_id, summary):
+        self._set_status(job_id, "done", summary=json.dumps(summary), error=None)
+
+    def fail(self, job_id, error):
+        self._set_status(job_id, "failed", error=str(error))
+
+    def release(self, job_id):
+        """Yarıda bırakılan işi tekrar bekleyene çeker (iptal / kapanış)."""
+        self._set_status(job_id, "pending")
+
+    def _set_status(self, job_id, status, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        sql = f"UPDATE jobs SET status = ?, updated = ?{', ' + columns if columns else ''} WHERE id = ?"
+        with self._lock, self._conn:
+            self._conn.execute(sql, (status, time.time(), *fields.values(), job_id))
+
+    def requeue_interrupted(self):
+        """Önceki oturumda "running" kalan işleri bekleyene çeker; sayısını döndürür."""
+        with self._lock, self._conn:
+            cur = self._conn.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running'")
+        return cur.rowcount
+
+    def retry_failed(self, batch_id):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'pending', error = NULL WHERE batch_id = ? AND status = 'failed'",
+                (batch_id,),
+            )
+
+    def counts(self, batch_id=None):
+        """Durum -> iş sayısı (batch_id verilmezse tüm kuyruk)."""
+        sql = "SELECT status, COUNT(*) AS n FROM jobs"
+        args = ()
+        if batch_id is not None:
+            sql += " WHERE batch_id = ?"
+            args = (batch_id,)
+        with self._lock:
+            rows = self._conn.execute(sql + " GROUP BY status", args).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def jobs(self, batch_id):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs WHERE batch_id = ? ORDER BY id", (batch_id,)).fetchall()
+        jobs = [dict(row) for row in rows]
+        for job in jobs:
+            job["summary"] = json.loads(job["summary"]) if job["summary"] else None
+        return jobs
+
+    def batches(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM batches ORDER BY id DESC").fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_batch_id(self):
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(id) AS id FROM batches").fetchone()
+        return row["id"]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class BatchRunner:
+    """
+    Kuyruktaki işleri bir thread havuzunda çalıştırır.
+    analyze(iş, cancel_event) -> özet sözlüğü; iş sözlüğü claim_next()
+    çıktısıdır. stop() sonrası işçiler mevcut aşamanın sonunda durur,
+    yarıda kalan işler kuyruğa geri bırakılır (sonraki açılışta sürer).
+    governor (MemoryGovernor) verilirse bellek bütçesi dolduğunda yeni iş
+    alınmaz; boştaki işçiler çalışanlar bitene kadar bekler.
+    """
+
+    def __init__(self, queue, analyze, workers=BATCH_WORKERS, governor=None):
+        self.queue = queue
+        self.analyze = analyze
+        self.workers = workers
+        self.governor = governor
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._active = 0         # Çalışan işçi sayısı
+        self._busy = 0           # İş üzerindeki işçi sayısı
+        self._more_work = False  # İşçiler çalışırken yeni iş eklendi
+
+    def start(self):
+        """
+        İşçileri başlatır; zaten çalışıyorlarsa kuyruğu tekrar kontrol etmelerini
+        sağlar. Klasör izleyici thread'inden de çağrılabilir.
+        """
+        with self._lock:
+            if self.cancel_event.is_set():
+                # Durdurulan işler iptal kalır, yeni işler yeni bayrakla çalışır
+                self.cancel_event = threading.Event()
+            if self._active:
+                self._more_work = True
+                return
+            self._active = self.workers
+            self._more_work = False
+        for idx in range(self.workers):
+            threading.Thread(target=self._worker, name=f"batch-compare-{idx}", daemon=True).start()
+
+    def stop(self):
+        self.cancel_event.set()
+
+    @property
+    def running(self):
+        return self._active > 0
+
+    def _worker(self):
+        while True:
+            cancel_event = self.cancel_event
+            with self._lock:
+                # İş yeri bellek kontrolüyle birlikte ayrılır: aynı anda başlayan işçiler bütçeyi aşmaz
+                admitted = cancel_event.is_set() or self.governor is None or self.governor.admit_worker(self._busy)
+                if admitted:
+                    self._busy += 1
+            if not admitted:
+                cancel_event.wait(GOVERNOR_WAIT)
+                continue
+            job = None if cancel_event.is_set() else self.queue.claim_next()
+            if job is None:
+                with self._lock:
+                    self._busy -= 1
+                    if self._more_work and not self.cancel_event.is_set():
+                        self._more_work = False
+                        continue
+                    self._active -= 1
+                    return
+            try:
+                summary = self.analyze(job, cancel_event)
+            except CompareCancelled:
+                self.queue.release(job["id"])
+            except Exception as e:
+                self.queue.fail(job["id"], e)
+            else:
+                self.queue.complete(job["id"], summary)
+            finally:
+                with self._lock:
+                    self._busy -= 1
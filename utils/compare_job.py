@@ -0,0 +1,162 @@
+import threading
+import time
+
+from utils.memory_governor import pack_result, result_nbytes
+from utils.stage_metrics import StageRecorder
+
+
+class CompareCancelled(Exception):
+    """Karşılaştırma kullanıcı tarafından iptal edildi."""
+
+
+class CompareJob:
+    """
+    Bir karşılaştırma işinin ilerleme durumu, iptal bayrağı ve kısmi sonuçları.
+    İşçi thread next_page/begin_page/begin_stage/end_page çağırır; arayüz
+    thread'i snapshot() ile durumu okur, results_since() ile yeni sonuçları
+    alır, prioritize() ile sıradaki sayfayı seçer ve cancel() ile iptal
+    ister. İptal, aşamalar arasında (begin_stage / check) işbirlikçi olarak
+    uygulanır. Her aşamanın süre/CPU/bellek ölçümü sayfa sonucuna
+    "timings" anahtarıyla eklenir. cancel_event verilirse iptal bayrağı
+    başka işlerle paylaşılır (örn. toplu karşılaştırmayı durdurmak için).
+    """
+
+    def __init__(self, total_pages, stages, cancel_event=None):
+        self.total_pages = total_pages
+        self.stages = list(stages)
+        self.results = []  # Tamamlanan sayfa sonuçları, bitiş sırasıyla (iptalde de korunur)
+        self.skipped = []  # Sonuç üretmeyen sayfalar (örn. bir dosyada olmayan sayfa)
+        self.error = None
+        self.finished = False
+
+        self._cancel_event = cancel_event or threading.Event()
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._page_idx = None
+        self._stage_idx = 0
+        self._pages_done = 0
+        self._pending = list(range(total_pages))
+        self._priority = None
+        self._recorder = StageRecorder()
+        self.profile_path = None  # cProfile çıktısı (istenmişse)
+
+    # --- İşçi tarafı ---
+
+    def check(self):
+        """İptal istendiyse CompareCancelled fırlatır."""
+        if self._cancel_event.is_set():
+            raise CompareCancelled()
+
+    def next_page(self):
+        """Sıradaki sayfa indeksi: öncelik istenen sayfa varsa o, yoksa sıradaki; bitince None."""
+        with self._lock:
+            if not self._pending:
+                return None
+            if self._priority in self._pending:
+                page_idx = self._priority
+            else:
+                page_idx = self._pending[0]
+            self._priority = None
+            self._pending.remove(page_idx)
+            return page_idx
+
+    def begin_page(self, page_idx):
+        self.check()
+        with self._lock:
+            self._page_idx = page_idx
+            self._stage_idx = 0
+        self._recorder = StageRecorder()
+
+    def begin_stage(self, name):
+        self.check()
+        with self._lock:
+            self._stage_idx = self.stages.index(name) if name in self.stages else self._stage_idx
+        self._recorder.start(name)
+
+    def end_page(self, result=None):
+        self._recorder.stop()
+        if result is not None:
+            result["timings"] = self._recorder.stages
+        with self._lock:
+            if result is not None:
+                self.results.append(result)
+            elif self._page_idx is not None:
+                self.skipped.append(self._page_idx)
+            self._pages_done += 1
+            self._stage_idx = 0
+
+    def finish(self, error=None):
+        with self._lock:
+            self.error = error
+            self.finished = True
+
+    # --- Bellek yöneticisi ---
+
+    def cache_nbytes(self):
+        """Sonuçlarda açık tutulan görsellerin toplam boyutu."""
+        with self._lock:
+            results = list(self.results)
+        return sum(result_nbytes(res) for res in results)
+
+    def evict_cache(self):
+        """En son sonuç hariç sonuç görsellerini bellekte sıkıştırır; döndürür: kazanılan byte."""
+        with self._lock:
+            results = list(self.results[:-1])
+        return sum(pack_result(res) for res in results)
+
+    # --- Arayüz tarafı ---
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def prioritize(self, page_idx):
+        """Henüz işlenmemiş bir sayfayı (0 tabanlı) sıranın başına alır."""
+        with self._lock:
+            if page_idx in self._pending:
+                self._priority = page_idx
+
+    def results_since(self, count):
+        """İlk count sonuçtan sonra eklenenleri ve atlanan sayfaları döndürür."""
+        with self._lock:
+            return list(self.results[count:]), list(self.skipped)
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def progress(self):
+        """0..1 arası ilerleme (tamamlanan sayfalar + mevcut sayfanın aşama oranı)."""
+        with self._lock:
+            if not self.total_pages:
+                return 1.0
+            partial = self._stage_idx / len(self.stages) if self.stages else 0.0
+            if self._pages_done >= self.total_pages:
+                partial = 0.0
+            return min(1.0, (self._pages_done + partial) / self.total_pages)
+
+    def eta(self):
+        """Kalan süre tahmini (saniye) veya henüz tahmin yoksa None."""
+        done = self.progress()
+        if done <= 0.0:
+            return None
+        elapsed = time.monotonic() - self._started
+        return elapsed * (1.0 - done) / done
+
+    def snapshot(self):
+        """Arayüzde göstermek için anlık durum."""
+        with self._lock:
+            page_idx = self._page_idx
+            stage = self.stages[self._stage_idx] if self.stages else None
+            pages_done = self._pages_done
+            n_results = len(self.results)
+        return {
+            "page": None if page_idx is None else page_idx + 1,
+            "total_pages": self.total_pages,
+            "pages_done": pages_done,
+            "stage": stage,
+            "progress": self.progress(),
+            "eta": self.eta(),
+            "results": n_results,
+            "cancelled": self.cancelled,
+            "finished": self.finished,
+        }
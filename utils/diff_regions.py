@@ -0,0 +1,97 @@
+from collections import defaultdict
+
+# Fark kutusu birleştirme ön ayarları: (yatay boşluk, dikey boşluk) piksel cinsinden.
+# Boşluk toleransı içindeki / örtüşen kutular tek bir bölgede toplanır.
+#   kelime: aynı kelimenin harfleri
+#   satır : aynı satırdaki kelimeler (yatayda geniş, dikeyde dar)
+#   grafik: her yönde geniş (logo, piktogram, çizim)
+MERGE_PRESETS = {
+    "Kapalı": None,
+    "Kelime": (8, 4),
+    "Satır": (30, 4),
+    "Grafik": (20, 20),
+}
+DEFAULT_MERGE = "Kelime"
+
+GRID_CELL = 64  # Uzamsal indeks hücre boyutu (piksel)
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+def grid_cells(x0, y0, x1, y1, cell):
+    """Dikdörtgenin değdiği uzamsal indeks hücreleri (cx, cy)."""
+    for cx in range(int(x0) // cell, int(x1) // cell + 1):
+        for cy in range(int(y0) // cell, int(y1) // cell + 1):
+            yield cx, cy
+
+
+def _merge_once(boxes, gap_x, gap_y, cell):
+    n = len(boxes)
+    uf = _UnionFind(n)
+    grid = defaultdict(list)
+
+    for i, (x, y, w, h) in enumerate(boxes):
+        # Önce daha önce eklenmiş komşuları sorgula, sonra kutuyu indekse ekle
+        ex0, ey0, ex1, ey1 = x - gap_x, y - gap_y, x + w + gap_x, y + h + gap_y
+        seen = set()
+        for key in grid_cells(ex0, ey0, ex1, ey1, cell):
+            for j in grid.get(key, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                jx, jy, jw, jh = boxes[j]
+                if jx <= ex1 and jx + jw >= ex0 and jy <= ey1 and jy + jh >= ey0:
+                    uf.union(j, i)
+        for key in grid_cells(x, y, x + w, y + h, cell):
+            grid[key].append(i)
+
+    groups = {}
+    for i, (x, y, w, h) in enumerate(boxes):
+        r = uf.find(i)
+        if r in groups:
+            gx0, gy0, gx1, gy1 = groups[r]
+            groups[r] = (min(gx0, x), min(gy0, y), max(gx1, x + w), max(gy1, y + h))
+        else:
+            groups[r] = (x, y, x + w, y + h)
+    return [(x0, y0, x1 - x0, y1 - y0) for x0, y0, x1, y1 in groups.values()]
+
+
+def merge_boxes(boxes, gap_x=0, gap_y=None, cell=GRID_CELL):
+    """
+    Yakın ve örtüşen (x, y, w, h) kutularını anlamlı bölgelerde birleştirir.
+    Aday komşular grid tabanlı uzamsal indeksle bulunur (O(n) civarı),
+    bağlı kutular union-find ile gruplanır. Birleşen bölge yeni komşulara
+    değebileceği için sonuç sabitlenene kadar tekrarlanır.
+    """
+    if gap_y is None:
+        gap_y = gap_x
+    current = [tuple(b) for b in boxes]
+    cell = max(cell, 2 * max(gap_x, gap_y, 1))
+    while len(current) > 1:
+        merged = _merge_once(current, gap_x, gap_y, cell)
+        if len(merged) == len(current):
+            break
+        current = merged
+    return current
+
+
+def merge_with_preset(boxes, preset):
+    """MERGE_PRESETS içindeki bir ön ayarla birleştirir; None/"Kapalı" ise kutular aynen döner."""
+    gaps = MERGE_PRESETS.get(preset) if isinstance(preset, str) else preset
+    if not gaps:
+        return list(boxes)
+    return merge_boxes(boxes, gaps[0], gaps[1])
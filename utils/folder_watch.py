@@ -0,0 +1,308 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from utils.app_paths import app_data_path
+from utils.batch_queue import SUPPORTED_EXTENSIONS, match_master
+from utils.result_store import file_digest
+
+DEBOUNCE_SECONDS = 2.0   # Son değişiklikten sonra dosyanın sabit kalması gereken süre
+POLL_INTERVAL = 2.0      # inotify yoksa klasör tarama aralığı (sn)
+WATCH_CONFIG_NAME = "watch_folders.json"
+
+# Yazılırken kullanılan geçici dosyalar (Office kilidi, tarayıcı indirmeleri vb.)
+_TEMP_PREFIXES = ("~$", ".")
+_TEMP_SUFFIXES = (".tmp", ".part", ".crdownload", ".partial")
+
+# inotify (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def load_watch_config():
+    """İzlenen klasör kuralları: [{"watch_dir", "master_dir", "settings"}, ...]"""
+    try:
+        with open(app_data_path(WATCH_CONFIG_NAME), encoding="utf-8") as f:
+            return json.load(f).get("rules", [])
+    except (OSError, ValueError):
+        return []
+
+
+def save_watch_config(rules):
+    path = app_data_path(WATCH_CONFIG_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"rules": rules}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def is_candidate(path):
+    """İzleyicinin dikkate aldığı dosya mı (desteklenen uzantı, geçici dosya değil)."""
+    name = os.path.basename(path)
+    lower = name.lower()
+    return (
+        lower.endswith(SUPPORTED_EXTENSIONS)
+        and not name.startswith(_TEMP_PREFIXES)
+        and not lower.endswith(_TEMP_SUFFIXES)
+    )
+
+
+def watch_batch_id(queue, rule):
+    """İzleme kuralının işlerinin toplandığı toplu iş (yoksa oluşturulur)."""
+    batch_id = queue.find_batch(rule["master_dir"], rule["watch_dir"], watch=True)
+    if batch_id is None:
+        settings = dict(rule.get("settings") or {}, watch=True)
+        batch_id = queue.create_batch(rule["master_dir"], rule["watch_dir"], [], settings=settings)
+    return batch_id
+
+
+def enqueue_watched_file(queue, rule, path):
+    """
+    Hazır hale gelen dosyayı master'ıyla eşleyip kuralın toplu işine ekler.
+    İçeriği daha önce kuyruğa alınmış dosyalar atlanır (artımlı). Master'ı
+    henüz yoksa "unpaired" kaydedilir ama işlenmiş sayılmaz: master gelince
+    rematch_unpaired (veya sonraki tarama) eşler.
+    Döndürür: eklenen işin id'si veya None.
+    """
+    try:
+        digest = file_digest(path)
+    except OSError:
+        return None  # Dosya bu arada silinmiş / taşınmış
+    if not queue.file_changed(path, digest):
+        return None
+    batch_id = watch_batch_id(queue, rule)
+    master, pairing = match_master(path, rule["master_dir"])
+    job_id = queue.add_job(batch_id, master, path, pairing)
+    if master is not None:
+        queue.mark_file(path, digest)
+    return job_id
+
+
+def rematch_unpaired(queue, rule):
+    """
+    Master klasörü değişince kuralın eşleşmeyen print dosyalarını yeniden
+    eşler (print, master'ından önce geldiyse). Döndürür: bekleyene alınan iş id'leri.
+    """
+    batch_id = queue.find_batch(rule["master_dir"], rule["watch_dir"], watch=True)
+    if batch_id is None:
+        return []
+    paired = []
+    for job in queue.jobs(batch_id):
+        if job["status"] != "unpaired" or not job["print_path"]:
+            continue
+        try:
+            digest = file_digest(job["print_path"])
+        except OSError:
+            continue  # Print dosyası artık yok
+        master, pairing = match_master(job["print_path"], rule["master_dir"])
+        if master is None:
+            continue
+        job_id = queue.add_job(batch_id, master, job["print_path"], pairing)
+        queue.mark_file(job["print_path"], digest)
+        if job_id is not None:
+            paired.append(job_id)
+    return paired
+
+
+class _Inotify:
+    """Linux inotify için ctypes sarmalayıcısı (sadece gerekli çağrılar)."""
+
+    MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_MODIFY
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 başarısız")
+        self.dirs = {}  # watch descriptor -> klasör
+
+    def add(self, folder):
+        wd = self._add_watch(self.fd, os.fsencode(folder), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch başarısız: {folder}")
+        self.dirs[wd] = folder
+
+    def read(self, timeout):
+        """Değişen dosya yollarını döndürür; kuyruk taştıysa None (tam tarama gerekir)."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths, offset = [], 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            if name and wd in self.dirs:
+                paths.append(os.path.join(self.dirs[wd], os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """
+    İzlenen klasörlerde yeni/değişen dosyaları bulup yazımları bitince
+    on_ready(kural, yol) çağırır. Linux'ta inotify, diğer sistemlerde (veya
+    inotify açılamazsa) periyodik tarama kullanılır. Dosya, son olaydan
+    sonra debounce süresi boyunca boyutu/zamanı değişmezse hazır sayılır.
+    Başlangıçta mevcut dosyalar da bir kez değerlendirilir: uygulama
+    kapalıyken gelenler kaçmaz, aynı içerik on_ready tarafında elenir.
+    on_masters verilirse master klasörleri de izlenir; bir master dosyası
+    hazır olunca kural başına bir kez on_masters(kural) çağrılır (örn.
+    rematch_unpaired ile master'ından önce gelen print'leri eşlemek için).
+    """
+
+    def __init__(self, rules, on_ready, debounce=DEBOUNCE_SECONDS, poll_interval=POLL_INTERVAL, on_masters=None):
+        self.rules = list(rules)
+        self.on_ready = on_ready
+        self.on_masters = on_masters
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.mode = None  # "inotify" veya "polling"
+        self._stop = threading.Event()
+        self._thread = None
+        self._pending = {}   # yol -> (son olay zamanı, (boyut, mtime))
+        self._snapshot = {}  # tarama modu: yol -> (boyut, mtime)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="folder-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _rules_for(self, path, key):
+        folder = os.path.normcase(os.path.abspath(os.path.dirname(path)))
+        return [r for r in self.rules if os.path.normcase(os.path.abspath(r[key])) == folder]
+
+    def _rule_for(self, path):
+        rules = self._rules_for(path, "watch_dir")
+        return rules[0] if rules else None
+
+    def _folders(self):
+        """İzlenen klasörler: print klasörleri, on_masters varsa master klasörleri de."""
+        folders = [rule["watch_dir"] for rule in self.rules]
+        if self.on_masters is not None:
+            folders += [rule["master_dir"] for rule in self.rules]
+        return list(dict.fromkeys(folders))
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    def _scan(self):
+        """Tüm izlenen klasörlerin (boyut, mtime) görüntüsü."""
+        snapshot = {}
+        for folder in self._folders():
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_file() and is_candidate(entry.path):
+                    st = entry.stat()
+                    snapshot[entry.path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def _touch(self, paths):
+        now = time.monotonic()
+        for path in paths:
+            if is_candidate(path):
+                self._pending[path] = (now, self._stat(path))
+
+    def _open_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            inotify = _Inotify()
+        except (OSError, AttributeError) as e:
+            print(f"inotify kullanılamıyor, tarama moduna geçildi: {e}")
+            return None
+        try:
+            for folder in self._folders():
+                inotify.add(folder)
+        except OSError as e:
+            inotify.close()
+            print(f"inotify kullanılamıyor, tarama moduna geçildi: {e}")
+            return None
+        return inotify
+
+    def _run(self):
+        inotify = self._open_inotify()
+        self.mode = "inotify" if inotify else "polling"
+        self._snapshot = self._scan()
+        self._touch(self._snapshot)
+        try:
+            while not self._stop.is_set():
+                if inotify:
+                    paths = inotify.read(min(self.debounce, 1.0))
+                    self._touch(self._scan() if paths is None else paths)
+                else:
+                    self._stop.wait(self.poll_interval)
+                    snapshot = self._scan()
+                    self._touch(p for p, sig in snapshot.items() if self._snapshot.get(p) != sig)
+                    self._snapshot = snapshot
+                self._flush_ready()
+        finally:
+            if inotify:
+                inotify.close()
+
+    def _flush_ready(self):
+        """Debounce süresini sabit geçiren dosyaları on_ready'ye verir."""
+        now = time.monotonic()
+        master_rules = []
+        for path, (last, sig) in list(self._pending.items()):
+            if now - last < self.debounce:
+                continue
+            current = self._stat(path)
+            if current is None:
+                del self._pending[path]  # Silindi / taşındı
+            elif current != sig:
+                self._pending[path] = (now, current)  # Hâlâ yazılıyor
+            else:
+                del self._pending[path]
+                if self.on_masters is not None:
+                    master_rules += [r for r in self._rules_for(path, "master_dir") if r not in master_rules]
+                rule = self._rule_for(path)
+                if rule is None:
+                    continue
+                try:
+                    self.on_ready(rule, path)
+                except Exception as e:
+                    print(f"İzlenen dosya kuyruğa alınamadı ({path}): {e}")
+        for rule in master_rules:
+            try:
+                self.on_masters(rule)
+            except Exception as e:
+                print(f"Eşleşmeyen dosyalar yeniden eşlenemedi ({rule['master_dir']}): {e}")
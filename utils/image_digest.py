@@ -0,0 +1,159 @@
+import hashlib
+
+import fitz  # PyMuPDF
+
+from utils.vector_diff import match_overlapping, moved, set_raster_regions
+
+# Görselin üstünü örten / altından görünen içerik sayılan bboxlog türleri
+_PAINT_PREFIXES = ("fill-", "stroke-")
+_IMAGE_TYPES = ("fill-image",)
+
+# Pikselleri kanıtlanmış şekilde aynı olan görsel durumları
+UNCHANGED_STATUSES = ("identical", "reencoded")
+
+IMAGE_STATUS_LABELS = {
+    "identical": "Aynı",
+    "reencoded": "Yeniden kodlanmış",
+    "replaced": "Değiştirilmiş",
+    "moved": "Taşınmış / boyutlanmış",
+    "added": "Eklendi",
+    "removed": "Silindi",
+}
+
+
+def _sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def _smask_xref(doc, xref):
+    kind, value = doc.xref_get_key(xref, "SMask")
+    if kind == "xref":
+        return int(value.split()[0])
+    return 0
+
+
+def raw_digest(doc, xref, cache):
+    """Görsel akışının (ve varsa SMask'inin) sıkıştırılmış haliyle özeti; çözümleme yapılmaz."""
+    key = ("raw", xref)
+    if key not in cache:
+        digest = _sha1(doc.xref_stream_raw(xref) or b"")
+        smask = _smask_xref(doc, xref)
+        if smask:
+            digest += _sha1(doc.xref_stream_raw(smask) or b"")
+        cache[key] = digest
+    return cache[key]
+
+
+def decoded_digest(doc, xref, cache):
+    """Çözümlenmiş piksellerin (ve varsa SMask'in) özeti; çözümlenemezse None."""
+    key = ("decoded", xref)
+    if key not in cache:
+        try:
+            parts = []
+            for x in (xref, _smask_xref(doc, xref)):
+                if not x:
+                    continue
+                pix = fitz.Pixmap(doc, x)
+                parts.append(f"{pix.w}x{pix.h}x{pix.n}:" + hashlib.md5(pix.samples_mv).hexdigest())
+                pix = None
+            cache[key] = "|".join(parts)
+        except (RuntimeError, ValueError):
+            cache[key] = None
+    return cache[key]
+
+
+def _intersects(r1, r2):
+    return r1[0] < r2[2] and r2[0] < r1[2] and r1[1] < r2[3] and r2[1] < r1[3]
+
+
+def page_image_entries(page, cache):
+    """
+    Sayfadaki gömülü görsellerin listesi:
+    [{"rect", "xref", "raw", "inline_digest", "has_mask", "exposed"}, ...]
+    raw: ham akış özeti (satır içi görsellerde None, yerine inline_digest).
+    exposed: görselin üstüne sonradan çizim/metin geliyorsa veya saydam olup
+    altında içerik varsa True — bu alan görsel aynı olsa bile pikselde
+    farklı görünebilir. Koordinatlar döndürülmüş sayfa koordinatıdır (pt).
+    """
+    infos = page.get_image_info(xrefs=True)
+    if not infos:
+        return []
+    if any(info["xref"] == 0 for info in infos):
+        # Satır içi görsellerin xref'i yok: özet için pikseller çözümlenir
+        infos = page.get_image_info(hashes=True, xrefs=True)
+
+    # Çizim sırası: görsel girişleri get_image_info ile aynı sırada gelir
+    log = [(kind, rect) for kind, rect in page.get_bboxlog() if kind.startswith(_PAINT_PREFIXES)]
+    image_pos = [i for i, (kind, _) in enumerate(log) if kind in _IMAGE_TYPES]
+    if len(image_pos) != len(infos):
+        image_pos = [None] * len(infos)
+
+    rot_mat = page.rotation_matrix if page.rotation else None
+    doc = page.parent
+    entries = []
+    for info, pos in zip(infos, image_pos):
+        bbox = tuple(info["bbox"])
+        exposed = True
+        if pos is not None:
+            above = any(_intersects(bbox, rect) for _, rect in log[pos + 1:])
+            below = info["has-mask"] and any(_intersects(bbox, rect) for _, rect in log[:pos])
+            exposed = above or below
+        rect = fitz.Rect(bbox) * rot_mat if rot_mat is not None else fitz.Rect(bbox)
+        xref = info["xref"]
+        entries.append({
+            "rect": (rect.x0, rect.y0, rect.x1, rect.y1),
+            "xref": xref,
+            "raw": raw_digest(doc, xref, cache) if xref else None,
+            "inline_digest": None if xref else info["digest"].hex(),
+            "has_mask": info["has-mask"],
+            "exposed": exposed,
+        })
+    return entries
+
+
+def _same_pixels(a, b, decoded1, decoded2):
+    if a["xref"] and b["xref"]:
+        d1, d2 = decoded1(a["xref"]), decoded2(b["xref"])
+        return d1 is not None and d1 == d2
+    return a["inline_digest"] is not None and a["inline_digest"] == b["inline_digest"]
+
+
+def compare_images(entries1, entries2, decoded1, decoded2):
+    """
+    Master ve print görsellerini konumla eşleyip içerik özetiyle karşılaştırır.
+    decoded1/decoded2: xref -> çözümlenmiş piksel özeti (sadece ham akışlar
+    farklıysa çağrılır).
+    Döndürür: {"images": [{"status", "rect1", "rect2", "exposed"}, ...]}
+    status: identical / reencoded / replaced / moved / added / removed
+    """
+    pairs, rest1, rest2 = match_overlapping(entries1, entries2)
+    images = []
+    for a, b in pairs:
+        if a["raw"] is not None and a["raw"] == b["raw"]:
+            status = "identical"
+        elif _same_pixels(a, b, decoded1, decoded2):
+            status = "identical" if a["raw"] is None else "reencoded"
+        else:
+            status = "replaced"
+        if status != "replaced" and moved(a["rect"], b["rect"]):
+            status = "moved"
+        exposed = a["exposed"] or b["exposed"]
+        images.append({"status": status, "rect1": a["rect"], "rect2": b["rect"], "exposed": exposed})
+    images.extend({"status": "removed", "rect1": a["rect"], "rect2": None, "exposed": a["exposed"]} for a in rest1)
+    images.extend({"status": "added", "rect1": None, "rect2": b["rect"], "exposed": b["exposed"]} for b in rest2)
+    return {"images": images}
+
+
+def prune_raster_regions(vector_result, image_result):
+    """
+    Vektör sonucunda piksel ile karşılaştırılacak görsel alanlarından içeriği
+    aynı olanları çıkarır. Görselin üstündeki/altındaki çizim ve metinler
+    vektör karşılaştırmasında zaten değerlendirildiği için bu güvenlidir.
+    """
+    if not vector_result["raster_regions"]:
+        return
+    same = {
+        (img["rect1"], img["rect2"]) for img in image_result["images"]
+        if img["status"] in UNCHANGED_STATUSES
+    }
+    set_raster_regions(vector_result, [r for r in vector_result["raster_regions"] if r not in same])
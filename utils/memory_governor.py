@@ -0,0 +1,244 @@
+import io
+import os
+import threading
+import time
+import weakref
+from collections import deque
+
+from PIL import Image
+
+from utils.stage_metrics import PSUTIL_SUPPORT, current_rss
+
+if PSUTIL_SUPPORT:
+    import psutil
+
+BUDGET_ENV = "PIXEL_COMPARE_MEMORY_MB"  # Bellek bütçesi (MB); yoksa fiziksel belleğin oranı
+BUDGET_FRACTION = 0.5       # Varsayılan bütçe: fiziksel belleğin yarısı
+FALLBACK_BUDGET = 4 << 30   # Fiziksel bellek okunamazsa (byte)
+RELAX_RATIO = 0.7           # Kullanım bütçenin bu oranının altına inince çözünürlük geri artırılır
+SCALE_STEP = 0.7            # Render piksel ölçeği her adımda bu oranla düşer / geri artar
+MIN_RENDER_SCALE = 0.35     # Piksel ölçeğinin alt sınırı (216 DPI -> ~128 DPI)
+FOOTPRINT_DECAY = 0.9       # Sayfa başı tepe bellek tahmini, yeni ölçüm yoksa bu oranla söner
+PACK_PNG_LEVEL = 1          # Sonuç görsellerinin bellekte sıkıştırılma seviyesi (hızlı)
+
+# Sayfa sonuçlarındaki tam çözünürlüklü görseller ve fark büyüklüğü haritası (anahtar yolu)
+RESULT_IMAGE_SLOTS = (
+    ("diff_image",), ("img1_norm",), ("img2_norm",), ("ssim_result", "diff_image"), ("diff_map", "magnitude"),
+)
+
+_pack_lock = threading.Lock()
+
+
+def physical_memory():
+    """Toplam fiziksel bellek (byte) veya okunamazsa None."""
+    if PSUTIL_SUPPORT:
+        return psutil.virtual_memory().total
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_budget():
+    """PIXEL_COMPARE_MEMORY_MB ortam değişkeni veya fiziksel belleğin BUDGET_FRACTION kadarı (byte)."""
+    value = os.environ.get(BUDGET_ENV)
+    if value:
+        try:
+            return int(float(value) * (1 << 20))
+        except ValueError:
+            print(f"Geçersiz {BUDGET_ENV} değeri yok sayıldı: {value}")
+    total = physical_memory()
+    return int(total * BUDGET_FRACTION) if total else FALLBACK_BUDGET
+
+
+def format_bytes(n):
+    return f"{n / (1 << 30):.1f} GB" if n >= 1 << 30 else f"{n / (1 << 20):.0f} MB"
+
+
+def image_nbytes(img):
+    """PIL görselin veya numpy dizisinin bellekteki ham boyutu."""
+    if img is None:
+        return 0
+    if hasattr(img, "nbytes"):
+        return img.nbytes
+    return img.width * img.height * len(img.getbands())
+
+
+def _slot_parent(result, slot):
+    parent = result
+    for key in slot[:-1]:
+        parent = parent.get(key) if parent else None
+    return parent
+
+
+def result_image(result, *slot):
+    """
+    Sonuçtaki görseli döndürür; bellek sınırı nedeniyle sıkıştırılmışsa
+    sonucu değiştirmeden açar (örn. kayda küçük resim yazarken).
+    """
+    parent = _slot_parent(result, slot)
+    img = parent.get(slot[-1]) if parent else None
+    if img is not None:
+        return img
+    data = (result.get("_packed") or {}).get(slot)
+    return Image.open(io.BytesIO(data)) if data is not None else None
+
+
+def result_nbytes(result):
+    """Sonuçta açık tutulan tam çözünürlüklü görsellerin toplam boyutu."""
+    total = 0
+    for slot in RESULT_IMAGE_SLOTS:
+        parent = _slot_parent(result, slot)
+        total += image_nbytes(parent.get(slot[-1]) if parent else None)
+    return total
+
+
+def pack_result(result):
+    """
+    Sonucun görsellerini bellekte PNG olarak sıkıştırır (kayıpsız); açık
+    görseller bırakılır. unpack_result ile geri açılır. Döndürür: kazanılan byte.
+    """
+    freed = 0
+    for slot in RESULT_IMAGE_SLOTS:
+        parent = _slot_parent(result, slot)
+        img = parent.get(slot[-1]) if parent else None
+        if img is None:
+            continue
+        buf = io.BytesIO()
+        img.save(buf, "PNG", compress_level=PACK_PNG_LEVEL)
+        with _pack_lock:
+            # Bu arada açılmış / değiştirilmişse dokunma
+            if parent.get(slot[-1]) is not img:
+                continue
+            result.setdefault("_packed", {})[slot] = buf.getvalue()
+            parent[slot[-1]] = None
+        freed += max(0, image_nbytes(img) - buf.tell())
+    return freed
+
+
+def unpack_result(result):
+    """pack_result ile sıkıştırılmış görselleri yerine açar (sonuç gösterilmeden önce)."""
+    with _pack_lock:
+        packed = result.pop("_packed", None)
+        for slot, data in (packed or {}).items():
+            parent = _slot_parent(result, slot)
+            if parent is not None and parent.get(slot[-1]) is None:
+                img = Image.open(io.BytesIO(data))
+                img.load()
+                parent[slot[-1]] = img
+    return result
+
+
+class MemoryGovernor:
+    """
+    Karşılaştırmaların toplam bellek kullanımını bir bütçe altında tutar.
+    İzlenenler: belgelerin render önbellekleri (cache_nbytes / evict_cache
+    sağlayan PageSource'lar), sayfa sonuçlarının görselleri (CompareJob) ve
+    işçilerin sayfa başına tepe bellek ihtiyacı. Süreç RSS'i bütçeyi
+    aşınca sırasıyla: render önbellekleri boşaltılır, eski sayfa sonuçları
+    bellekte sıkıştırılır, hâlâ aşılıyorsa diff/OCR render çözünürlüğü
+    düşürülür; toplu işlerde yeni işçi ancak tahmini ihtiyacı bütçeye
+    sığıyorsa başlar. Her eylem events'e yazılır. Tüm thread'lerden çağrılabilir.
+    """
+
+    def __init__(self, budget=None):
+        self.budget = budget or default_budget()
+        self.render_scale = 1.0  # diff/OCR render'larının piksel ölçeği (RenderProfile.pixel_scale)
+        self.events = deque(maxlen=100)  # (zaman, metin)
+        self._lock = threading.Lock()
+        self._renders = weakref.WeakSet()
+        self._results = weakref.WeakSet()
+        self._page_peak = 0       # Bir sayfa karşılaştırmasının tahmini tepe bellek ihtiyacı
+        self._throttled = False   # İşçi sayısı şu an sınırlanıyor mu (rapor tekrarını önler)
+
+    def track(self, renders=(), results=()):
+        """Render önbelleği olan kaynakları ve sonuç tutan işleri izlemeye alır (zayıf referans)."""
+        with self._lock:
+            for owner in renders:
+                self._renders.add(owner)
+            for owner in results:
+                self._results.add(owner)
+
+    def usage(self):
+        """Sürecin anlık bellek kullanımı; ölçülemiyorsa izlenen önbellek ve sonuçların toplamı."""
+        rss = current_rss()
+        return rss if rss is not None else self.tracked_bytes()
+
+    def tracked_bytes(self):
+        with self._lock:
+            owners = list(self._renders) + list(self._results)
+        return sum(owner.cache_nbytes() for owner in owners)
+
+    def report(self, text):
+        """Eylemi events'e yazar; arayüz durum satırında last_event ile gösterir."""
+        self.events.append((time.time(), text))
+
+    def last_event(self, since=0.0):
+        """since'ten sonraki son eylem metni veya None."""
+        if self.events and self.events[-1][0] >= since:
+            return self.events[-1][1]
+        return None
+
+    def note_page_footprint(self, nbytes):
+        """Bir sayfa karşılaştırmasının ölçülen tepe RSS artışını (bkz. stage_metrics.PeakRss) kaydeder."""
+        with self._lock:
+            self._page_peak = max(int(nbytes or 0), int(self._page_peak * FOOTPRINT_DECAY))
+
+    def admit_page(self):
+        """
+        Sayfa karşılaştırması başlamadan önce çağrılır: bütçe aşılıyorsa
+        önbellek boşaltır / sonuçları sıkıştırır / çözünürlüğü düşürür,
+        rahatladıysa çözünürlüğü geri artırır. Döndürür: render piksel ölçeği.
+        """
+        used = self.usage()
+        if used is None:
+            return self.render_scale
+        if used > self.budget:
+            freed = self._evict(used - self.budget)
+            if used - freed > self.budget and self.render_scale > MIN_RENDER_SCALE:
+                self.render_scale = max(MIN_RENDER_SCALE, self.render_scale * SCALE_STEP)
+                self.report(
+                    f"kullanım {format_bytes(used)} > bütçe {format_bytes(self.budget)}; "
+                    f"diff/OCR çözünürlüğü %{self.render_scale * 100:.0f} piksele düşürüldü"
+                )
+        elif used < self.budget * RELAX_RATIO and self.render_scale < 1.0:
+            self.render_scale = min(1.0, self.render_scale / SCALE_STEP)
+            self.report(f"kullanım {format_bytes(used)}; çözünürlük %{self.render_scale * 100:.0f} piksele çıkarıldı")
+        return self.render_scale
+
+    def _evict(self, needed):
+        """Önce render önbelleklerini, yetmezse eski sonuç görsellerini bırakır. Döndürür: kazanılan byte."""
+        with self._lock:
+            renders, results = list(self._renders), list(self._results)
+        freed = sum(owner.evict_cache() for owner in renders)
+        if freed:
+            self.report(f"render önbellekleri boşaltıldı ({format_bytes(freed)})")
+        if freed < needed:
+            packed = sum(owner.evict_cache() for owner in results)
+            if packed:
+                self.report(f"eski sayfa sonuçları sıkıştırıldı ({format_bytes(packed)} kazanıldı)")
+            freed += packed
+        return freed
+
+    def admit_worker(self, busy):
+        """
+        Toplu işte busy işçi çalışırken bir işçi daha başlayabilir mi:
+        tahmini sayfa ihtiyacı mevcut kullanıma eklenince bütçe aşılmamalı.
+        En az bir işçiye her zaman izin verilir.
+        """
+        if busy == 0:
+            return True
+        used = self.usage()
+        if used is None:
+            return True
+        allowed = used + self._page_peak <= self.budget
+        if allowed == self._throttled:
+            self._throttled = not allowed
+            if allowed:
+                self.report("bellek rahatladı; paralel işçi sınırı kaldırıldı")
+            else:
+                self.report(
+                    f"kullanım {format_bytes(used)} + sayfa başı ~{format_bytes(self._page_peak)} bütçeyi "
+                    f"({format_bytes(self.budget)}) aşıyor; paralellik {busy} işçiyle sınırlandı"
+                )
+        return allowed
@@ -0,0 +1,137 @@
+import numpy as np
+
+try:
+    import cv2
+    CV2_SUPPORT = True
+except ImportError:
+    CV2_SUPPORT = False
+
+ORIENT_MAX_SIDE = 1000    # Tahmin bu uzun kenara küçültülmüş gri görselde yapılır
+MAX_SKEW = 10.0           # Aranan en büyük eğrilik (derece)
+COARSE_STEP = 1.0         # Kaba tarama adımı (derece); tepe altın oran aramasıyla inceltilir
+FINE_TOL = 0.1            # İnceltme aralığı bu genişliğe inince durulur (derece)
+MIN_SKEW = 0.2            # Bunun altındaki eğrilik düzeltilmez (gereksiz yeniden örnekleme)
+QUARTER_MIN_RATIO = 1.3   # Dikey satır skoru yatayın bu katından büyükse sayfa 90° dönmüş
+FLIP_MIN_RATIO = 0.15     # Üst/alt taşma dengesizliği bunu aşarsa sayfa baş aşağı
+FLIP_MIN_LINES = 3        # Baş aşağı kararı için gereken en az metin satırı
+
+_GOLDEN = (np.sqrt(5) - 1) / 2
+
+
+def _downsample(gray):
+    h, w = gray.shape
+    scale = ORIENT_MAX_SIDE / max(h, w)
+    if scale >= 1.0:
+        return gray
+    return cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def _rotate(ink, angle):
+    """Saat yönünün tersine angle derece döndürür (boyut korunur, köşeler boş)."""
+    h, w = ink.shape
+    mat = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(ink, mat, (w, h), flags=cv2.INTER_NEAREST, borderValue=0)
+
+
+def _profile_score(ink, angle):
+    """Yatay izdüşüm profilinin keskinliği: satırlar yataysa komşu satır farkları büyüktür."""
+    profile = _rotate(ink, angle).sum(axis=1, dtype=np.float64) if angle else ink.sum(axis=1, dtype=np.float64)
+    return float(np.square(np.diff(profile)).sum())
+
+
+def _coarse_skew(ink):
+    """İzdüşüm profiliyle COARSE_STEP adımlı eğrilik taraması: (açı saat yönü tersine, skor)."""
+    angles = np.arange(-MAX_SKEW, MAX_SKEW + COARSE_STEP / 2, COARSE_STEP)
+    scores = [_profile_score(ink, a) for a in angles]
+    i = int(np.argmax(scores))
+    return float(angles[i]), scores[i]
+
+
+def _refine_skew(ink, angle, score):
+    """
+    Kaba tepeyi komşu adımlar arasında altın oran aramasıyla FINE_TOL
+    hassasiyetine inceltir (~9 ek döndürme). Daha iyi açı yoksa kaba açı döner.
+    """
+    lo, hi = angle - COARSE_STEP, angle + COARSE_STEP
+    x1, x2 = hi - _GOLDEN * (hi - lo), lo + _GOLDEN * (hi - lo)
+    f1, f2 = _profile_score(ink, x1), _profile_score(ink, x2)
+    while hi - lo > FINE_TOL:
+        if f1 >= f2:
+            hi, x2, f2 = x2, x1, f1
+            x1 = hi - _GOLDEN * (hi - lo)
+            f1 = _profile_score(ink, x1)
+        else:
+            lo, x1, f1 = x1, x2, f2
+            x2 = lo + _GOLDEN * (hi - lo)
+            f2 = _profile_score(ink, x2)
+    fine, fine_score = (x1, f1) if f1 >= f2 else (x2, f2)
+    if fine_score <= score:
+        return angle
+    return round(float(fine), 2)
+
+
+def _text_lines(profile):
+    """Profilde metin satırı bantları: [(başlangıç, bitiş), ...]"""
+    mask = profile > profile.max() * 0.1
+    lines, start = [], None
+    for i, on in enumerate(mask):
+        if on and start is None:
+            start = i
+        elif not on and start is not None:
+            if i - start >= 3:
+                lines.append((start, i))
+            start = None
+    return lines
+
+
+def _upside_down(ink):
+    """
+    Latin metinde üst taşmalar (b, d, h, k, l, büyük harfler) alt taşmalardan
+    (g, p, q, y) fazladır: satırların çekirdek bölgesinin üstünde altından
+    daha az mürekkep varsa sayfa baş aşağıdır. Döndürür: (baş aşağı mı, satır sayısı)
+    """
+    profile = ink.sum(axis=1, dtype=np.float64)
+    if not profile.any():
+        return False, 0
+    above = below = 0.0
+    lines = _text_lines(profile)
+    for start, end in lines:
+        band = profile[start:end]
+        core = np.nonzero(band >= band.max() * 0.5)[0]
+        above += band[:core[0]].sum()
+        below += band[core[-1] + 1:].sum()
+    if len(lines) < FLIP_MIN_LINES or above + below == 0:
+        return False, len(lines)
+    return (below - above) / (above + below) > FLIP_MIN_RATIO, len(lines)
+
+
+def estimate_orientation(gray):
+    """
+    Taranmış sayfanın yönünü ve eğriliğini tahmin eder (küçültülmüş görselde).
+    Döndürür: {"rotation": 0/90/180/270, "skew": derece, "lines": satır sayısı}
+    rotation ve skew saat yönündedir; ikisinin toplamı kadar döndürülen sayfa
+    düz olur. Tahmin yapılamazsa (boş sayfa, cv2 yok) None.
+    """
+    if not CV2_SUPPORT:
+        return None
+    small = _downsample(gray)
+    _, ink = cv2.threshold(small, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    coverage = ink.mean()
+    if coverage < 0.002 or coverage > 0.5:
+        return None
+
+    # Satırlar yatay mı (0°) yoksa dikey mi (90°)? Dikey aday saat yönünde çevrilmiş görseldir.
+    # Karar kaba taramayla verilir; sadece seçilen aday inceltilir
+    img90 = np.ascontiguousarray(np.rot90(ink, k=-1))
+    angle0, score0 = _coarse_skew(ink)
+    angle90, score90 = _coarse_skew(img90)
+    if score90 > score0 * QUARTER_MIN_RATIO:
+        quarter, img, angle = 90, img90, _refine_skew(img90, angle90, score90)
+    else:
+        quarter, img, angle = 0, ink, _refine_skew(ink, angle0, score0)
+
+    flipped, lines = _upside_down(_rotate(img, angle) if angle else img)
+    if flipped:
+        quarter += 180
+    skew = -angle if abs(angle) >= MIN_SKEW else 0.0
+    return {"rotation": quarter % 360, "skew": round(skew, 2), "lines": lines}
@@ -0,0 +1,87 @@
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+    CV2_SUPPORT = True
+except ImportError:
+    CV2_SUPPORT = False
+
+
+class PixmapArray(np.ndarray):
+    """
+    fitz.Pixmap tamponunu kopyalamadan saran numpy dizisi.
+    Pixmap'e referans tutar: pixmap silinirse tampon serbest bırakılır
+    (PyMuPDF __del__ içinde samples_mv'yi release eder).
+    """
+
+    def __array_finalize__(self, obj):
+        self._pixmap = getattr(obj, "_pixmap", None)
+
+
+def pixmap_to_array(pix):
+    """Pixmap örneklerini (H, W) veya (H, W, n) uint8 dizisi olarak kopyasız döndürür."""
+    buf = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    if pix.stride == pix.w * pix.n:
+        arr = buf.reshape(pix.h, pix.w, pix.n)
+    else:
+        # Satır sonunda dolgu varsa görünüm ile kırp (yine kopyasız)
+        arr = buf.reshape(pix.h, pix.stride)[:, :pix.w * pix.n].reshape(pix.h, pix.w, pix.n)
+    if pix.n == 1:
+        arr = arr[:, :, 0]
+    arr = arr.view(PixmapArray)
+    arr._pixmap = pix
+    return arr
+
+
+def render_page_array(page, zoom, gray=False, clip=None, rotation=0):
+    """
+    Sayfayı gri (1 kanal) veya RGB pixmap olarak render edip numpy dizisi döndürür.
+    rotation (saat yönünde 0/90/180/270) render matrisine eklenir: döndürülmüş
+    sayfa ayrı bir kopya oluşturmadan doğrudan render edilir. clip sayfa
+    koordinatındadır (döndürülmemiş).
+    """
+    colorspace = fitz.csGRAY if gray else fitz.csRGB
+    mat = fitz.Matrix(zoom, zoom).prerotate(rotation)
+    pix = page.get_pixmap(matrix=mat, colorspace=colorspace, alpha=False, clip=clip)
+    return pixmap_to_array(pix)
+
+
+def as_array(img):
+    """PIL görseli veya numpy dizisini numpy dizisine çevirir (dizi ise aynen döner)."""
+    if isinstance(img, np.ndarray):
+        return img
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    return np.asarray(img)
+
+
+def to_gray(arr):
+    """RGB diziyi griye çevirir; zaten gri ise aynen döndürür."""
+    arr = as_array(arr)
+    if arr.ndim == 2:
+        return arr
+    return cv2.cvtColor(arr, cv2.COLOR_RGB2GRAY)
+
+
+def to_rgb(arr):
+    """Gri diziyi RGB'ye çevirir; zaten RGB ise aynen döndürür."""
+    arr = as_array(arr)
+    if arr.ndim == 3:
+        return arr
+    return cv2.cvtColor(arr, cv2.COLOR_GRAY2RGB)
+
+
+# Saat yönünde döndürme -> kayıpsız PIL transpose (PIL'in ROTATE_* yönü saat yönünün tersidir)
+_TRANSPOSE_FOR_ROTATION = {
+    90: Image.Transpose.ROTATE_270,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_90,
+}
+
+
+def rotate_image(img, rotation):
+    """PIL görselini saat yönünde 0/90/180/270 derece kayıpsız döndürür (transpose)."""
+    method = _TRANSPOSE_FOR_ROTATION.get(rotation % 360)
+    return img if method is None else img.transpose(method)
@@ -0,0 +1,244 @@
+import os
+import threading
+
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+from utils.render_profile import RenderProfile, DEFAULT_PROFILE
+from utils.page_raster import render_page_array, rotate_image
+from utils.raster_document import RasterDocument
+from utils.orientation import estimate_orientation
+from utils.vector_diff import extract_page_content
+from utils.image_digest import page_image_entries, decoded_digest
+
+
+class PageSource:
+    """
+    Karşılaştırılan bir dosyanın (PDF veya raster/TIFF görsel) belge durumu ve
+    aşama çözünürlüğünde render'ları. Arayüzden bağımsızdır: FilePanel
+    önizleme için, toplu karşılaştırma işçileri doğrudan kullanır.
+    Aynı belge birden fazla thread'den okunabileceği için render'lar
+    lock altında yapılır.
+    """
+
+    selection_coords = None  # Seçim (ROI) yok: her zaman tam sayfa
+
+    def __init__(self, path=None, profile=DEFAULT_PROFILE):
+        self.file_path = None
+        self.doc = None            # PDF ise fitz document
+        self.raster = None         # Raster dosyalarda tembel sayfa erişimi (RasterDocument)
+        self.total_pages = 0
+        self.rotation = 0          # 0, 90, 180, 270
+        self.skew = 0.0            # Taranmış sayfada eğrilik düzeltmesi (derece, saat yönü)
+        self.orientation = None    # Otomatik yön tahmini sonucu (bkz. auto_orient)
+        self.render_profile = RenderProfile(profile)
+        self._stage_cache = {}     # (sayfa, zoom, rotasyon, gri) -> numpy, sadece son sayfa için
+        self._image_digests = {}   # Gömülü görsel özetleri (xref bazlı, belge boyunca)
+        self.lock = threading.RLock()
+        self._generation = 0       # Her open/close'da artar: eski belgeye ait arka plan sonuçları atılır
+        self._orient_thread = None
+        if path:
+            self.open(path)
+
+    def open(self, path):
+        """Dosyayı açar (önceki belge kapatılır); PDF değilse raster görsel olarak yüklenir."""
+        with self.lock:
+            self.close()
+            self.rotation = 0
+            self.skew = 0.0
+            self.orientation = None
+            if os.path.splitext(path)[1].lower() == ".pdf":
+                self.doc = fitz.open(path)
+                self.total_pages = len(self.doc)
+            else:
+                # Sadece başlık okunur; sayfalar (TIFF çerçeveleri) render anında çözülür
+                self.raster = RasterDocument(path)
+                self.total_pages = self.raster.page_count
+            self.file_path = path
+
+    def get_total_pages(self):
+        return self.total_pages
+
+    def set_render_profile(self, name):
+        self.render_profile.set_profile(name)
+        self._stage_cache = {}
+
+    def get_page_array(self, page_idx, stage="diff", gray=False):
+        """
+        Belirtilen sayfayı numpy dizisi (gri veya RGB) olarak döndürür.
+        PDF'lerde PyMuPDF pixmap tamponu kopyalanmadan sarılır.
+        stage: "display", "triage", "diff" veya "ocr" — çözünürlük sayfanın
+        fiziksel boyutu ve render profiline göre seçilir.
+        Dönen dizi önbellekte paylaşılır, üzerinde değişiklik yapılmamalı.
+        """
+        if not self.file_path: return None
+        with self.lock:
+            return self._get_page_array(page_idx, stage, gray)
+
+    # Toplu karşılaştırmada seçim olmadığı için karşılaştırma dizisi tam sayfadır
+    get_compare_array = get_page_array
+
+    def publish_page(self, transport, page_idx, stage="diff", gray=False, consumers=1):
+        """
+        Sayfa render'ını paylaşılan belleğe bir kez yazar (bkz. RasterTransport):
+        süreç havuzundaki diff/SSIM/OCR işçileri kopyasız okur.
+        Döndürür: RasterHandle veya sayfa yoksa None.
+        """
+        arr = self.get_page_array(page_idx, stage, gray)
+        return None if arr is None else transport.publish(arr, consumers)
+
+    def _get_page_array(self, page_idx, stage, gray):
+        arr = None
+        if self.doc: # PDF
+            if 0 <= page_idx < self.total_pages:
+                page = self.doc.load_page(page_idx)
+                zoom = self.render_profile.zoom_for(page.rect.width, page.rect.height, stage)
+                key = (page_idx, round(zoom, 4), self.rotation, self.skew, gray)
+                cached = self._cached_render(key)
+                if cached is not None:
+                    return cached
+                # Rotasyon (ve eğrilik) render matrisinde: döndürülmüş sayfa ek kopya gerektirmez
+                arr = render_page_array(page, zoom, gray=gray, rotation=self.rotation + self.skew)
+        else: # Resim dosyası
+            if self.raster is not None and 0 <= page_idx < self.total_pages:
+                w, h = self.raster.page_size(page_idx)
+                scale = self.render_profile.scale_for_pixels(w, h, stage)
+                key = (page_idx, round(scale, 4), self.rotation, self.skew, gray)
+                cached = self._cached_render(key)
+                if cached is not None:
+                    return cached
+                # Önizlemede azaltılmış çözümleme; tam çözünürlük sadece gerektiğinde
+                mode = "L" if gray else "RGB"
+                img = self.raster.render(page_idx, scale, mode)
+                # Kayıpsız transpose, küçültmeden sonra (daha az piksel)
+                img = rotate_image(img, self.rotation)
+                if self.skew:
+                    img = img.rotate(
+                        -self.skew, resample=Image.Resampling.BICUBIC, expand=True,
+                        fillcolor=255 if mode == "L" else (255, 255, 255)
+                    )
+                arr = np.asarray(img)
+
+        if arr is None:
+            return None
+
+        self._stage_cache[key] = arr
+        return arr
+
+    def _cached_render(self, key):
+        """Aynı sayfa/zoom/rotasyon daha önce render edildiyse onu döndürür."""
+        # Sadece son kullanılan sayfanın render'ları tutulur
+        if any(k[0] != key[0] for k in self._stage_cache):
+            self._stage_cache = {}
+        return self._stage_cache.get(key)
+
+    def cache_nbytes(self):
+        """Render önbelleğinin boyutu (bellek yöneticisi için)."""
+        return sum(arr.nbytes for arr in list(self._stage_cache.values()))
+
+    def evict_cache(self):
+        """Render önbelleğini bırakır; döndürür: bırakılan byte."""
+        with self.lock:
+            freed = self.cache_nbytes()
+            self._stage_cache = {}
+        return freed
+
+    def is_scanned(self, page_idx=0):
+        """Raster dosya veya metni olmayıp büyük kısmı görsel olan PDF sayfası mı."""
+        if self.raster is not None:
+            return True
+        if not self.doc or not (0 <= page_idx < self.total_pages):
+            return False
+        with self.lock:
+            page = self.doc.load_page(page_idx)
+            if page.get_text("words"):
+                return False
+            area = abs(page.rect)
+            return any(abs(fitz.Rect(info["bbox"]) & page.rect) > area * 0.5 for info in page.get_image_info())
+
+    def auto_orient(self, page_idx=0):
+        """
+        Taranmış girdide yönü ve eğriliği bir kez (küçük render üzerinde) tahmin
+        edip rotation/skew'e uygular; sonraki tüm render'lar (önizleme, fark,
+        OCR) düzeltilmiş gelir. Vektörel PDF'lerde bir şey yapmaz. Tahmin lock
+        dışında yapılır; bu arada belge değiştiyse veya rotasyon elle
+        değiştirildiyse sonuç uygulanmaz. Döndürür: tahmin sonucu veya None.
+        """
+        if not self.is_scanned(page_idx):
+            return None
+        with self.lock:
+            generation, rotation, skew = self._generation, self.rotation, self.skew
+            self.rotation, self.skew = 0, 0.0
+            try:
+                gray = self._get_page_array(page_idx, "triage", True)
+            finally:
+                self.rotation, self.skew = rotation, skew
+        result = estimate_orientation(gray) if gray is not None else None
+        if result is None:
+            return None
+        with self.lock:
+            if (self._generation, self.rotation, self.skew) != (generation, rotation, skew):
+                return None
+            self.rotation, self.skew = result["rotation"], result["skew"]
+            self.orientation = result
+        return result
+
+    def start_auto_orient(self, page_idx=0):
+        """
+        auto_orient'i arka plan thread'inde başlatır (arayüz beklemez); bitişi
+        orienting ile izlenir. Taranmış değilse thread açılmaz. Döndürür: başladı mı.
+        """
+        if not self.is_scanned(page_idx):
+            return False
+        self._orient_thread = threading.Thread(
+            target=self.auto_orient, args=(page_idx,), name="auto-orient", daemon=True
+        )
+        self._orient_thread.start()
+        return True
+
+    @property
+    def orienting(self):
+        """Arka planda yön tespiti sürüyor mu."""
+        return self._orient_thread is not None and self._orient_thread.is_alive()
+
+    def get_vector_content(self, page_idx):
+        """PDF sayfasının metin span'ları, vektör yolları ve görsel alanları (PDF değilse None)."""
+        if not self.doc or not (0 <= page_idx < self.total_pages):
+            return None
+        with self.lock:
+            return extract_page_content(self.doc.load_page(page_idx))
+
+    def get_image_entries(self, page_idx):
+        """PDF sayfasındaki gömülü görseller ve ham akış özetleri (PDF değilse None)."""
+        if not self.doc or not (0 <= page_idx < self.total_pages):
+            return None
+        with self.lock:
+            return page_image_entries(self.doc.load_page(page_idx), self._image_digests)
+
+    def decoded_image_digest(self, xref):
+        """Gömülü görselin çözümlenmiş piksel özeti (belge boyunca önbellekli)."""
+        with self.lock:
+            return decoded_digest(self.doc, xref, self._image_digests)
+
+    def page_to_pixel_matrix(self, page_idx, stage="diff"):
+        """Sayfa koordinatını (pt) get_page_array(page_idx, stage) piksel koordinatına çeviren matris."""
+        with self.lock:
+            page_rect = self.doc.load_page(page_idx).rect
+        zoom = self.render_profile.zoom_for(page_rect.width, page_rect.height, stage)
+        mat = fitz.Matrix(zoom, zoom).prerotate(self.rotation + self.skew)
+        bbox = (page_rect * mat).irect
+        return mat * fitz.Matrix(1, 0, 0, 1, -bbox.x0, -bbox.y0)
+
+    def close(self):
+        """Belgeyi ve önbellekleri bırakır."""
+        with self.lock:
+            self._generation += 1
+            self._stage_cache = {}
+            self._image_digests = {}
+            if self.doc is not None:
+                self.doc.close()
+            self.doc = None
+            self.raster = None
+            self.file_path = None
+            self.total_pages = 0
@@ -0,0 +1,65 @@
+from PIL import Image
+
+# Tam çözünürlüğe yakın ölçeklerde reduce yerine doğrudan yeniden örnekleme yeterli
+MIN_REDUCE_FACTOR = 2
+# Image.reduce'un desteklemediği kipler ("P", "1", "I;16"...) önce hedef kipe çevrilir
+REDUCE_MODES = {"L", "LA", "RGB", "RGBA", "CMYK", "I", "F"}
+
+
+class RasterDocument:
+    """
+    Raster dosyaya (PNG, JPEG, BMP, tek veya çok sayfalı TIFF) tembel sayfa
+    erişimi. Açılışta sadece başlık okunur; her render ilgili çerçeveyi
+    seek ile ayrı açar, istenen ölçekte çözer ve tam çözünürlüklü pikselleri
+    tutmaz. Küçük ölçeklerde (önizleme) JPEG'de draft ile DCT ölçeklemesi,
+    diğer formatlarda reduce ile kutu küçültmesi kullanılır; tam çözünürlük
+    sadece karşılaştırma aşamaları istediğinde çözülür.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with Image.open(path) as img:
+            self.page_count = getattr(img, "n_frames", 1)
+            self._sizes = {0: img.size}
+
+    def _open(self, page_idx):
+        if not 0 <= page_idx < self.page_count:
+            raise IndexError(f"Sayfa yok: {page_idx}")
+        img = Image.open(self.path)
+        if page_idx:
+            img.seek(page_idx)
+        return img
+
+    def page_size(self, page_idx):
+        """Sayfanın piksel boyutu (w, h); sadece çerçeve başlığı okunur."""
+        if page_idx not in self._sizes:
+            with self._open(page_idx) as img:
+                self._sizes[page_idx] = img.size
+        return self._sizes[page_idx]
+
+    def render(self, page_idx, scale=1.0, mode="RGB"):
+        """Sayfayı scale (<= 1.0) ölçeğinde, mode renk kipinde yeni bir PIL görseli olarak çözer."""
+        with self._open(page_idx) as img:
+            w, h = img.size
+            target = (max(1, int(w * scale)), max(1, int(h * scale)))
+            out = img
+            if scale < 1.0:
+                # JPEG: çözümleme sırasında 1/2, 1/4, 1/8 ölçek (ve gerekirse gri) seçilir
+                img.draft(mode, target)
+                factor = min(img.size[0] // target[0], img.size[1] // target[1])
+                if factor >= MIN_REDUCE_FACTOR:
+                    if out.mode not in REDUCE_MODES:
+                        out = out.convert(mode)
+                    out = out.reduce(factor)
+            if out.mode != mode:
+                out = out.convert(mode)
+            if out.size != target:
+                out = out.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            # Dosyaya bağlı görsel kapanınca kullanılamaz: dönüştürülmediyse kopyala
+            return out.copy() if out is img else out
+
+    def crop(self, page_idx, box, mode="RGB"):
+        """Sayfanın tam çözünürlükteki (x0, y0, x1, y1) bölgesi (seçim karşılaştırması için)."""
+        with self._open(page_idx) as img:
+            out = img.crop(box)
+            return out if out.mode == mode else out.convert(mode)
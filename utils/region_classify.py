@@ -0,0 +1,112 @@
+import numpy as np
+
+try:
+    import cv2
+    CV2_SUPPORT = True
+except ImportError:
+    CV2_SUPPORT = False
+
+# Fark bölgesi türleri (anahtar -> görünen ad); sıra önceliktir: metin en önemli
+REGION_CLASSES = {
+    "text": "Metin",
+    "graphic": "Grafik",
+    "color": "Renk tonu",
+}
+REGION_COLORS = {"text": "#ff3b3b", "graphic": "#ff9800", "color": "#b44dff"}
+
+COLOR_DELTA = 8.0         # Bu ΔE (CIE76) üstündeki pikseller renk değişimi sayılır
+EDGE_SLACK = 1            # Kenar karşılaştırmasında kabul edilen kayma (px)
+STRUCT_MAX_RATIO = 0.1    # Kenarların en fazla bu oranı değişmişse değişim sadece renktir
+TEXT_SPAN_RATIO = 0.5     # Kutunun en az bu oranı metin span'ı ise bölge metindir
+TEXT_EDGE_DENSITY = 0.12  # Span bilgisi yoksa: bu kenar yoğunluğunun üstü metin sayılır
+
+
+def _pad(arr, h, w):
+    if arr.shape[0] == h and arr.shape[1] == w:
+        return arr
+    out = np.full((h, w) + arr.shape[2:], 255, dtype=arr.dtype)
+    out[:arr.shape[0], :arr.shape[1]] = arr
+    return out
+
+
+def _box_sums(integral, x0, y0, x1, y1):
+    """Tüm kutuların toplamı tek seferde (integral görüntü üzerinde numpy indeksleme)."""
+    return integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+
+
+def classify_regions(boxes, rgb1, rgb2, gray1, gray2, text_boxes=None):
+    """
+    Fark kutularını ucuz özelliklerle sınıflandırır: "text", "graphic" veya
+    "color" (şekil aynı, sadece renk tonu değişmiş).
+    Özellik haritaları (ΔE, iki tarafın kenarları, metin span maskesi) sayfa
+    başına bir kez hesaplanır; kutu başına değerler integral görüntülerden
+    vektörel okunur. text_boxes: metin span'larının (x, y, w, h) piksel
+    kutuları (PDF); None ise metin kararı kenar yoğunluğuyla verilir.
+    Döndürür: boxes ile aynı sırada tür anahtarları listesi.
+    """
+    if not boxes:
+        return []
+    if not CV2_SUPPORT:
+        return ["graphic"] * len(boxes)
+
+    h = max(rgb1.shape[0], rgb2.shape[0])
+    w = max(rgb1.shape[1], rgb2.shape[1])
+    arr = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+    x0 = np.clip(arr[:, 0], 0, w)
+    y0 = np.clip(arr[:, 1], 0, h)
+    x1 = np.clip(arr[:, 0] + arr[:, 2], 0, w)
+    y1 = np.clip(arr[:, 1] + arr[:, 3], 0, h)
+    area = np.maximum((x1 - x0) * (y1 - y0), 1)
+
+    # Haritalar sadece tüm kutuları kapsayan alanda hesaplanır (kenar payıyla)
+    cx0, cy0 = max(int(x0.min()) - 1, 0), max(int(y0.min()) - 1, 0)
+    cx1, cy1 = min(int(x1.max()) + 1, w), min(int(y1.max()) + 1, h)
+    crop = (slice(cy0, cy1), slice(cx0, cx1))
+    rgb1, rgb2 = _pad(rgb1, h, w)[crop], _pad(rgb2, h, w)[crop]
+    gray1, gray2 = _pad(gray1, h, w)[crop], _pad(gray2, h, w)[crop]
+    x0, x1, y0, y1 = x0 - cx0, x1 - cx0, y0 - cy0, y1 - cy0
+
+    # ΔE (CIE76): 8 bit Lab'da L 0-255'e ölçeklidir, a/b 128 kaydırmalıdır
+    delta = cv2.cvtColor(rgb1, cv2.COLOR_RGB2LAB).astype(np.float32)
+    delta -= cv2.cvtColor(rgb2, cv2.COLOR_RGB2LAB)
+    delta[..., 0] *= 100 / 255.0
+    color = (np.einsum("ijk,ijk->ij", delta, delta) > COLOR_DELTA * COLOR_DELTA).astype(np.uint8)
+    del delta
+
+    # Şekil değişimi: bir tarafta olup diğerinde (kayma payıyla) olmayan kenarlar
+    edges1 = cv2.Canny(gray1, 50, 150) > 0
+    edges2 = cv2.Canny(gray2, 50, 150) > 0
+    kernel = np.ones((2 * EDGE_SLACK + 1, 2 * EDGE_SLACK + 1), np.uint8)
+    near1 = cv2.dilate(edges1.view(np.uint8), kernel) > 0
+    near2 = cv2.dilate(edges2.view(np.uint8), kernel) > 0
+    struct = ((edges1 & ~near2) | (edges2 & ~near1)).view(np.uint8)
+    edges = (edges1 | edges2).view(np.uint8)
+
+    maps = [color, struct, edges]
+    if text_boxes:
+        spans = np.zeros(color.shape, np.uint8)
+        for x, y, bw, bh in text_boxes:
+            spans[max(y - cy0, 0):max(y + bh - cy0, 0), max(x - cx0, 0):max(x + bw - cx0, 0)] = 1
+        maps.append(spans)
+
+    sums = [_box_sums(cv2.integral(m), x0, y0, x1, y1) for m in maps]
+    color_px, struct_px, edge_px = sums[:3]
+
+    if text_boxes:
+        is_text = sums[3] >= area * TEXT_SPAN_RATIO
+    else:
+        is_text = edge_px >= area * TEXT_EDGE_DENSITY
+    is_color = (color_px > 0) & (struct_px <= edge_px * STRUCT_MAX_RATIO)
+
+    labels = np.where(is_color, "color", np.where(is_text, "text", "graphic"))
+    return labels.tolist()
+
+
+def class_counts(labels):
+    """Tür anahtarı -> bölge sayısı (REGION_CLASSES sırasıyla, sadece görülenler)."""
+    return {key: labels.count(key) for key in REGION_CLASSES if key in labels}
+
+
+def format_class_counts(labels):
+    """Örn. "3 Metin • 1 Grafik"; tür bilgisi yoksa boş metin."""
+    return " • ".join(f"{n} {REGION_CLASSES[key]}" for key, n in class_counts(labels or []).items())
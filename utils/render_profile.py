@@ -0,0 +1,101 @@
+import math
+
+# Aşama başına (hedef DPI, piksel bütçesi). Bütçe aşılırsa DPI orantılı düşürülür.
+#   display: panel önizlemesi
+#   triage : kaba metrikler (renk histogramı, feature matching)
+#   diff   : piksel farkı ve SSIM
+#   ocr    : metin çıkarma
+RENDER_PROFILES = {
+    "Hızlı": {
+        "display": (100, 4_000_000),
+        "triage": (50, 1_000_000),
+        "diff": (150, 8_000_000),
+        "ocr": (200, 12_000_000),
+    },
+    "Dengeli": {
+        "display": (150, 6_000_000),
+        "triage": (72, 1_500_000),
+        "diff": (216, 16_000_000),
+        "ocr": (216, 20_000_000),
+    },
+    "Kalite": {
+        "display": (216, 10_000_000),
+        "triage": (100, 3_000_000),
+        "diff": (300, 36_000_000),
+        "ocr": (300, 40_000_000),
+    },
+}
+DEFAULT_PROFILE = "Dengeli"
+STAGES = ("display", "triage", "diff", "ocr")
+
+# Seçili bölge (ROI) render'ı: küçük bölgeler bu uzun kenara kadar büyütülür
+ROI_TARGET_SIDE = 2000
+ROI_MAX_ZOOM = 8.0  # 576 DPI
+ROI_UPSCALE_STAGES = ("diff", "ocr")
+
+# Bellek yöneticisinin çözünürlüğünü düşürebildiği aşamalar (bkz. RenderProfile.pixel_scale)
+GOVERNED_STAGES = ("diff", "ocr")
+
+
+class RenderProfile:
+    """Sayfanın fiziksel boyutundan aşamaya uygun render çözünürlüğünü seçer."""
+
+    def __init__(self, name=DEFAULT_PROFILE):
+        self.pixel_scale = 1.0  # Bellek baskısında diff/OCR piksel sayısı çarpanı (<= 1.0)
+        self.set_profile(name)
+
+    def set_profile(self, name):
+        if name not in RENDER_PROFILES:
+            raise ValueError(f"Bilinmeyen render profili: {name}")
+        self.name = name
+        self.settings = RENDER_PROFILES[name]
+
+    def dpi_and_budget(self, stage):
+        if stage not in self.settings:
+            raise ValueError(f"Bilinmeyen aşama: {stage}")
+        return self.settings[stage]
+
+    def _governed_scale(self, stage):
+        """pixel_scale'in doğrusal karşılığı (sadece GOVERNED_STAGES için)."""
+        return math.sqrt(self.pixel_scale) if stage in GOVERNED_STAGES and self.pixel_scale < 1.0 else 1.0
+
+    def zoom_for(self, width_pt, height_pt, stage):
+        """
+        PDF sayfası (point cinsinden boyut) için fitz.Matrix zoom değeri döndürür.
+        Hedef DPI uygulanır; piksel bütçesi aşılırsa zoom küçültülür.
+        """
+        dpi, budget = self.dpi_and_budget(stage)
+        zoom = dpi / 72.0
+        pixels = (width_pt * zoom) * (height_pt * zoom)
+        if pixels > budget > 0:
+            zoom *= math.sqrt(budget / pixels)
+        return zoom * self._governed_scale(stage)
+
+    def scale_for_pixels(self, width_px, height_px, stage):
+        """
+        Raster görsel için ölçek döndürür (<= 1.0). Raster dosyalar büyütülmez,
+        sadece piksel bütçesini aşıyorsa (veya bellek baskısında) küçültülür.
+        """
+        _, budget = self.dpi_and_budget(stage)
+        pixels = width_px * height_px
+        scale = self._governed_scale(stage)
+        if pixels > budget > 0:
+            return math.sqrt(budget / pixels) * scale
+        return scale
+
+    def roi_zoom(self, width_pt, height_pt, stage):
+        """
+        Sadece bir bölge (clip) render edilirken kullanılacak zoom.
+        Bölge küçükse diff/OCR aşamalarında ROI_TARGET_SIDE'a kadar büyütülür
+        (parti no gibi küçük yazılar daha net okunur), bütçe yine uygulanır.
+        """
+        zoom = self.zoom_for(width_pt, height_pt, stage)
+        long_side = max(width_pt, height_pt)
+        if stage in ROI_UPSCALE_STAGES and long_side > 0:
+            target = min(ROI_MAX_ZOOM, ROI_TARGET_SIDE / long_side)
+            if target > zoom:
+                _, budget = self.dpi_and_budget(stage)
+                max_zoom = math.sqrt(budget / (width_pt * height_pt)) if budget > 0 else target
+                max_zoom *= self._governed_scale(stage)
+                zoom = max(zoom, min(target, max_zoom))
+        return zoom
@@ -0,0 +1,213 @@
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+
+from utils.app_paths import app_data_path
+from utils.memory_governor import result_image
+
+# Karşılaştırma algoritması değiştiğinde artırılır: eski kayıtlar tekrar kullanılmaz
+RESULT_VERSION = 1
+THUMB_MAX_SIDE = 480
+THUMB_QUALITY = 80
+
+
+def file_digest(path):
+    """Dosya içeriğinin SHA-1 özeti (parça parça okunur)."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def comparison_key(master_digest, print_digest, settings):
+    """İki dosyanın içerik özeti ve karşılaştırma ayarlarından kayıt anahtarı."""
+    payload = json.dumps(
+        {"v": RESULT_VERSION, "m": master_digest, "p": print_digest, "s": settings}, sort_keys=True
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def summarize_page_results(page_results):
+    """Sayfa sonuçlarını kalıcı kayda uygun (JSON) özete indirger: sayfa başına metrikler ve fark kutuları."""
+    pages = []
+    for res in page_results:
+        vector_result = res.get("vector_result")
+        image_result = res.get("image_result")
+        ssim_score = res["ssim_result"].get("score") if res["ssim_result"] else None
+        pages.append({
+            "page": res["page_num"],
+            "differences": [[int(v) for v in box] for box in res["differences"]],
+            "diff_classes": res.get("diff_classes"),
+            "ssim": None if ssim_score is None else float(ssim_score),
+            "text_ratio": res["text_result"].get("ratio"),
+            "vector_changes": len(vector_result["changes"]) if vector_result else None,
+            "images_flagged": (
+                sum(1 for img in image_result["images"] if img["status"] != "identical") if image_result else None
+            ),
+            "wall": sum(m["wall"] for m in (res.get("timings") or {}).values()),
+        })
+    ssim_scores = [p["ssim"] for p in pages if p["ssim"] is not None]
+    return {
+        "pages": pages,
+        "differences": sum(len(p["differences"]) for p in pages),
+        "min_ssim": min(ssim_scores) if ssim_scores else None,
+        "wall": sum(p["wall"] for p in pages),
+    }
+
+
+def _thumbnail_bytes(pil_img):
+    if pil_img is None:
+        return None
+    img = pil_img.convert("RGB")
+    img.thumbnail((THUMB_MAX_SIDE, THUMB_MAX_SIDE))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=THUMB_QUALITY)
+    return buf.getvalue()
+
+
+class ResultStore:
+    """
+    Karşılaştırma sonuçlarının SQLite tabanlı kalıcı kaydı. Kayıtlar iki
+    dosyanın içerik özeti ve ayarlarla anahtarlanır: aynı çift aynı ayarlarla
+    tekrar karşılaştırıldığında sonuç yeniden hesaplanmadan okunur.
+    Sayfa başına metrikler, fark kutuları ve küçük resimler (JPEG) saklanır;
+    tam çözünürlüklü görseller saklanmaz. Bağlantı thread'ler arasında lock
+    ile paylaşılır.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or app_data_path("results.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS comparisons (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT NOT NULL UNIQUE,
+                    master_path TEXT,
+                    print_path TEXT,
+                    master_digest TEXT NOT NULL,
+                    print_digest TEXT NOT NULL,
+                    settings TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    page_count INTEGER NOT NULL,
+                    differences INTEGER NOT NULL,
+                    min_ssim REAL,
+                    summary TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS comparisons_master ON comparisons(master_digest, created);
+                CREATE INDEX IF NOT EXISTS comparisons_print ON comparisons(print_digest, created);
+                CREATE INDEX IF NOT EXISTS comparisons_created ON comparisons(created);
+                CREATE TABLE IF NOT EXISTS pages (
+                    comparison_id INTEGER NOT NULL REFERENCES comparisons(id),
+                    page_num INTEGER NOT NULL,
+                    metrics TEXT NOT NULL,
+                    width INTEGER,
+                    height INTEGER,
+                    diff_thumb BLOB,
+                    master_thumb BLOB,
+                    print_thumb BLOB,
+                    PRIMARY KEY (comparison_id, page_num)
+                );
+            """)
+
+    def lookup(self, master_digest, print_digest, settings):
+        """Aynı içerik ve ayarlarla yapılmış kayıt (özetiyle) veya None."""
+        key = comparison_key(master_digest, print_digest, settings)
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM comparisons WHERE key = ?", (key,)).fetchone()
+        return self._comparison(row) if row else None
+
+    def save(self, master_path, print_path, master_digest, print_digest, settings, page_results, summary=None):
+        """
+        Sayfa sonuçlarını kaydeder (aynı anahtarlı eski kayıt yenisiyle değişir).
+        summary verilmezse page_results'tan üretilir. Kaydın id'sini döndürür.
+        """
+        summary = summary or summarize_page_results(page_results)
+        key = comparison_key(master_digest, print_digest, settings)
+        metrics = {p["page"]: p for p in summary["pages"]}
+        # Küçük resimler lock dışında üretilir
+        rows = []
+        for res in page_results:
+            diff_image = result_image(res, "diff_image")
+            width, height = diff_image.size if diff_image is not None else (None, None)
+            rows.append((
+                res["page_num"], json.dumps(metrics.get(res["page_num"], {})), width, height,
+                _thumbnail_bytes(diff_image), _thumbnail_bytes(result_image(res, "img1_norm")),
+                _thumbnail_bytes(result_image(res, "img2_norm")),
+            ))
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT id FROM comparisons WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._conn.execute("DELETE FROM pages WHERE comparison_id = ?", (old["id"],))
+                self._conn.execute("DELETE FROM comparisons WHERE id = ?", (old["id"],))
+            cur = self._conn.execute(
+                "INSERT INTO comparisons (key, master_path, print_path, master_digest, print_digest, settings, "
+                "created, page_count, differences, min_ssim, summary) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, master_path, print_path, master_digest, print_digest, json.dumps(settings, sort_keys=True),
+                    time.time(), len(summary["pages"]), summary["differences"], summary["min_ssim"],
+                    json.dumps(summary),
+                ),
+            )
+            comparison_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO pages (comparison_id, page_num, metrics, width, height, diff_thumb, master_thumb, "
+                "print_thumb) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(comparison_id, *row) for row in rows],
+            )
+        return comparison_id
+
+    def pages(self, comparison_id):
+        """Kaydın sayfaları: [{"page_num", "metrics", "width", "height", "diff_thumb", ...}, ...]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM pages WHERE comparison_id = ? ORDER BY page_num", (comparison_id,)
+            ).fetchall()
+        pages = [dict(row) for row in rows]
+        for page in pages:
+            page["metrics"] = json.loads(page["metrics"])
+        return pages
+
+    def history(self, search=None, digest=None, limit=500):
+        """
+        Kayıtlar, en yeni önce. search: dosya adında geçen metin;
+        digest: bu içeriğin master veya print olarak yer aldığı kayıtlar
+        (bir artwork'ün sürüm geçmişi).
+        """
+        sql, args = "SELECT * FROM comparisons", []
+        where = []
+        if search:
+            where.append("(master_path LIKE ? OR print_path LIKE ?)")
+            args += [f"%{search}%", f"%{search}%"]
+        if digest:
+            where.append("(master_digest = ? OR print_digest = ?)")
+            args += [digest, digest]
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [self._comparison(row) for row in rows]
+
+    def delete(self, comparison_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages WHERE comparison_id = ?", (comparison_id,))
+            self._conn.execute("DELETE FROM comparisons WHERE id = ?", (comparison_id,))
+
+    def _comparison(self, row):
+        item = dict(row)
+        item["settings"] = json.loads(item["settings"])
+        item["summary"] = json.loads(item["summary"])
+        return item
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
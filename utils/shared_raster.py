@@ -0,0 +1,168 @@
+import multiprocessing
+import threading
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Blok başlığı: referans sayacı (int64); veri hizalı başlar
+HEADER_SIZE = 64
+
+# Sayaç güncellemelerini süreçler arasında koruyan kilit. Sahip süreçte
+# RasterTransport, işçi süreçlerde init_worker ayarlar.
+_refcount_lock = None
+
+
+def init_worker(lock):
+    """Süreç havuzu başlatıcısı: Pool(initializer=init_worker, initargs=transport.worker_args())."""
+    global _refcount_lock
+    _refcount_lock = lock
+
+
+def _attach(name):
+    """
+    Var olan bloğa bağlanır. Havuz süreçleri sahip sürecin resource_tracker'ını
+    paylaşır; kayıt küme olduğundan tekrar kaydetmek zararsızdır ve bloğu
+    silen unlink() kaydı bir kez kaldırır.
+    """
+    return shared_memory.SharedMemory(name=name)
+
+
+def _refcount(buf):
+    return np.ndarray((1,), dtype=np.int64, buffer=buf)
+
+
+class RasterHandle:
+    """
+    Paylaşılan bellekteki bir sayfa render'ının adı, boyutu ve tipi.
+    Küçüktür ve pickle ile süreçler arasında taşınır; piksel verisi kopyalanmaz.
+    Her tüketici open() ile okuyup işi bitince bir kez release() çağırır.
+    """
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype).str
+
+    def __getstate__(self):
+        return self.name, self.shape, self.dtype
+
+    def __setstate__(self, state):
+        self.name, self.shape, self.dtype = state
+
+    def __repr__(self):
+        return f"RasterHandle({self.name!r}, {self.shape}, {self.dtype!r})"
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+
+    @contextmanager
+    def open(self):
+        """
+        Render'ı salt okunur numpy görünümü olarak verir (kopya yok).
+        Görünüm blok içinde kullanılmalı; dışarıda gerekiyorsa kopyalanmalı.
+        """
+        shm = _attach(self.name)
+        arr = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf, offset=HEADER_SIZE)
+        arr.flags.writeable = False
+        try:
+            yield arr
+        finally:
+            del arr
+            shm.close()
+
+    def release(self):
+        """Tüketicinin payını bırakır; son tüketici bloğu siler. Döndürür: kalan referans."""
+        shm = _attach(self.name)
+        try:
+            with _refcount_lock:
+                count = _refcount(shm.buf)
+                count[0] -= 1
+                remaining = int(count[0])
+                del count
+            if remaining <= 0:
+                shm.unlink()
+        finally:
+            shm.close()
+        return remaining
+
+
+class RasterTransport:
+    """
+    Sayfa render'larını süreçler arasında serileştirmeden taşır. Sahip süreç
+    publish() ile diziyi bir kez paylaşılan belleğe yazar ve tüketici sayısı
+    kadar referansla RasterHandle döndürür; diff, SSIM ve OCR işçileri aynı
+    bloğu kendi süreçlerinde kopyasız okur. Son release() bloğu siler.
+    Sahip tarafın eşlemeleri collect() ile (ve publish sırasında) kapatılır;
+    close() kalan tüm blokları siler (iptal / kapanış).
+    """
+
+    def __init__(self, ctx=None):
+        self.lock = (ctx or multiprocessing).Lock()
+        self._blocks = {}  # ad -> sahip eşlemesi (SharedMemory)
+        self._blocks_lock = threading.Lock()
+        global _refcount_lock
+        _refcount_lock = self.lock  # Aynı süreçteki (thread) tüketiciler için
+
+    def worker_args(self):
+        """init_worker'a verilecek argümanlar."""
+        return (self.lock,)
+
+    def allocate(self, shape, dtype=np.uint8, consumers=1):
+        """
+        Boş blok ayırır: (RasterHandle, yazılabilir numpy görünümü). Render doğrudan
+        görünüme yazılırsa ara kopya da oluşmaz; görünüm publish sonrası kullanılmamalı.
+        """
+        if consumers < 1:
+            raise ValueError("En az bir tüketici gerekli")
+        self.collect()
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + max(nbytes, 1))
+        _refcount(shm.buf)[0] = consumers
+        with self._blocks_lock:
+            self._blocks[shm.name] = shm
+        handle = RasterHandle(shm.name, shape, dtype)
+        return handle, np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=HEADER_SIZE)
+
+    def publish(self, arr, consumers=1):
+        """Diziyi paylaşılan belleğe bir kez kopyalar; RasterHandle döndürür."""
+        arr = np.asarray(arr)
+        handle, view = self.allocate(arr.shape, arr.dtype, consumers)
+        view[...] = arr
+        return handle
+
+    def collect(self):
+        """Tüm tüketicilerin bıraktığı blokların sahip eşlemelerini kapatır."""
+        with self._blocks_lock:
+            for name, shm in list(self._blocks.items()):
+                with self.lock:
+                    done = _refcount(shm.buf)[0] <= 0
+                if done:
+                    try:
+                        shm.close()
+                    except BufferError:
+                        continue  # allocate() görünümü hâlâ tutuluyor; sonraki turda
+                    del self._blocks[name]
+
+    def outstanding(self):
+        """Henüz tüm tüketicileri bitmemiş blok sayısı ve toplam boyutu (byte)."""
+        self.collect()
+        with self._blocks_lock:
+            return len(self._blocks), sum(shm.size for shm in self._blocks.values())
+
+    def close(self):
+        """Kalan blokları (bırakılmamış olsalar da) siler."""
+        with self._blocks_lock:
+            blocks, self._blocks = self._blocks, {}
+        for shm in blocks.values():
+            with self.lock:
+                pending = _refcount(shm.buf)[0] > 0
+            try:
+                shm.close()
+            except BufferError:
+                pass
+            if pending:  # Bırakılmış bloğu son tüketici zaten sildi
+                shm.unlink()
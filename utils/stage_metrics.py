@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+    PSUTIL_SUPPORT = True
+except ImportError:
+    PSUTIL_SUPPORT = False
+
+PEAK_SAMPLE_INTERVAL = 0.005  # RSS tepe örnekleme aralığı (sn)
+
+
+def current_rss():
+    """Sürecin anlık RSS değeri (byte) veya ölçülemiyorsa None."""
+    if PSUTIL_SUPPORT:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PeakRss:
+    """
+    Blok boyunca sürecin RSS tepe değerini arka plan thread'inde örnekler.
+    with PeakRss() as peak: ... ; peak.delta = tepe RSS - başlangıç RSS
+    (byte, en az 0) veya RSS ölçülemiyorsa None. Blok içinde ayrılıp
+    bırakılan geçici bellek (SSIM, OCR ara dizileri) de görünür; örnekleme
+    aralığından kısa süren tepeler kaçabilir. Süreç geneli ölçüldüğünden aynı
+    anda çalışan thread'lerin ayırmaları da sayılır.
+    """
+
+    def __init__(self, interval=PEAK_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.start = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def delta(self):
+        if self.start is None or self.peak is None:
+            return None
+        return max(0, self.peak - self.start)
+
+    def _sample(self):
+        rss = current_rss()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._stop = threading.Event()
+        self.start = self.peak = current_rss()
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._run, name="rss-peak", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._sample()
+        return False
+
+
+class StageRecorder:
+    """
+    Aşama bazında duvar saati, CPU süresi ve RSS artışı kaydeder.
+    start(ad) önceki aşamayı kapatıp yenisini açar; stop() son aşamayı kapatır.
+    Sonuç: {ad: {"wall": sn, "cpu": sn, "rss_delta": byte veya None}}
+
+    RSS artışı yaklaşıktır: aşama sonu ile başındaki anlık RSS farkıdır (en
+    az 0). Süreç geneli ölçüldüğünden aynı anda çalışan thread'lerin
+    ayırmaları da sayılır; aşama içinde ayrılıp bırakılan geçici bellek ise
+    görünmez. Süreç sayaçları (örn. Linux VmHWM) sıfırlanmaz.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._current = None
+
+    def start(self, name):
+        self.stop()
+        self._current = (name, time.perf_counter(), time.process_time(), current_rss())
+
+    def stop(self):
+        if self._current is None:
+            return
+        name, wall0, cpu0, rss0 = self._current
+        self._current = None
+
+        rss_delta = None
+        rss1 = current_rss()
+        if rss0 is not None and rss1 is not None:
+            rss_delta = max(0, rss1 - rss0)
+
+        entry = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0, "rss_delta": None})
+        entry["wall"] += time.perf_counter() - wall0
+        entry["cpu"] += time.process_time() - cpu0
+        if rss_delta is not None:
+            entry["rss_delta"] = max(entry["rss_delta"] or 0, rss_delta)
+
+    @contextmanager
+    def stage(self, name):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+
+def format_stage_metrics(metrics, labels=None):
+    """Aşama ölçümlerini tek satırlık özet metne çevirir."""
+    parts = []
+    for name, m in metrics.items():
+        label = labels.get(name, name) if labels else name
+        text = f"{label} {m['wall']:.2f}s (CPU {m['cpu']:.2f}s"
+        if m.get("rss_delta") is not None:
+            text += f", +{m['rss_delta'] / (1024 * 1024):.0f} MB"
+        parts.append(text + ")")
+    return " • ".join(parts)
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import queue
+import threading
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from utils.app_paths import app_data_path
+from utils.page_raster import rotate_image
+from utils.raster_document import RasterDocument
+
+THUMB_DIR = "thumbs"
+THUMB_QUALITY = 75
+THUMB_CACHE_MAX_FILES = 20000  # Diskteki küçük resim sayısı bunu aşınca en eskiler silinir
+
+_pruned = threading.Event()  # Disk önbelleği süreç başına bir kez temizlenir
+
+
+def thumbnail_key(path, page_idx, rotation, max_side):
+    """Dosya kimliği (yol, boyut, değişiklik zamanı), sayfa, rotasyon ve boyuttan önbellek anahtarı."""
+    st = os.stat(path)
+    payload = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{page_idx}|{rotation}|{max_side}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def prune_thumbnail_cache(max_files=THUMB_CACHE_MAX_FILES):
+    """Disk önbelleği sınırı aşıyorsa en eski küçük resimleri siler."""
+    folder = app_data_path(THUMB_DIR)
+    try:
+        entries = [e for e in os.scandir(folder) if e.is_file()]
+    except OSError:
+        return
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - max_files]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+class ThumbnailRenderer:
+    """
+    Bir belgenin sayfa küçük resimlerini arka plan thread'inde üretir.
+    Sayfalar istek sırasıyla işlenir; prioritize() ile görünür sayfalar öne
+    alınır. Küçük resimler diskte (JPEG) önbelleklenir: aynı dosya tekrar
+    açıldığında render yapılmaz. Belge thread'in kendi handle'ı ile açılır,
+    karşılaştırma ve önizleme render'larını kilitlemez. Sonuçlar ready()
+    ile arayüz thread'inden alınır (Tk thread güvenli değildir).
+    """
+
+    def __init__(self, max_side=120):
+        self.max_side = max_side
+        self._cond = threading.Condition()
+        self._pending = []          # Bekleyen sayfa indeksleri (sıra = öncelik)
+        self._document = None       # (yol, sayfa sayısı, rotasyon)
+        self._generation = 0        # Belge değişince artar; eski sonuçlar atılır
+        self._ready = queue.Queue()  # (nesil, sayfa, PIL)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="thumbnails", daemon=True)
+        self._thread.start()
+
+    def set_document(self, path, total_pages, rotation=0):
+        """Yeni belge (veya rotasyon): bekleyen işler atılır, tüm sayfalar sıraya girer."""
+        with self._cond:
+            self._generation += 1
+            self._document = (path, total_pages, rotation) if path else None
+            self._pending = list(range(total_pages)) if path else []
+            self._cond.notify()
+            return self._generation
+
+    def prioritize(self, page_indices):
+        """Verilen sayfaları (örn. görünür olanlar) sıranın başına alır."""
+        with self._cond:
+            pending = set(self._pending)
+            first = [i for i in dict.fromkeys(page_indices) if i in pending]
+            moved = set(first)
+            self._pending = first + [i for i in self._pending if i not in moved]
+
+    def ready(self):
+        """Hazır küçük resimler: [(sayfa, PIL), ...] (güncel belgeye ait olanlar)."""
+        items = []
+        while True:
+            try:
+                generation, page_idx, img = self._ready.get_nowait()
+            except queue.Empty:
+                return items
+            if generation == self._generation:
+                items.append((page_idx, img))
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._pending = []
+            self._cond.notify()
+
+    def _run(self):
+        handle, handle_path = None, None
+        os.makedirs(app_data_path(THUMB_DIR), exist_ok=True)
+        if not _pruned.is_set():
+            _pruned.set()
+            prune_thumbnail_cache()
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                    page_idx = self._pending.pop(0)
+                    generation = self._generation
+                    path, _, rotation = self._document
+                try:
+                    if path != handle_path:
+                        if isinstance(handle, fitz.Document):
+                            handle.close()
+                        handle, handle_path = None, None
+                        handle, handle_path = self._open(path), path
+                    img = self._thumbnail(handle, path, page_idx, rotation)
+                except Exception as e:
+                    print(f"Küçük resim üretilemedi ({path}, sayfa {page_idx + 1}): {e}")
+                    continue
+                self._ready.put((generation, page_idx, img))
+        finally:
+            if isinstance(handle, fitz.Document):
+                handle.close()
+
+    def _open(self, path):
+        if os.path.splitext(path)[1].lower() == ".pdf":
+            return fitz.open(path)
+        return RasterDocument(path)
+
+    def _thumbnail(self, handle, path, page_idx, rotation):
+        cache_path = app_data_path(THUMB_DIR, thumbnail_key(path, page_idx, rotation, self.max_side) + ".jpg")
+        if os.path.exists(cache_path):
+            try:
+                with Image.open(cache_path) as cached:
+                    return cached.convert("RGB")
+            except OSError:
+                pass  # Bozuk dosya: yeniden üret
+        if isinstance(handle, fitz.Document):
+            page = handle.load_page(page_idx)
+            zoom = self.max_side / max(page.rect.width, page.rect.height)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom).prerotate(rotation), alpha=False)
+            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        else:
+            w, h = handle.page_size(page_idx)
+            img = rotate_image(handle.render(page_idx, min(1.0, self.max_side / max(w, h))), rotation)
+        tmp = cache_path + ".tmp"
+        try:
+            img.save(tmp, "JPEG", quality=THUMB_QUALITY)
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            print(f"Küçük resim önbelleğe yazılamadı: {e}")
+        return img
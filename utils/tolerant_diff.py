@@ -0,0 +1,95 @@
+import numpy as np
+
+try:
+    import cv2
+    CV2_SUPPORT = True
+except ImportError:
+    CV2_SUPPORT = False
+
+# Fark toleransı ön ayarları: (kayma yarıçapı px, yoğunluk toleransı 0-255).
+# Her piksel diğer görselin yarıçap komşuluğundaki min/max zarfıyla
+# karşılaştırılır: kenar yumuşatma ve alt-piksel kaymaları fark sayılmaz.
+#   Kapalı: doğrudan piksel farkı (eşik 10)
+DIFF_TOLERANCES = {
+    "Kapalı": None,
+    "Hafif": (1, 24),
+    "Normal": (1, 40),
+    "Geniş": (2, 56),
+}
+DEFAULT_TOLERANCE = "Kapalı"  # Önceki davranış; tolerans arayüzden / toplu iş ayarından açılır
+STRICT_THRESHOLD = 10  # Tolerans kapalıyken mutlak fark eşiği
+DEFAULT_KERNEL = 3     # Fark maskesindeki boşlukları kapatan çekirdek (px); 1: kapama yok
+DEFAULT_MIN_AREA = 2   # Bu alandan (px²) küçük fark konturları gürültü sayılır
+
+
+def tolerance_params(tolerance):
+    """Ön ayar adı veya (yarıçap, tolerans) -> (yarıçap, tolerans) ya da None (kapalı)."""
+    if tolerance is None or isinstance(tolerance, tuple):
+        return tolerance
+    if tolerance not in DIFF_TOLERANCES:
+        raise ValueError(f"Bilinmeyen fark toleransı: {tolerance}")
+    return DIFF_TOLERANCES[tolerance]
+
+
+def default_sensitivity(tolerance=DEFAULT_TOLERANCE):
+    """Toleransın varsayılan hassasiyeti: (eşik, çekirdek, en küçük alan)."""
+    params = tolerance_params(tolerance)
+    return (STRICT_THRESHOLD if params is None else params[1], DEFAULT_KERNEL, DEFAULT_MIN_AREA)
+
+
+def _outside_envelope(gray, other, kernel):
+    """gray'in, other'ın komşuluk min/max zarfının ne kadar dışında kaldığı (doymalı, uint8)."""
+    low = cv2.erode(other, kernel)
+    high = cv2.dilate(other, kernel)
+    return cv2.max(cv2.subtract(low, gray), cv2.subtract(gray, high))
+
+
+def diff_magnitude(gray1, gray2, tolerance=DEFAULT_TOLERANCE):
+    """
+    Eşiklenmemiş fark büyüklüğü haritası (uint8). Tolerans kapalıysa mutlak
+    fark; açıksa fark iki yönlü ölçülür: 1'deki pikselin 2'nin zarfının ve
+    2'deki pikselin 1'in zarfının ne kadar dışında kaldığının büyüğü. Böylece
+    yeni eklenen ince çizgi de kaybolan da yakalanır, kenardaki gri ton
+    farkları ise zarfın içinde kalır. Harita saklanırsa eşik değişikliği
+    yeniden render ve karşılaştırma gerektirmez (bkz. extract_boxes).
+    """
+    params = tolerance_params(tolerance)
+    if params is None:
+        return cv2.absdiff(gray1, gray2)
+    radius = params[0]
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2 * radius + 1, 2 * radius + 1))
+    return cv2.max(_outside_envelope(gray1, gray2, kernel), _outside_envelope(gray2, gray1, kernel))
+
+
+def diff_mask(gray1, gray2, tolerance=DEFAULT_TOLERANCE, threshold=None):
+    """İki gri görsel arasındaki fark maskesi (0/255, uint8); threshold None ise toleransın eşiği."""
+    if threshold is None:
+        threshold = default_sensitivity(tolerance)[0]
+    _, mask = cv2.threshold(diff_magnitude(gray1, gray2, tolerance), threshold, 255, cv2.THRESH_BINARY)
+    return mask
+
+
+def extract_boxes(magnitude, threshold, kernel=DEFAULT_KERNEL, min_area=DEFAULT_MIN_AREA):
+    """
+    Fark büyüklüğü haritasından fark kutuları [(x, y, w, h), ...]: eşikleme,
+    kernel x kernel kapama (gürültü / kırık kenar temizliği) ve min_area'dan
+    küçük konturların atılması. Sayfa başına birkaç milisaniye sürer.
+    """
+    _, mask = cv2.threshold(magnitude, threshold, 255, cv2.THRESH_BINARY)
+    if kernel > 1:
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((kernel, kernel), np.uint8))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    return [cv2.boundingRect(cnt) for cnt in contours if cv2.contourArea(cnt) >= min_area]
+
+
+def uncovered_boxes(gray1, gray2, covered, tolerance=DEFAULT_TOLERANCE, pad=1):
+    """
+    covered (x, y, w, h) kutuları (pad kadar genişletilerek) dışında kalan
+    fark kutuları. Vektör karşılaştırmasının göremediği farkları (kırpma
+    yolu, gölgelendirme, not, katman görünürlüğü, yazı çizim kipi) kaba
+    çözünürlükte yakalamak için kullanılır.
+    """
+    magnitude = diff_magnitude(gray1, gray2, tolerance)
+    for x, y, w, h in covered:
+        magnitude[max(0, y - pad):y + h + pad, max(0, x - pad):x + w + pad] = 0
+    return extract_boxes(magnitude, *default_sensitivity(tolerance))
@@ -0,0 +1,403 @@
+from collections import defaultdict
+
+import fitz  # PyMuPDF
+
+from utils.diff_regions import grid_cells
+
+# Konum toleransı (pt): bu kadar kayma "taşındı" sayılmaz
+POSITION_TOL = 1.0
+# Geometri imzasında nokta yuvarlama adımı (pt)
+GEOMETRY_STEP = 0.25
+# Metin/yol eşleşmesi yoksa aynı yerdeki nesne "değişti" sayılır (en az bu IoU)
+MODIFIED_MIN_IOU = 0.3
+# Bir anahtar grubunda bundan fazla aday çift varsa sadece uzamsal indeksteki komşular denenir
+MAX_PAIR_CANDIDATES = 250000
+MATCH_GRID_CELL = 50  # Kalabalık grup eşleştirmesinde indeks hücre boyutu (pt)
+
+# Metin çıkarımında gömülü görsel verisi istenmez (sadece span'lar)
+_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+def _round_color(color):
+    if color is None:
+        return None
+    if isinstance(color, (int, float)):
+        return round(color, 3)
+    return tuple(round(c, 3) for c in color)
+
+
+def _hex_color(color):
+    if color is None:
+        return "yok"
+    if isinstance(color, int):
+        return f"#{color:06x}"
+    return "#" + "".join(f"{int(round(c * 255)):02x}" for c in color[:3])
+
+
+def _to_page_rect(rect, rot_mat):
+    r = fitz.Rect(rect)
+    if rot_mat is not None:
+        r = r * rot_mat
+    return (r.x0, r.y0, r.x1, r.y1)
+
+
+def _relative(value, ox, oy):
+    """Nokta/dikdörtgen demetini (x, y, ...) köşeye göre göreli ve yuvarlanmış hale getirir."""
+    if not isinstance(value, tuple):
+        return value
+    if value and isinstance(value[0], tuple):  # quad: nokta demetleri
+        return tuple(_relative(v, ox, oy) for v in value)
+    step = GEOMETRY_STEP
+    return tuple(round((v - (ox if i % 2 == 0 else oy)) / step) for i, v in enumerate(value))
+
+
+def _path_geometry(path, origin):
+    """Yolun konumdan bağımsız geometri imzası (noktalar rect köşesine göre, yuvarlanmış)."""
+    ox, oy = origin
+    sig = tuple(
+        (item[0],) + tuple(_relative(v, ox, oy) for v in item[1:])
+        for item in path["items"]
+    )
+    return hash((path.get("type"), path.get("closePath"), sig))
+
+
+def extract_page_content(page):
+    """
+    Sayfadaki metin span'larını, vektör yollarını ve görsel alanlarını
+    karşılaştırılabilir düz veriye çevirir. Koordinatlar döndürülmüş
+    (görüntülenen) sayfa koordinatıdır (pt).
+    """
+    rot_mat = page.rotation_matrix if page.rotation else None
+
+    spans = []
+    for block in page.get_text("dict", flags=_TEXT_FLAGS)["blocks"]:
+        if block.get("type") != 0:
+            continue
+        for line in block["lines"]:
+            for span in line["spans"]:
+                text = span["text"].strip()
+                if not text:
+                    continue
+                spans.append({
+                    "text": text,
+                    "font": span["font"],
+                    "size": round(span["size"], 1),
+                    "color": span["color"],
+                    "flags": span["flags"],
+                    "rect": _to_page_rect(span["bbox"], rot_mat),
+                })
+
+    # get_cdrawings: get_drawings ile aynı veri, Point/Rect nesnesi üretmeden (düz demetler)
+    paths = []
+    for path in page.get_cdrawings():
+        rect = path["rect"]
+        style = (
+            path.get("type"),
+            _round_color(path.get("fill")),
+            _round_color(path.get("color")),
+            round(path["width"], 2) if path.get("width") is not None else None,
+            path.get("dashes"),
+            _round_color(path.get("fill_opacity")),
+            _round_color(path.get("stroke_opacity")),
+        )
+        paths.append({
+            "geometry": _path_geometry(path, rect[:2]),
+            "style": style,
+            "fill": path.get("fill"),
+            "color": path.get("color"),
+            "width": path.get("width"),
+            "rect": _to_page_rect(rect, rot_mat),
+        })
+
+    images = []
+    for info in page.get_image_info():
+        images.append(_to_page_rect(info["bbox"], rot_mat))
+
+    return {
+        "size": (page.rect.width, page.rect.height),
+        "spans": spans,
+        "paths": paths,
+        "images": images,
+    }
+
+
+def _center(rect):
+    return (rect[0] + rect[2]) / 2, (rect[1] + rect[3]) / 2
+
+
+def _distance(r1, r2):
+    (x1, y1), (x2, y2) = _center(r1), _center(r2)
+    return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+
+
+def _iou(r1, r2):
+    ix = min(r1[2], r2[2]) - max(r1[0], r2[0])
+    iy = min(r1[3], r2[3]) - max(r1[1], r2[1])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    inter = ix * iy
+    a1 = (r1[2] - r1[0]) * (r1[3] - r1[1])
+    a2 = (r2[2] - r2[0]) * (r2[3] - r2[1])
+    return inter / (a1 + a2 - inter)
+
+
+def _reading_order(items, i):
+    return items[i]["rect"][1], items[i]["rect"][0]
+
+
+def _grid_candidates(idx1, idx2, items1, items2, cost, max_cost):
+    """
+    Kalabalık grup için aday çiftler: sadece aynı veya komşu indeks
+    hücresindeki nesneler denenir. max_cost varsa (örtüşme eşleşmesi) sadece
+    kesişen hücrelere bakılır; yoksa bir hücre çevresine kadar uzanılır.
+    """
+    grid = defaultdict(list)
+    for b in idx2:
+        for cell in grid_cells(*items2[b]["rect"], MATCH_GRID_CELL):
+            grid[cell].append(b)
+    reach = 0 if max_cost is not None else MATCH_GRID_CELL
+    candidates = []
+    for a in idx1:
+        x0, y0, x1, y1 = items1[a]["rect"]
+        seen = set()
+        for cell in grid_cells(x0 - reach, y0 - reach, x1 + reach, y1 + reach, MATCH_GRID_CELL):
+            for b in grid.get(cell, ()):
+                if b in seen:
+                    continue
+                seen.add(b)
+                c = cost(items1[a], items2[b])
+                if max_cost is None or c <= max_cost:
+                    candidates.append((c, a, b))
+    candidates.sort()
+    return candidates
+
+
+def _match(items1, items2, key, cost, max_cost=None):
+    """
+    Aynı anahtara sahip nesneleri açgözlü en düşük maliyetle eşler.
+    Çok kalabalık gruplarda tüm çiftler yerine uzamsal komşular denenir.
+    Döndürür: ([(a, b), ...], eşleşmeyen_1, eşleşmeyen_2)
+    """
+    groups = {}
+    for idx, item in enumerate(items1):
+        groups.setdefault(key(item), ([], []))[0].append(idx)
+    for idx, item in enumerate(items2):
+        groups.setdefault(key(item), ([], []))[1].append(idx)
+
+    used1, used2, pairs = set(), set(), []
+
+    def take(candidates):
+        for _, a, b in candidates:
+            if a in used1 or b in used2:
+                continue
+            used1.add(a)
+            used2.add(b)
+            pairs.append((items1[a], items2[b]))
+
+    for idx1, idx2 in groups.values():
+        if not idx1 or not idx2:
+            continue
+        if len(idx1) * len(idx2) > MAX_PAIR_CANDIDATES:
+            take(_grid_candidates(idx1, idx2, items1, items2, cost, max_cost))
+            if max_cost is None:
+                # Maliyet sınırı yoksa komşusuz kalanlar okuma sırasıyla eşlenir
+                rest1 = sorted((a for a in idx1 if a not in used1), key=lambda i: _reading_order(items1, i))
+                rest2 = sorted((b for b in idx2 if b not in used2), key=lambda i: _reading_order(items2, i))
+                take([(0.0, a, b) for a, b in zip(rest1, rest2)])
+        else:
+            candidates = []
+            for a in idx1:
+                for b in idx2:
+                    c = cost(items1[a], items2[b])
+                    if max_cost is None or c <= max_cost:
+                        candidates.append((c, a, b))
+            candidates.sort()
+            take(candidates)
+
+    rest1 = [item for i, item in enumerate(items1) if i not in used1]
+    rest2 = [item for i, item in enumerate(items2) if i not in used2]
+    return pairs, rest1, rest2
+
+
+def _overlap_cost(a, b):
+    return 1.0 - _iou(a["rect"], b["rect"])
+
+
+def match_overlapping(items1, items2, min_iou=MODIFIED_MIN_IOU):
+    """"rect" anahtarlı nesneleri en çok örtüşenden başlayarak eşler: (çiftler, eşleşmeyen_1, eşleşmeyen_2)."""
+    return _match(items1, items2, lambda i: None, _overlap_cost, 1.0 - min_iou)
+
+
+def moved(rect1, rect2, tol=POSITION_TOL):
+    """İki dikdörtgenin konumu veya boyutu tolerans dışında farklıysa True."""
+    return any(abs(a - b) > tol for a, b in zip(rect1, rect2))
+
+
+def _change(kind, obj_type, item1, item2, detail=""):
+    return {
+        "kind": kind,
+        "type": obj_type,
+        "rect1": item1["rect"] if item1 else None,
+        "rect2": item2["rect"] if item2 else None,
+        "detail": detail,
+    }
+
+
+def _span_attr_changes(a, b):
+    changes = []
+    if a["font"] != b["font"]:
+        changes.append(f"font {a['font']} → {b['font']}")
+    if a["size"] != b["size"]:
+        changes.append(f"boyut {a['size']} → {b['size']}")
+    if a["color"] != b["color"]:
+        changes.append(f"renk {_hex_color(a['color'])} → {_hex_color(b['color'])}")
+    if a["flags"] != b["flags"]:
+        changes.append("stil")
+    return changes
+
+
+def _moved(a, b):
+    return _distance(a["rect"], b["rect"]) > POSITION_TOL
+
+
+def _compare_spans(spans1, spans2):
+    changes = []
+
+    # 1. Aynı metin: en yakın konumla eşle; yer veya biçim farkı raporlanır
+    pairs, rest1, rest2 = _match(spans1, spans2, lambda s: s["text"], lambda a, b: _distance(a["rect"], b["rect"]))
+    for a, b in pairs:
+        attrs = _span_attr_changes(a, b)
+        if attrs:
+            changes.append(_change("modified", "text", a, b, f"'{a['text']}': " + ", ".join(attrs)))
+        elif _moved(a, b):
+            changes.append(_change("moved", "text", a, b, f"'{a['text']}'"))
+
+    # 2. Aynı yerde farklı metin: içerik değişikliği
+    pairs, rest1, rest2 = _match(rest1, rest2, lambda s: None, _overlap_cost, 1.0 - MODIFIED_MIN_IOU)
+    for a, b in pairs:
+        detail = f"'{a['text']}' → '{b['text']}'"
+        attrs = _span_attr_changes(a, b)
+        if attrs:
+            detail += " (" + ", ".join(attrs) + ")"
+        changes.append(_change("modified", "text", a, b, detail))
+
+    changes.extend(_change("removed", "text", a, None, f"'{a['text']}'") for a in rest1)
+    changes.extend(_change("added", "text", None, b, f"'{b['text']}'") for b in rest2)
+    return changes
+
+
+def _path_style_changes(a, b):
+    changes = []
+    if _round_color(a["fill"]) != _round_color(b["fill"]):
+        changes.append(f"dolgu {_hex_color(a['fill'])} → {_hex_color(b['fill'])}")
+    if _round_color(a["color"]) != _round_color(b["color"]):
+        changes.append(f"çizgi {_hex_color(a['color'])} → {_hex_color(b['color'])}")
+    if a["style"][3] != b["style"][3]:
+        changes.append(f"kalınlık {a['style'][3]} → {b['style'][3]}")
+    return changes or ["stil"]
+
+
+def _compare_paths(paths1, paths2):
+    changes = []
+
+    # 1. Aynı şekil ve stil: sadece konum farkı olabilir
+    pairs, rest1, rest2 = _match(
+        paths1, paths2, lambda p: (p["geometry"], p["style"]), lambda a, b: _distance(a["rect"], b["rect"])
+    )
+    changes.extend(_change("moved", "path", a, b) for a, b in pairs if _moved(a, b))
+
+    # 2. Aynı şekil, farklı stil (renk / kalınlık)
+    pairs, rest1, rest2 = _match(rest1, rest2, lambda p: p["geometry"], lambda a, b: _distance(a["rect"], b["rect"]))
+    for a, b in pairs:
+        detail = ", ".join(_path_style_changes(a, b))
+        if _moved(a, b):
+            detail += ", taşındı"
+        changes.append(_change("modified", "path", a, b, detail))
+
+    # 3. Aynı yerde farklı şekil
+    pairs, rest1, rest2 = _match(rest1, rest2, lambda p: None, _overlap_cost, 1.0 - MODIFIED_MIN_IOU)
+    changes.extend(_change("modified", "path", a, b, "şekil") for a, b in pairs)
+
+    changes.extend(_change("removed", "path", a, None) for a in rest1)
+    changes.extend(_change("added", "path", None, b) for b in rest2)
+    return changes
+
+
+def compare_page_content(content1, content2):
+    """
+    extract_page_content çıktılarını karşılaştırır.
+    Döndürür: {
+        "conclusive": tüm sayfa vektörel olarak karara bağlandıysa True,
+        "reason": karar verilemediyse nedeni,
+        "changes": [{"kind": added/removed/moved/modified, "type": text/path,
+                     "rect1", "rect2", "detail"}, ...],
+        "raster_regions": [(rect1 veya None, rect2 veya None), ...]  # piksel farkı gereken alanlar
+    }
+    Sayfada gömülü görsel varsa o alanlar raster_regions'a eklenir; metin ve
+    çizim yoksa (taranmış sayfa) ya da sayfa boyutları farklıysa sayfanın
+    tamamı için raster karşılaştırma gerekir (conclusive=False, changes boş).
+    """
+    result = {"conclusive": False, "reason": None, "changes": [], "raster_regions": []}
+
+    (w1, h1), (w2, h2) = content1["size"], content2["size"]
+    if abs(w1 - w2) > POSITION_TOL or abs(h1 - h2) > POSITION_TOL:
+        result["reason"] = "sayfa boyutları farklı"
+        return result
+    if not any(content1[k] or content2[k] for k in ("spans", "paths")):
+        result["reason"] = "vektör içerik yok"
+        return result
+
+    result["changes"] = _compare_spans(content1["spans"], content2["spans"]) + \
+        _compare_paths(content1["paths"], content2["paths"])
+
+    # Gömülü görseller vektörel olarak karşılaştırılamaz: aynı yerdekiler çift olarak
+    images1 = [{"rect": r} for r in content1["images"]]
+    images2 = [{"rect": r} for r in content2["images"]]
+    pairs, rest1, rest2 = match_overlapping(images1, images2)
+    set_raster_regions(result, (
+        [(a["rect"], b["rect"]) for a, b in pairs]
+        + [(a["rect"], None) for a in rest1]
+        + [(None, b["rect"]) for b in rest2]
+    ))
+    return result
+
+
+def set_raster_regions(result, regions):
+    """Piksel ile karşılaştırılacak görsel alanlarını günceller; hiç kalmadıysa sonuç kesinleşir."""
+    result["raster_regions"] = list(regions)
+    if result["raster_regions"]:
+        result["conclusive"] = False
+        result["reason"] = f"{len(result['raster_regions'])} görsel alanı piksel ile karşılaştırılacak"
+    else:
+        result["conclusive"] = True
+        result["reason"] = None
+
+
+def add_unexplained_regions(result, regions):
+    """
+    Kaba raster kontrolünün bulup vektör farklarının açıklamadığı alanları
+    piksel karşılaştırmasına ekler; sayfa artık kesin sayılmaz.
+    """
+    if not regions:
+        return
+    result["raster_regions"].extend(regions)
+    result["conclusive"] = False
+    note = f"kaba raster kontrolü {len(regions)} alanda vektörde görünmeyen fark buldu"
+    result["reason"] = f"{result['reason']}; {note}" if result["reason"] else note
+
+
+def compare_pages(page1, page2):
+    """İki fitz sayfasını vektör düzeyinde karşılaştırır (bkz. compare_page_content)."""
+    return compare_page_content(extract_page_content(page1), extract_page_content(page2))
+
+
+def rect_to_pixels(rect, matrix, width, height, pad=2):
+    """Sayfa dikdörtgenini (pt) matrisle piksele çevirip (x, y, w, h) kutusu döndürür; görüntü dışındaysa None."""
+    r = fitz.Rect(rect) * matrix
+    x0 = max(0, int(r.x0) - pad)
+    y0 = max(0, int(r.y0) - pad)
+    x1 = min(width, int(r.x1 + 0.999) + pad)
+    y1 = min(height, int(r.y1 + 0.999) + pad)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)